@@ -1,15 +1,29 @@
 from crewai import Agent, Task, Crew
-from langchain_groq import ChatGroq
+from llm_backend import agent_llm, make_llm
 from dotenv import load_dotenv
+from runner import kickoff, record_parse, task_prompt
+from llm_cache import make_key
+from singleflight import SingleFlight
+import skill_ontology
+import fused
+import ingest
+import near_duplicate
+import difficulty
+import prompts
+import scoring
+import streaming
+import tracing
 import os
 import ast
+import copy
 import re
-from concurrent.futures import ThreadPoolExecutor
+from scheduler import Stage, run_stages
 
 load_dotenv()
 
-llm = ChatGroq(
-    model_name="groq/llama3-8b-8192",
+llm = make_llm(
+    "groq",
+    "groq/llama3-8b-8192",
     api_key=os.getenv("GROQ_API_KEY"),
     temperature=0.3
 )
@@ -20,7 +34,7 @@ requirement_analyzer = Agent(
     role='Requirement Analyzer 🕵️',
     goal='Analyze non-technical client input and extract the technical skills required for the task',
     backstory="""Specializes in interpreting non-technical project descriptions from clients and identifying the technical tools, libraries, or frameworks needed to implement it.""",
-    llm=llm,
+    llm=agent_llm(llm),
     verbose=True
 )
 
@@ -28,7 +42,7 @@ skill_comparer = Agent(
     role='Skill Comparer 🤹',
     goal='Compare developer skills with required client skills',
     backstory="""Takes in two skill lists and identifies matches and missing skills.""",
-    llm=llm,
+    llm=agent_llm(llm),
     verbose=True
 )
 
@@ -36,20 +50,16 @@ relation_mapper = Agent(
     role='Relation Mapper',
     goal='Map missing skills to related or transferable skills and assess difficulty level',
     backstory="""Helps identify if the missing skills can be quickly learned or need external expertise. If the missing and known skills are from similar domains (e.g. Python and Flask), mark them as easy to learn.""",
-    llm=llm,
+    llm=agent_llm(llm),
     verbose=True
 )
 
-confidence_scorer = Agent(
-    role='Confidence Scorer',
-    goal='Score the confidence of fulfilling the client requirements',
-    backstory="""Uses skill match ratio and mapping to assign a percentage confidence level.""",
-    llm=llm,
-    verbose=True
-)
 
 # === Input data ===
 
+# Set to False to silence the stage banners (e.g. in batch mode)
+VERBOSE = True
+
 non_technical_description = (
     "I want to build a chatbot that answers customer questions using information from our product manuals. "
     "It should sound smart and respond fast, even when lots of people ask at once."
@@ -61,131 +71,225 @@ developer_skills = [
     "Kubernetes", "Redis", "GraphQL", "HTML", "CSS"
 ]
 
-def extract_skills():
-    task = Task(
-        description=(
-            f"""You are an AI assistant that extracts required technical skills, libraries, frameworks, or tools 
-            from a non-technical project description. ONLY return a Python list of strings.
-            No explanations. No thoughts. No extra text.
+def log(*args):
+    if VERBOSE:
+        print(*args)
 
-            Respond exactly like this:
-            ['LangChain', 'Flask', 'Kubernetes', 'GPT-4']
 
-            Here is the client request:
-            \"{non_technical_description}\""""
-        ),
+# Reworded copies of an earlier brief reuse its extracted skills (see near_duplicate.py)
+brief_index = None if os.getenv("BRIEF_REUSE_DISABLED") else near_duplicate.BriefIndex()
+
+
+FALLBACK_SKILLS = ["LangChain", "Flask", "Kubernetes", "GPT-4"]
+
+
+def extract_skills(description=non_technical_description):
+    if ingest.needs_chunking(description):
+        # Too long for one prompt: extract chunk by chunk and merge (see ingest.py)
+        log("\n📚 Extracting Required Skills from a Long Client Request in Chunks...\n")
+        skills = ingest.extract_chunked(ingest.text_chunks(description), _extract_skill_list)
+    else:
+        skills = _extract_skill_list(description)
+
+    if skills is None:
+        log("↩️ Fallback skills used.")
+        skills = list(FALLBACK_SKILLS)
+    log("✅ Extracted Skills:", skills)
+    return skills
+
+
+def extract_skills_from_file(path, workers=8):
+    # Briefs, RFPs or manuals on disk; large files are memory-mapped, never read whole
+    log(f"\n📚 Extracting Required Skills from {path} in Chunks...\n")
+    skills = ingest.extract_chunked(ingest.file_chunks(path), _extract_skill_list, workers=workers)
+    if skills is None:
+        log("↩️ Fallback skills used.")
+        skills = list(FALLBACK_SKILLS)
+    log("✅ Extracted Skills:", skills)
+    return skills
+
+
+def _extract_skill_list(description):
+    # One extraction call; None when the answer holds no parsable list
+    if brief_index is not None:
+        reused = brief_index.lookup(description)
+        if reused is not None:
+            log("\n♻️ Reusing Skills Extracted for a Near-Identical Request:", reused)
+            return list(reused)
+
+    task = Task(
+        description=prompts.render("extract_skills", description=description),
         expected_output="A valid Python list of strings like ['LangChain', 'Flask']. No explanations or extra text.",
         agent=requirement_analyzer
     )
 
-    crew = Crew(agents=[requirement_analyzer], tasks=[task], verbose=False)
-    print("\n🔍 Extracting Required Skills from Client Request...\n")
-    result = crew.kickoff()
-
-    raw_output = result.output if hasattr(result, 'output') else str(result)
-
-    # Try to extract a Python list from raw output using regex
-    match = re.search(r'\[.*?\]', raw_output, re.DOTALL)
-    if match:
-        try:
-            skills = ast.literal_eval(match.group(0))
-        except Exception:
-            print("❌ Could not parse the skill list, fallback used.")
-            skills = ["LangChain", "Flask", "Kubernetes", "GPT-4"]
+    log("\n🔍 Extracting Required Skills from Client Request...\n")
+    if streaming.ENABLED:
+        # Stop the model as soon as the list closes
+        raw_output = streaming.stream_literal(llm, task_prompt(task), '[', stage="extract_skills")
     else:
-        print("❌ No list found in output, fallback used.")
-        skills = ["LangChain", "Flask", "Kubernetes", "GPT-4"]
+        crew = Crew(agents=[requirement_analyzer], tasks=[task], verbose=False)
+        raw_output = kickoff(crew, validate=lambda out: _parse_skill_list(out) is not None)
 
-    print("✅ Extracted Skills:", skills)
+    skills = _parse_skill_list(raw_output)
+    if skills is None:
+        log("❌ No parsable list found in output.")
+        record_parse("extract_skills", False)
+        return None
+    record_parse("extract_skills", True)
+    if brief_index is not None:
+        brief_index.add(description, tuple(skills))
     return skills
 
 
+def _parse_skill_list(raw_output):
+    # The first Python list in the output, or None
+    match = re.search(r'\[.*?\]', raw_output, re.DOTALL)
+    if not match:
+        return None
+    try:
+        return ast.literal_eval(match.group(0))
+    except Exception:
+        return None
+
+
 # === Step 2: Compare developer and client skills ===
-def compare_skills(client_skills):
+# The ontology settles every skill it knows; the LLM only sees the rest.
+def compare_skills(client_skills, developer_skills=developer_skills):
+    log("\n🤹 Comparing Developer Skills with Client Required Skills...\n")
+    comparison = skill_ontology.compare(developer_skills, client_skills)
+    matched = comparison['matched_skills']
+    missing = comparison['similar_skills'] + comparison['missing_skills']
+
+    unknown_skills = comparison['unknown_skills']
+    if unknown_skills:
+        llm_matched, llm_missing = compare_unknown_skills(unknown_skills, developer_skills)
+        matched += llm_matched
+        missing += llm_missing
+
+    log("🧠 Matched Skills:", matched)
+    log("⚠️ Missing Skills:", missing)
+    return matched, missing
+
+
+def compare_unknown_skills(client_skills, developer_skills=developer_skills, fallback=True):
+    # (matched, missing); an unparsable answer counts every skill as missing,
+    # or returns None with fallback=False
     task = Task(
-        description=(
-            f"Compare the developer skills: {developer_skills} "
-            f"with the client required skills: {client_skills}. "
-            f"Identify which skills match and which are missing."
+        description=prompts.render(
+            "compare_skills",
+            developer_skills=prompts.encode_skills(developer_skills),
+            client_skills=prompts.encode_skills(client_skills, ids=False),
         ),
         expected_output="A JSON or Python dict with keys 'matched_skills' and 'missing_skills' and list values.",
         agent=skill_comparer
     )
-    crew = Crew(agents=[skill_comparer], tasks=[task], verbose=False)
-    print("\n🤹 Comparing Developer Skills with Client Required Skills...\n")
-    result = crew.kickoff()
-    raw_output = result.output if hasattr(result, 'output') else str(result)
-    
-    # Extract matched and missing skills from output (expecting dict or JSON)
+    if streaming.ENABLED:
+        raw_output = streaming.stream_literal(llm, task_prompt(task), '{', stage="compare_skills")
+    else:
+        crew = Crew(agents=[skill_comparer], tasks=[task], verbose=False)
+        raw_output = kickoff(crew, validate=lambda out: _parse_comparison(out) is not None)
+
+    comparison = _parse_comparison(raw_output)
+    if comparison is None:
+        record_parse("compare_skills", False)
+        if not fallback:
+            return None
+        log("❌ Failed to parse comparison output. Treating unknown skills as missing.")
+        return [], list(client_skills)
+    record_parse("compare_skills", True)
+    return comparison
+
+
+def _parse_comparison(raw_output):
+    # (matched, missing) from a dict (expecting dict or JSON), or None
     try:
         skills_dict = ast.literal_eval(raw_output)
-        matched = skills_dict.get('matched_skills', [])
-        missing = skills_dict.get('missing_skills', [])
+        return skills_dict.get('matched_skills', []), skills_dict.get('missing_skills', [])
     except Exception:
-        print("❌ Failed to parse comparison output. Using manual set logic.")
-        matched = list(set(developer_skills) & set(client_skills))
-        missing = list(set(client_skills) - set(developer_skills))
-
-    print("🧠 Matched Skills:", matched)
-    print("⚠️ Missing Skills:", missing)
-    return matched, missing
+        return None
 
 # === Step 3: Map relations for missing skills ===
-def map_relations(missing_skills):
-    task = Task(
-        description=(
-            f"Given the developer skills: {developer_skills}\n"
-            f"And the missing skills: {missing_skills}\n"
-            "For each missing skill, explain if it is related to any developer skill and how easy it would be for the developer to learn it. "
-            "If a missing skill is a library or framework for a language the developer knows, mark it as 'Easy to Learn'. "
-            "If there is overlap, explain the relationship. Otherwise, say 'Assess manually'."
-        ),
-        expected_output="Mapping of missing skills to related skills and difficulty.",
-        agent=relation_mapper
-    )
-    crew = Crew(agents=[relation_mapper], tasks=[task], verbose=False)
-    print("\n🔗 Mapping Relations for Missing Skills...\n")
-    result = crew.kickoff()
-    mapping_text = result.output if hasattr(result, 'output') else str(result)
-    print(mapping_text)
-    return mapping_text
+# One small request per missing skill, in parallel and memoized per profile
+def map_relations(missing_skills, developer_skills=developer_skills):
+    log("\n🔗 Mapping Relations for Missing Skills...\n")
+    mapping = difficulty.assess_difficulty(llm, relation_mapper, missing_skills, developer_skills)
+    log("📚 Learning Difficulty Assessment:", mapping)
+    return mapping
 
 # === Step 4: Confidence score based on mapping ===
-def score_confidence(matched_skills, total_skills, mapping_text):
-    task = Task(
-        description=(
-            f"Using matched skills count {len(matched_skills)} and total required skills {total_skills}, "
-            f"and the following mapping:\n{mapping_text}\n"
-            "Provide a confidence score (0-100%) on the ability to fulfill client requirements."
-        ),
-        expected_output="Confidence score as a percentage.",
-        agent=confidence_scorer
-    )
-    crew = Crew(agents=[confidence_scorer], tasks=[task], verbose=False)
-    print("\n⭐ Calculating Confidence Score...\n")
-    result = crew.kickoff()
-    confidence_str = result.output if hasattr(result, 'output') else str(result)
-    print(confidence_str)
-    try:
-        # Extract integer from response
-        score = int(re.search(r'\d+', confidence_str).group())
-    except Exception:
-        score = int((len(matched_skills) / total_skills) * 100)
-    print(f"📊 Confidence Score: {score}%")
+# Deterministic formula (scoring.py) instead of asking the LLM to do arithmetic
+def score_confidence(matched_skills, missing_skills, mapping):
+    log("\n⭐ Calculating Confidence Score...\n")
+    score = scoring.confidence(matched_skills, missing_skills, mapping)
+    log(f"📊 Confidence Score: {score}%")
     return score
 
 
+# === Stage graph ===
+# Each stage starts once its inputs exist: the deterministic pre-score
+# (matched% only) runs next to the relation mapping.
+def pre_score(matched_skills, missing_skills):
+    return scoring.confidence(matched_skills, missing_skills, {})
+
+
+PIPELINE = [
+    Stage("extract_skills", extract_skills, ["description"], ["client_skills"]),
+    Stage("compare_skills", compare_skills, ["client_skills", "developer_skills"], ["matched_skills", "missing_skills"]),
+    Stage("map_relations", map_relations, ["missing_skills", "developer_skills"], ["mapping"]),
+    Stage("pre_score", pre_score, ["matched_skills", "missing_skills"], ["pre_score"]),
+    Stage("score_confidence", score_confidence, ["matched_skills", "missing_skills", "mapping"], ["confidence_score"]),
+]
+
+
+# === Full pipeline for one (brief, developer profile) pair ===
+assessments = SingleFlight()
+
+
+# mode="crew" runs the four agents one after another; mode="fused" asks for
+# everything in one structured call and scores locally. Identical requests
+# (same brief up to whitespace and case, same canonical skill set, same mode)
+# that arrive while one is running share its result.
+def assess(description=non_technical_description, developer_skills=developer_skills, mode="crew"):
+    key = make_key(
+        "assess",
+        " ".join(description.split()).casefold(),
+        difficulty.profile_fingerprint(developer_skills),
+        mode,
+    )
+    result, shared = assessments.do(key, lambda: _assess(description, developer_skills, mode))
+    # Each caller gets its own copy so one cannot mutate another's result
+    return copy.deepcopy(result) if shared else result
+
+
+def _assess(description, developer_skills, mode):
+    with tracing.span("assess", mode=mode) as s:
+        if mode == "fused":
+            log("\n⚡ Running Fused Assessment...\n")
+            try:
+                result = fused.run_fused(llm, description, developer_skills)
+                log(f"📊 Confidence Score: {result['confidence_score']}%")
+                return {"mode": "fused", **result}
+            except (fused.FusedParseError, prompts.PromptBudgetError) as e:
+                log(f"❌ Fused assessment failed ({e}), falling back to the multi-agent pipeline.")
+                s.set(fallback=True)
+
+        values, timing = run_stages(PIPELINE, {
+            "description": description,
+            "developer_skills": developer_skills,
+        })
+        log(f"⏱️ Critical path: {' → '.join(timing['critical_path'])} ({timing['critical_path_ms']} ms)")
+        return {
+            "mode": "crew",
+            "client_skills": values["client_skills"],
+            "matched_skills": values["matched_skills"],
+            "missing_skills": values["missing_skills"],
+            "mapping": values["mapping"],
+            "pre_score": values["pre_score"],
+            "confidence_score": values["confidence_score"],
+            "timing": timing,
+        }
+
+
 if __name__ == "__main__":
-    # Step 1
-    client_skills = extract_skills()
-    
-    # Step 2
-    matched_skills, missing_skills = compare_skills(client_skills)
-    
-    # Steps 3 & 4 run in parallel
-    with ThreadPoolExecutor() as executor:
-        future_mapping = executor.submit(map_relations, missing_skills)
-        # Wait for mapping result to pass to confidence scorer
-        mapping_text = future_mapping.result()
-        future_confidence = executor.submit(score_confidence, matched_skills, len(client_skills), mapping_text)
-        confidence_score = future_confidence.result()
+    assess()
@@ -1,14 +1,22 @@
 from crewai import Agent, Task, Crew
-from langchain_groq import ChatGroq
+from llm_backend import agent_llm, make_llm
 from dotenv import load_dotenv
+from runner import kickoff, record_parse, task_prompt
+import prompts
+import scoring
+import skill_ontology
+import skill_similarity
+import difficulty
+import streaming
 import os
 import ast
 import re
 
 load_dotenv()
 
-llm = ChatGroq(
-    model_name="groq/llama3-8b-8192",
+llm = make_llm(
+    "groq",
+    "groq/llama3-8b-8192",
     api_key=os.getenv("GROQ_API_KEY"),
     temperature=0.3
 )
@@ -29,7 +37,7 @@ requirement_analyzer = Agent(
     goal='Analyze non-technical client input and extract the technical skills required for the task',
     backstory="""Specializes in interpreting non-technical project descriptions from clients and identifying the technical tools, libraries, or frameworks needed to implement it.
     Also identify the skills from the result that same skills are same or not in the clients request list.""",
-    llm=llm,
+    llm=agent_llm(llm),
     verbose=True
 )
 
@@ -48,7 +56,7 @@ skill_comparer = Agent(
         "- similar_skills (e.g. Python ≈ Machine Learning)\n"
         "- missing_skills (no match or related skill found)"
     ),
-    llm=llm,
+    llm=agent_llm(llm),
     verbose=True
 )
 
@@ -66,31 +74,25 @@ relation_mapper = Agent(
         "If a missing skill is a framework or library for a language the developer knows, mark as 'Easy'. "
         "If it's in a related domain, mark as 'Moderate'. Otherwise, mark as 'Difficult'. "
     ),
-    llm=llm,
+    llm=agent_llm(llm),
     verbose=True
 )
 
-confidence_scorer = Agent(
-    role='Confidence Scorer 🏆',
-    goal=(
-        "Given the matched skills (including similar skills) and the learning difficulty assessment for missing skills, "
-        "calculate an overall confidence score (0-100%) for the developer's ability to fulfill the client requirements. "
-        "If all or most missing skills are 'Easy', confidence should be very high (90-100). "
-        "If most are 'Easy' or 'Moderate', confidence should be high (70-89). "
-        "If most are 'Moderate', confidence should be moderate (50-69). "
-        "If there are any 'Difficult', reduce confidence accordingly (below 50). "
-        "Return ONLY an integer percentage, no explanation, no thoughts, no text, just the number."
-    ),
-    backstory=(
-        "You are an expert at evaluating project fit. "
-        "You use both the overlap of skills and the learning curve for missing skills to estimate how likely the developer is to succeed. "
-        "You must return ONLY an integer percentage, nothing else."
-    ),
-    llm=llm,
-    verbose=True
-)
-
-if __name__ == "__main__":
+def _literal(raw_output, pattern=None):
+    # The Python literal in the output (the first match of pattern, if given), or None
+    if pattern is not None:
+        match = re.search(pattern, raw_output, re.DOTALL)
+        if not match:
+            return None
+        raw_output = match.group(0)
+    try:
+        return ast.literal_eval(raw_output)
+    except Exception:
+        return None
+
+
+def run(description=non_technical_description, developer_skills=developer_skills):
+    client_skills = None
     task1 = Task(
         description=(
             f"""extracts  technical skills, libraries, frameworks, or tools 
@@ -101,33 +103,54 @@ if __name__ == "__main__":
             ['LangChain', 'Flask', 'Kubernetes', 'GPT-4']
 
             Here is the client request:
-            \"{non_technical_description}\""""
+            \"{description}\""""
         ),
         expected_output="A valid Python list of strings like ['LangChain', 'Flask']. No explanations or extra text.",
         agent=requirement_analyzer
     )
-    crew1 = Crew(agents=[requirement_analyzer], tasks=[task1], verbose=False)
     print("\n🔍 Extracting Required Skills from Client Request...\n")
-    result1 = crew1.kickoff()
-    raw_output1 = result1.output if hasattr(result1, 'output') else str(result1)
+    if streaming.ENABLED:
+        # Stop the model as soon as the list closes
+        raw_output1 = streaming.stream_literal(llm, task_prompt(task1), '[', stage="extract_skills")
+    else:
+        crew1 = Crew(agents=[requirement_analyzer], tasks=[task1], verbose=False)
+        raw_output1 = kickoff(crew1, validate=lambda out: isinstance(_literal(out, r'\[.*?\]'), list))
     match = re.search(r'\[.*?\]', raw_output1, re.DOTALL)
     if match:
         try:
             client_skills = ast.literal_eval(match.group(0))
+            record_parse("extract_skills", True)
             print("✅ Extracted Skills:", client_skills)
         except Exception:
+            record_parse("extract_skills", False)
             print("❌ Could not parse the skill list. Not found skills.")
     else:
+        record_parse("extract_skills", False)
         print("❌ No list found in output. Not found skills.")
         
     #------------TASK2-------------
     if isinstance(client_skills, list):
+        print("\n⚁ Comparing Developer Skills with Client Required Skills (Smart Matching)...\n")
+        # Known skills are settled by the local ontology; only the rest go to the LLM.
+        # Skills linked to one the developer knows count as missing, as in app.py,
+        # and the difficulty stage rates how easily they are picked up.
+        comparison = skill_ontology.compare(developer_skills, client_skills)
+        all_matched_skills = comparison['matched_skills']
+        missing_skills = comparison['similar_skills'] + comparison['missing_skills']
+        # Unknown skills with a close developer skill by n-gram similarity skip the LLM.
+        # Spelling overlap is not proof ("ReactiveX" is not React), so they stay missing,
+        # and the difficulty stage is told which developer skills look alike.
+        close_matches = skill_similarity.similar_skills(developer_skills, comparison['unknown_skills'])
+        if close_matches:
+            print("🔎 Close to known skills (still missing):", close_matches)
+        missing_skills += list(close_matches)
+        related = {skill: [dev for dev, _ in hits] for skill, hits in close_matches.items()}
+        unknown_skills = [s for s in comparison['unknown_skills'] if s not in close_matches]
+
+    if isinstance(client_skills, list) and unknown_skills:
         task2 = Task(
             description=(
-                f"""You are given the developer's skills:\n{developer_skills}\n
-                And the required client skills:\n{client_skills}\n
-                
-                Perform a deep comparison using technical reasoning. Go beyond exact matches.
+                f"""Perform a deep comparison using technical reasoning. Go beyond exact matches.
                 
                 - Consider related or prerequisite skills as "similar skills". For example:
                     • 'Python' ≈ 'LangChain', 'Machine Learning'
@@ -146,111 +169,60 @@ if __name__ == "__main__":
                     'missing_skills': [...]
                 }}
                 
-                Be concise. Do not explain. Just return the Python dict."""
+                Be concise. Do not explain. Just return the Python dict.
+
+                Developer skills: {prompts.encode_skills(developer_skills)}
+                Client required skills: {prompts.encode_skills(unknown_skills, ids=False)}"""
             ),
             expected_output="A Python dict with keys 'matched_skills', 'similar_skills', and 'missing_skills'.",
-            agent=s kill_comparer
+            agent=skill_comparer
         )
 
-        crew2 = Crew(agents=[skill_comparer], tasks=[task2], verbose=False)
-        print("\n⚁ Comparing Developer Skills with Client Required Skills (Smart Matching)...\n")
-        result2 = crew2.kickoff()
-        raw_output2 = result2.output if hasattr(result2, 'output') else str(result2)
+        if streaming.ENABLED:
+            raw_output2 = streaming.stream_literal(llm, task_prompt(task2), '{', stage="compare_skills")
+        else:
+            crew2 = Crew(agents=[skill_comparer], tasks=[task2], verbose=False)
+            raw_output2 = kickoff(crew2, validate=lambda out: isinstance(_literal(out), dict))
 
         try:
             skills_dict = ast.literal_eval(raw_output2)
             matched_skills = skills_dict.get('matched_skills', [])
             similar_skills = skills_dict.get('similar_skills', [])
-            missing_skills = skills_dict.get('missing_skills', [])
+            missing = skills_dict.get('missing_skills', [])
             # Combine matched and similar skills
-            all_matched_skills = list(set(matched_skills + similar_skills))
+            all_matched_skills += skill_ontology.canonicalize(matched_skills + similar_skills)
+            missing_skills += missing
+            record_parse("compare_skills", True)
         except Exception:
-            print("❌ Failed to parse smart comparison. Reverting to basic matching.")
-            all_matched_skills = list(set(developer_skills) & set(client_skills))
-            missing_skills = list(set(client_skills) - set(developer_skills))
+            record_parse("compare_skills", False)
+            print("❌ Failed to parse smart comparison. Treating unknown skills as missing.")
+            missing_skills += unknown_skills
 
+    if isinstance(client_skills, list):
         print("✅ Matched Skills (including similar):", all_matched_skills)
         print("⚠️ Missing Skills:", missing_skills)
 
         # ------------TASK3-------------
-        task3 = Task(
-            description=(
-                f"""Given the developer's skills:\n{developer_skills}\n
-                And the missing skills:\n{missing_skills}\n
-
-                For each missing skill, analyze how easy or difficult it would be for the developer to learn it,
-                based on their existing skills. Consider overlap, prerequisites, and domain similarity.
-
-                Return a Python dict mapping each missing skill to one of: 'Easy', 'Moderate', or 'Difficult'.
-
-                Example:
-                {{
-                    'Kubernetes': 'Easy',
-                    'GPT-4': 'Moderate'
-                    'Flutter': 'Difficult'
-                }}
-
-                Do not explain. Just return the Python dict."""
-            ),
-            expected_output="A Python dict mapping each missing skill to 'Easy', 'Moderate', or 'Difficult'.",
-            agent=relation_mapper
-        )
-
-        crew3 = Crew(agents=[relation_mapper], tasks=[task3], verbose=False)
+        # One small request per missing skill, in parallel and memoized per profile
         print("\n🧑‍🏫 Assessing Learning Difficulty for Missing Skills...\n")
-        result3 = crew3.kickoff()
-        raw_output3 = result3.output if hasattr(result3, 'output') else str(result3)
-        try:
-            difficulty_dict = ast.literal_eval(raw_output3)
-        except Exception:
-            print("❌ Failed to parse learning difficulty output.")
-            difficulty_dict = {}
-        print("📚 Learning Difficulty Assessment:", difficulty_dict)
-
-        # ------------TASK4-------------
-        task4 = Task(
-            description=(
-                f"""You are given:
-Matched skills (including similar): {all_matched_skills}
-Learning difficulty assessment: {difficulty_dict}
-
-Instructions:
-1. Count the total number of required skills (matched + missing).
-2. Calculate the percentage of matched skills: (number of matched skills / total required skills) * 100.
-3. Calculate the percentage of missing skills that are 'Easy' to learn: (number of 'Easy' / total required skills) * 100. Add this to the score.
-4. Calculate the percentage of missing skills that are 'Difficult' to learn: (number of 'Difficult' / total required skills) * 100. Subtract this from the score.
-5. The final confidence score is: matched percentage + easy percentage - difficult percentage.
-6. Return ONLY the final integer percentage. No explanation, no thoughts, no text, just the number.
-"""
-            ),
-            expected_output="An integer percentage representing confidence.",
-            agent=confidence_scorer
+        difficulty_dict = difficulty.assess_difficulty(
+            llm, relation_mapper, missing_skills, developer_skills, related=related
         )
+        print("📚 Learning Difficulty Assessment:", difficulty_dict)
 
-        crew4 = Crew(agents=[confidence_scorer], tasks=[task4], verbose=False)
-        print("\n🏆 Calculating Confidence Score...\n")
-        result4 = crew4.kickoff()
-        confidence_str = result4.output if hasattr(result4, 'output') else str(result4)
-        # Extract the first integer from the output
-        match = re.search(r'\d+', confidence_str)
-        if match:
-            confidence_score = int(match.group())
-            print(f"🔢 Confidence Score: {confidence_score}%")
-        else:
-            print(f"❌ Could not extract a confidence score. Raw output: {confidence_str}")
-        
         # ------------CONFIDENCE SCORE (Python logic, not LLM)-------------
         print("\n🏆 Calculating Confidence Score (Python logic)...\n")
-        total_required = len(all_matched_skills) + len(missing_skills)
-        if total_required == 0:
-            confidence_score = 0
-        else:
-            matched_percentage = (len(all_matched_skills) / total_required) * 100
-            easy_count = sum(1 for v in difficulty_dict.values() if v == 'Easy')
-            difficult_count = sum(1 for v in difficulty_dict.values() if v == 'Difficult')
-            easy_percentage = (easy_count / total_required) * 100
-            difficult_percentage = (difficult_count / total_required) * 100
-            confidence_score = int(matched_percentage + easy_percentage - difficult_percentage)
-            confidence_score = max(0, min(confidence_score, 100))  # Clamp between 0 and 100
+        confidence_score = scoring.confidence(all_matched_skills, missing_skills, difficulty_dict)
+        print(f"🔢 Confidence Score: {confidence_score}%")
+        return {
+            "client_skills": client_skills,
+            "matched_skills": all_matched_skills,
+            "missing_skills": missing_skills,
+            "mapping": difficulty_dict,
+            "confidence_score": confidence_score,
+        }
+    return {"client_skills": None, "confidence_score": None}
 
-        print(f"🔢 Confidence Score: {confidence_score}%")
\ No newline at end of file
+
+if __name__ == "__main__":
+    run()
@@ -1,13 +1,14 @@
 from crewai import Agent, Task, Crew
-from langchain_groq import ChatGroq
 from dotenv import load_dotenv
 import os
 import ast
 import re
 from crewai import Agent, Task, Crew, Process
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_backend import agent_llm, make_llm
 from dotenv import load_dotenv
 import os
+import fused
+import prompts
 
 # 1. Load environment variables from your .env file
 # This must be called at the very beginning to load GOOGLE_API_KEY
@@ -21,8 +22,9 @@ google_api_key = os.getenv("GOOGLE_API_KEY")
 # We're using 'gemini-1.5-flash-latest' as confirmed to be working.
 # 'temperature' controls creativity (0.3 is good for focused tasks).
 # 'convert_system_message_to_human=True' is important for LangChain's Gemini integration.
-llm = ChatGoogleGenerativeAI(
-    model="gemini-1.5-flash-latest",
+llm = make_llm(
+    "gemini",
+    "gemini-1.5-flash-latest",
     api_key=google_api_key,
     temperature=0.3,
     convert_system_message_to_human=True
@@ -45,7 +47,7 @@ requirement_analyzer = Agent(
     role='Requirement Analyzer 🕵️',
     goal='Analyze non-technical client input and extract the technical skills required for the task',
     backstory="""Specializes in interpreting non-technical project descriptions from clients and identifying the technical tools, libraries, or frameworks needed to implement it.""",
-    llm=llm,
+    llm=agent_llm(llm),
     verbose=True
 )
 # Agent 2: Skill Comparer 🤹
@@ -65,7 +67,7 @@ skill_comparer = Agent(
 
         "Identifies direct matches, then uses common industry knowledge to detect closely related or complementary skills. "
     ),
-    llm=llm,
+    llm=agent_llm(llm),
     verbose=True
 )
 # Agent 3: Relation Mapper 🧑‍🏫
@@ -83,34 +85,15 @@ relation_mapper = Agent(
         "If a missing skill is a framework or library for a language the developer knows, mark as 'Easy'. "
         "If it's in a related domain, mark as 'Moderate'. Otherwise, mark as 'Difficult'. "
     ),
-    llm=llm,
+    llm=agent_llm(llm),
     verbose=True
 )
-
-# Agent 4: Confidence Scorer 🏆
-confidence_scorer = Agent(
-    role='Confidence Scorer 🏆',
-    goal=(
-        "Given the matched skills (including similar skills) and the learning difficulty assessment for missing skills, "
-        "calculate an overall confidence score (0-100%) for the developer's ability to fulfill the client requirements. "
-        "If all or most missing skills are 'Easy', confidence should be very high (90-100). "
-        "If most are 'Easy' or 'Moderate', confidence should be high (70-89). "
-        "If most are 'Moderate', confidence should be moderate (50-69). "
-        "If there are any 'Difficult', reduce confidence accordingly (below 50). "
-        "Return ONLY an integer percentage, no explanation, no thoughts, no text, just the number."
-    ),
-    backstory=(
-        "You are an expert at evaluating project fit. "
-        "You use both the overlap of skills and the learning curve for missing skills to estimate how likely the developer is to succeed. "
-        "You must return ONLY an integer percentage, nothing else."
-    ),
-    llm=llm,
-    verbose=True
-)
-# Task 1: Requirement Analysis Task
-task1 = Task(
-    description=(
-        f"""Extract the technical skills, libraries, frameworks, or tools 
+# Build the three chained tasks and the crew for one (brief, developer profile) pair
+def build_crew(description=non_technical_description, developer_skills=developer_skills):
+    # Task 1: Requirement Analysis Task
+    task1 = Task(
+        description=(
+            f"""Extract the technical skills, libraries, frameworks, or tools 
         from a non-technical project description. ONLY return a Python list of strings.
         No explanations. No thoughts. No extra text.
 
@@ -118,17 +101,17 @@ task1 = Task(
         ['LangChain', 'Flask', 'Kubernetes', 'GPT-4']
 
         Here is the client request:
-        \"{non_technical_description}\""""
-    ),
-    expected_output="A valid Python list of strings like ['LangChain', 'Flask']. No explanations or extra text.",
-    agent=requirement_analyzer
-)
-
-# Task 2: Skill Matching Task
-task2 = Task(
-description=(
-    f"""You are given:
-1. A list of developer's skills:\n{developer_skills}
+        \"{description}\""""
+        ),
+        expected_output="A valid Python list of strings like ['LangChain', 'Flask']. No explanations or extra text.",
+        agent=requirement_analyzer
+    )
+
+    # Task 2: Skill Matching Task
+    task2 = Task(
+    description=(
+        f"""You are given:
+1. A list of developer's skills:\n{prompts.encode_skills(developer_skills)}
 2. A list of required client skills (from Task 1).
 
 Instructions:
@@ -143,66 +126,63 @@ Return ONLY a Python dictionary in this exact format:
 }}
 
 No explanation. No extra text."""
-)
-,
-    expected_output="A Python dict with keys 'matched_skills' and 'missing_skills'.",
-    agent=skill_comparer
-)
+    )
+    ,
+        expected_output="A Python dict with keys 'matched_skills' and 'missing_skills'.",
+        agent=skill_comparer
+    )
 
 
-# Task 3: Project Planning Task
-task3 = Task(
-            description=(
-                f"""Given the developer's skills:\n{developer_skills}\n
-                And the missing skills extracted from Task 2.\n
+    # Task 3: Project Planning Task
+    task3 = Task(
+                description=(
+                    f"""Given the developer's skills:\n{prompts.encode_skills(developer_skills)}\n
+                And the matched and missing skills extracted from Task 2.\n
 
                 For each missing skill, analyze how easy or difficult it would be for the developer to learn it,
                 based on their existing skills. Consider overlap, prerequisites, and domain similarity.
 
-                Return a Python dict mapping each missing skill to one of: 'Easy', 'Moderate', or 'Difficult'.
+                Return a Python dict with Task 2's 'matched_skills' and 'missing_skills' unchanged, plus
+                'difficulty': a dict mapping each missing skill to one of: 'Easy', 'Moderate', or 'Difficult'.
 
                 Example:
                 {{
-                    'Kubernetes': 'Easy',
-                    'GPT-4': 'Moderate',
-                    'Flutter': 'Difficult'(Skills which are unable to understand really easily)
+                    'matched_skills': ['Python', 'Docker'],
+                    'missing_skills': ['Kubernetes', 'GPT-4', 'Flutter'],
+                    'difficulty': {{
+                        'Kubernetes': 'Easy',
+                        'GPT-4': 'Moderate',
+                        'Flutter': 'Difficult'(Skills which are unable to understand really easily)
+                    }}
                 }}
 
                 Do not explain. Just return the Python dict."""
-            ),
-            expected_output="A Python dict mapping each missing skill to 'Easy', 'Moderate', or 'Difficult'.",
-            agent=relation_mapper
+                ),
+                expected_output="A Python dict with keys 'matched_skills', 'missing_skills' and 'difficulty' (missing skill -> 'Easy', 'Moderate', or 'Difficult').",
+                agent=relation_mapper
 
-)
-task4 = Task(
-            description=(
-                f"""You are given:
-               Matched skills  extracted from Task 2.\n
-Learning difficulty assessment  extracted from Task 3.\n
+    )
+
+    # Create the crew with all agents and tasks
+    return Crew(
+        agents=[requirement_analyzer, skill_comparer, relation_mapper],
+        tasks=[task1, task2, task3],
+        verbose=True
+    )
+
+
+crew = build_crew()
+
+
+def assess(description=non_technical_description, developer_skills=developer_skills, mode="crew"):
+    # mode="fused" replaces the agents with one structured call (see fused.assess_crew)
+    return fused.assess_crew(llm, build_crew, description, developer_skills, mode)
 
-Instructions:
-1. Count the total number of required skills (matched + missing).
-2. Calculate the percentage of matched skills: (number of matched skills / total required skills) * 100.
-3. Calculate the percentage of missing skills that are 'Easy' to learn: (number of 'Easy' / total required skills) * 100. Add this to the score.
-4. Calculate the percentage of missing skills that are 'Difficult' to learn: (number of 'Difficult' / total required skills) * 100. Subtract this from the score.
-5. The final confidence score is: matched percentage + easy percentage - difficult percentage.
-6. Return ONLY the final integer percentage. No explanation, no thoughts, no text, just the number.
-"""
-            ),
-            expected_output="An integer percentage  (1- 100) representing confidence.",
-            agent=confidence_scorer
-        )
-
-# Create the crew with all agents and tasks
-crew = Crew(
-    agents=[requirement_analyzer, skill_comparer, relation_mapper, confidence_scorer],
-    tasks=[task1, task2, task3,task4],
-    verbose=True
-)
 
 # Run the crew
 if __name__ == "__main__":
     print("\n🔍 Starting Skill Extraction and Matching Process...\n")
-    result = crew.kickoff()
+    result = assess()
     print("\n✅ Skill Matching Results:\n")
-    print(result)
+    print(result["raw_output"])
+    print(f"\n🔢 Confidence Score: {result['confidence_score']}%")
@@ -0,0 +1,117 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import app
+import ratelimit
+import tracing
+
+# === Batch assessment: JSONL in, JSONL out ===
+#
+# Each input line is a JSON object like:
+#   {"id": "brief-1", "description": "...", "developer_skills": ["Python", ...]}
+# "developer_skills" falls back to the profile in app.py when missing, and an
+# optional "mode" ("crew" or "fused") overrides --mode for that line.
+# Results are written as soon as each pair finishes, so the output order
+# follows completion order, not input order. A line that is not a JSON
+# object gets an {"id": <line number>, "error": ...} result like a failed
+# assessment, and the rest of the file is still assessed.
+
+
+def read_requests(path):
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"id": line_no, "error": f"JSONDecodeError: {e}"}
+                continue
+            if not isinstance(record, dict):
+                yield {"id": line_no, "error": f"Expected a JSON object, got {type(record).__name__}"}
+                continue
+            record.setdefault("id", line_no)
+            yield record
+
+
+def assess_record(record, mode="crew", submitted=None):
+    if "error" in record:
+        # A line read_requests could not use; reported as it is
+        return record
+    queue_wait_ms = round((time.perf_counter() - submitted) * 1000, 3) if submitted else 0.0
+    # Batch calls queue behind interactive ones for the shared model quota
+    with ratelimit.priority(ratelimit.BATCH), \
+            tracing.span("batch.record", stage="batch", record_id=record["id"], queue_wait_ms=queue_wait_ms):
+        try:
+            result = app.assess(
+                record["description"],
+                record.get("developer_skills", app.developer_skills),
+                mode=record.get("mode", mode),
+            )
+            return {"id": record["id"], **result}
+        except Exception as e:
+            tracing.annotate(error=f"{type(e).__name__}: {e}")
+            return {"id": record["id"], "error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(records, out, workers=8, mode="crew"):
+    # Keep at most 2 * workers pairs in flight so a huge input file is never
+    # loaded into the executor queue all at once.
+    max_pending = workers * 2
+    done_count = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        try:
+            for record in records:
+                pending.add(executor.submit(assess_record, record, mode, time.perf_counter()))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    done_count += _write_results(done, out)
+        finally:
+            # Pairs already submitted are written even if reading the input fails
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                done_count += _write_results(done, out)
+    return done_count
+
+
+def _write_results(futures, out):
+    for future in futures:
+        out.write(json.dumps(future.result(), ensure_ascii=False) + "\n")
+    out.flush()
+    return len(futures)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score (client brief, developer profile) pairs in bulk.")
+    parser.add_argument("input", help="JSONL file with one brief/profile pair per line")
+    parser.add_argument("-o", "--output", help="JSONL file for results (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=8, help="Number of pairs assessed concurrently")
+    parser.add_argument("-m", "--mode", choices=["crew", "fused"], default="crew",
+                        help="Multi-agent Crew or a single fused LLM call per pair")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the per-stage banners")
+    args = parser.parse_args(argv)
+
+    app.VERBOSE = args.verbose
+    metrics_server = tracing.serve_metrics()
+    if metrics_server:
+        print(f"📈 Serving metrics on :{metrics_server.server_address[1]}/metrics", file=sys.stderr)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        count = run_batch(read_requests(args.input), out, workers=args.workers, mode=args.mode)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"✅ Assessed {count} pairs.", file=sys.stderr)
+    if app.brief_index is not None and app.brief_index.stats["lookups"]:
+        stats = app.brief_index.stats
+        print(f"♻️ Reused extracted skills for {stats['reused']} of {stats['lookups']} briefs "
+              f"({app.brief_index.reuse_rate():.0%}).", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
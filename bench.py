@@ -0,0 +1,281 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import sys
+import time
+
+# === End-to-end benchmark of the four pipeline variants ===
+#
+# Runs app.py (staged functions), app2.py (inline tasks, Python scoring),
+# app3.py (one sequential Crew) and app4.py (Crew with context chaining),
+# plus app.py's fused mode, over a fixed corpus on the local fake backend.
+# Reports latency percentiles, per-stage time, LLM calls, tokens and
+# parse-failure rate, and can save/compare JSON baselines. A variant that
+# fails an assessment, or answers the same whatever the brief or profile,
+# stops the run: its timings would not measure the pipeline.
+
+BRIEFS = [
+    "I want to build a chatbot that answers customer questions using information from our product manuals. "
+    "It should sound smart and respond fast, even when lots of people ask at once.",
+    "We need a website where customers can book appointments and see a dashboard of their past visits.",
+    "Build a mobile app that recommends recipes based on what is in the user's fridge.",
+    "Our sales team wants a tool that predicts which leads will convert, using data from our CRM.",
+    "We want to search thousands of internal documents and get short answers with links to the source.",
+    "Create a web app that lets users upload an image of a plant and tells them what disease it has.",
+    "We need an API that our partners can call to check stock levels in real time, hosted in the cloud.",
+    "I want an assistant in Slack that summarizes long threads and answers questions about our policies.",
+]
+
+PROFILES = [
+    ["Python", "React", "AWS", "LangChain", "Docker", "PyTorch", "TensorFlow", "FastAPI", "Flask",
+     "PostgreSQL", "MongoDB", "JavaScript", "TypeScript", "Node.js", "Git", "Linux",
+     "Kubernetes", "Redis", "GraphQL", "HTML", "CSS", "machine learning"],
+    ["JavaScript", "React", "Node.js", "HTML", "CSS", "MongoDB", "Git"],
+    ["Python", "Django", "PostgreSQL", "Docker", "AWS", "Redis"],
+]
+
+VARIANTS = ["app", "app-fused", "app2", "app3", "app4"]
+
+# Relative increase that counts as a regression when comparing to a baseline
+DEFAULT_TOLERANCE = 0.10
+
+
+def percentile(values, pct):
+    # Nearest-rank percentile
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def load_variant(name):
+    if name in ("app", "app-fused"):
+        import app
+        app.VERBOSE = False
+        mode = "fused" if name == "app-fused" else "crew"
+        return app, lambda d, s: app.assess(d, s, mode=mode)
+    if name == "app2":
+        import app2
+        return app2, app2.run
+    if name == "app3":
+        import app3
+        return app3, app3.assess
+    if name == "app4":
+        import app4
+        return app4, app4.assess
+    raise ValueError(f"Unknown variant: {name}")
+
+
+def _snapshot(module):
+    import runner
+    llm = module.llm
+    return (
+        dict(llm.stats),
+        {k: dict(v) for k, v in llm.stage_stats.items()},
+        {k: dict(v) for k, v in runner.parse_stats.items()},
+    )
+
+
+def _delta(after, before):
+    return {k: after[k] - before.get(k, 0) for k in after}
+
+
+def _output(result):
+    # What an assessment answered, for telling apart runs on different inputs
+    return (
+        result.get("confidence_score"),
+        tuple(sorted(result.get("matched_skills", ()))),
+        tuple(sorted(result.get("missing_skills", ()))),
+    )
+
+
+def input_problems(outputs):
+    # outputs: {(brief, profile): output}. A variant whose answer does not
+    # change with the brief, or with the profile, is not measuring real work.
+    problems = []
+    briefs = {brief for brief, _ in outputs}
+    profiles = {profile for _, profile in outputs}
+    if len(briefs) > 1 and all(
+        len({outputs[b, p] for b in briefs if (b, p) in outputs}) <= 1 for p in profiles
+    ):
+        problems.append("output does not depend on the brief")
+    if len(profiles) > 1 and all(
+        len({outputs[b, p] for p in profiles if (b, p) in outputs}) <= 1 for b in briefs
+    ):
+        problems.append("output does not depend on the developer profile")
+    return problems
+
+
+def run_variant(name, corpus, repeat=1, allow_errors=False):
+    # Raises RuntimeError when an assessment fails (unless allow_errors, for
+    # runs with injected model errors) or when outputs ignore their inputs
+    import difficulty
+
+    module, assess = load_variant(name)
+    difficulty.memo.clear()
+    stats_before, stages_before, parse_before = _snapshot(module)
+
+    latencies = []
+    errors = 0
+    first_error = None
+    outputs = {}
+    for _ in range(repeat):
+        for description, skills in corpus:
+            started = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = assess(description, skills)
+                outputs[description, tuple(skills)] = _output(result)
+            except Exception as e:
+                errors += 1
+                first_error = first_error or e
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    if errors and not allow_errors:
+        raise RuntimeError(
+            f"{name}: {errors} of {len(latencies)} assessments failed, first: "
+            f"{type(first_error).__name__}: {first_error}"
+        ) from first_error
+    problems = input_problems(outputs)
+    if problems:
+        raise RuntimeError(f"{name}: {'; '.join(problems)}")
+
+    stats_after, stages_after, parse_after = _snapshot(module)
+    runs = len(latencies)
+    calls = _delta(stats_after, stats_before)
+    stages = {
+        stage: _delta(values, stages_before.get(stage, {}))
+        for stage, values in stages_after.items()
+    }
+    parse = {
+        stage: _delta(values, parse_before.get(stage, {}))
+        for stage, values in parse_after.items()
+    }
+    parse_attempts = sum(p["ok"] + p["failed"] for p in parse.values())
+    parse_failures = sum(p["failed"] for p in parse.values())
+
+    return {
+        "runs": runs,
+        "errors": errors,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "mean": round(sum(latencies) / runs, 2) if runs else 0.0,
+        },
+        "llm_calls_per_run": round(calls["calls"] / runs, 2) if runs else 0.0,
+        "prompt_tokens_per_run": round(calls["prompt_tokens"] / runs, 1) if runs else 0.0,
+        "completion_tokens_per_run": round(calls["completion_tokens"] / runs, 1) if runs else 0.0,
+        "parse_failure_rate": round(parse_failures / parse_attempts, 4) if parse_attempts else 0.0,
+        "stages": {
+            stage: {
+                "calls": values["calls"],
+                "total_ms": round(values["ms"], 2),
+                "mean_ms": round(values["ms"] / values["calls"], 2) if values["calls"] else 0.0,
+            }
+            for stage, values in sorted(stages.items()) if values["calls"]
+        },
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    regressions = []
+    checks = [
+        ("latency p95", lambda r: r["latency_ms"]["p95"]),
+        ("LLM calls/run", lambda r: r["llm_calls_per_run"]),
+        ("prompt tokens/run", lambda r: r["prompt_tokens_per_run"]),
+        ("completion tokens/run", lambda r: r["completion_tokens_per_run"]),
+    ]
+    for variant, result in results.items():
+        old = baseline.get("variants", {}).get(variant)
+        if old is None:
+            continue
+        for label, metric in checks:
+            before, after = metric(old), metric(result)
+            if before and after > before * (1 + tolerance):
+                regressions.append(f"{variant}: {label} {before} → {after}")
+        if result["parse_failure_rate"] > old["parse_failure_rate"] + tolerance / 10:
+            regressions.append(
+                f"{variant}: parse failure rate {old['parse_failure_rate']} → {result['parse_failure_rate']}"
+            )
+    return regressions
+
+
+def print_report(results):
+    header = f"{'variant':<10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'calls':>6} {'in tok':>8} {'out tok':>8} {'parse fail':>10}"
+    print(header)
+    print("-" * len(header))
+    for variant, r in results.items():
+        lat = r["latency_ms"]
+        print(
+            f"{variant:<10} {lat['p50']:>9} {lat['p95']:>9} {lat['p99']:>9} "
+            f"{r['llm_calls_per_run']:>6} {r['prompt_tokens_per_run']:>8} "
+            f"{r['completion_tokens_per_run']:>8} {r['parse_failure_rate']:>10.2%}"
+        )
+    for variant, r in results.items():
+        stages = ", ".join(f"{s} {v['mean_ms']} ms × {v['calls']}" for s, v in r["stages"].items())
+        print(f"  {variant}: {stages}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the app.py–app4.py pipeline variants offline.")
+    parser.add_argument("--variants", nargs="+", default=VARIANTS, choices=VARIANTS)
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the corpus per variant")
+    parser.add_argument("--first-token-ms", type=float, default=150, help="Fake model time to first token")
+    parser.add_argument("--per-token-ms", type=float, default=2, help="Fake model time per output token")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Fake model latency jitter (fraction)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake model error rate")
+    parser.add_argument("--save", help="Write results to this JSON baseline file")
+    parser.add_argument("--compare", help="Compare against this JSON baseline and exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    # Must be set before the app modules build their models
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ["LLM_CACHE_DISABLED"] = "1"
+    # app reuses extracted skills for repeated briefs; every variant should do the work
+    os.environ["BRIEF_REUSE_DISABLED"] = "1"
+    os.environ["FAKE_LLM_FIRST_TOKEN_MS"] = str(args.first_token_ms)
+    os.environ["FAKE_LLM_PER_TOKEN_MS"] = str(args.per_token_ms)
+    os.environ["FAKE_LLM_JITTER"] = str(args.jitter)
+    os.environ["FAKE_LLM_ERROR_RATE"] = str(args.error_rate)
+    os.environ.setdefault("FAKE_LLM_SEED", "0")
+
+    corpus = [(brief, skills) for brief in BRIEFS for skills in PROFILES]
+    results = {}
+    for variant in args.variants:
+        print(f"⏱️ Benchmarking {variant} over {len(corpus) * args.repeat} pairs...", file=sys.stderr)
+        try:
+            results[variant] = run_variant(variant, corpus, repeat=args.repeat, allow_errors=args.error_rate > 0)
+        except RuntimeError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+    print_report(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "config": {k: v for k, v in vars(args).items() if k not in ("save", "compare")},
+                "corpus_size": len(corpus),
+                "variants": results,
+            }, f, indent=2)
+        print(f"✅ Baseline saved to {args.save}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("✅ No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import scoring
+import skill_ontology
+import tracing
+
+# === Pre-filter cascade for job-feed triage ===
+#
+# Tier 1 scores a brief locally: the ontology skills (and phrase hints) named
+# in the raw text against the developer's profile, with similar skills
+# counted as easy to learn. Clear non-fits (below reject_below) and clear
+# fits (above accept_above) are decided there. Only the ambiguous middle,
+# and briefs naming too few skills to judge, go to the full pipeline (tier 2).
+# calibrate() picks the thresholds from pairs scored by both tiers, and an
+# optional audit sample of tier-1 decisions also runs tier 2 so the report
+# can state the agreement rate.
+
+# Full-pipeline confidence at or above which a brief counts as a fit
+FIT_SCORE = 50
+# Tier 1 escalates briefs naming fewer skills than this
+MIN_SKILLS = 2
+DEFAULT_THRESHOLDS = {"reject_below": 20, "accept_above": 85}
+THRESHOLDS_PATH = os.getenv("CASCADE_THRESHOLDS", "cascade_thresholds.json")
+
+
+def local_estimate(description, developer_skills):
+    # Returns the tier-1 score (None when there is too little to go on) and the skills found
+    skills = skill_ontology.find_skills(description)
+    if len(skills) < MIN_SKILLS:
+        return None, skills
+    comparison = skill_ontology.compare(developer_skills, skills)
+    similar = comparison["similar_skills"]
+    score = scoring.confidence(
+        comparison["matched_skills"],
+        similar + comparison["missing_skills"],
+        {skill: "Easy" for skill in similar},
+    )
+    return score, skills
+
+
+def load_thresholds(path=THRESHOLDS_PATH):
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return {**DEFAULT_THRESHOLDS, **json.load(f)}
+    return dict(DEFAULT_THRESHOLDS)
+
+
+def calibrate(pairs, target=0.95, min_support=5):
+    # pairs: (tier-1 score, full-pipeline score). Picks the widest thresholds
+    # whose decided briefs agree with the full pipeline at least `target` of the time.
+    pairs = [(local, full) for local, full in pairs if local is not None and full is not None]
+    reject_below, accept_above = 0, 101
+    for t in range(5, 101, 5):
+        below = [full for local, full in pairs if local < t]
+        if len(below) >= min_support and sum(f < FIT_SCORE for f in below) / len(below) >= target:
+            reject_below = t
+    for t in range(95, -1, -5):
+        above = [full for local, full in pairs if local > t]
+        if len(above) >= min_support and sum(f >= FIT_SCORE for f in above) / len(above) >= target:
+            accept_above = t
+    return {"reject_below": reject_below, "accept_above": max(accept_above, reject_below)}
+
+
+class Cascade:
+    def __init__(self, full=None, thresholds=None, audit_rate=0.0, seed=0):
+        # full(description, developer_skills) -> result with "confidence_score"
+        self.full = full
+        self.thresholds = thresholds or load_thresholds()
+        self.audit_rate = audit_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {
+            "briefs": 0, "accepted": 0, "rejected": 0, "escalated": 0,
+            "escalated_calls": 0, "audited": 0, "audit_calls": 0, "agreed": 0,
+        }
+
+    def _full(self):
+        if self.full is None:
+            import app
+            app.VERBOSE = False
+            self.full = lambda d, s: app.assess(d, s)
+        return self.full
+
+    def assess(self, description, developer_skills):
+        score, skills = local_estimate(description, developer_skills)
+        if score is not None and score < self.thresholds["reject_below"]:
+            decision = "reject"
+        elif score is not None and score > self.thresholds["accept_above"]:
+            decision = "accept"
+        else:
+            decision = None
+
+        with self._lock:
+            self.stats["briefs"] += 1
+            audit = decision is not None and self._rng.random() < self.audit_rate
+
+        result = {"tier": 1, "local_score": score, "local_skills": skills, "fit": decision == "accept"}
+        if decision is None or audit:
+            with tracing.count_llm_calls() as counts:
+                full = self._full()(description, developer_skills)
+            full_fit = full.get("confidence_score") is not None and full["confidence_score"] >= FIT_SCORE
+            with self._lock:
+                if decision is None:
+                    self.stats["escalated"] += 1
+                    self.stats["escalated_calls"] += counts["calls"]
+                else:
+                    self.stats["audited"] += 1
+                    self.stats["audit_calls"] += counts["calls"]
+                    self.stats["agreed"] += full_fit == (decision == "accept")
+            if decision is None:
+                result.update(tier=2, fit=full_fit, confidence_score=full.get("confidence_score"))
+            else:
+                result["audit_confidence_score"] = full.get("confidence_score")
+
+        if decision is not None:
+            with self._lock:
+                self.stats["accepted" if decision == "accept" else "rejected"] += 1
+        result["decision"] = decision or ("accept" if result["fit"] else "reject")
+        return result
+
+    def report(self):
+        s = self.stats
+        decided = s["accepted"] + s["rejected"]
+        # Tier-1 decisions avoid a full run each; price them at the observed calls per full run
+        full_runs = s["escalated"] + s["audited"]
+        calls_per_run = (s["escalated_calls"] + s["audit_calls"]) / full_runs if full_runs else 0.0
+        saved = decided * calls_per_run
+        return {
+            **s,
+            "tier1_rate": round(decided / s["briefs"], 4) if s["briefs"] else 0.0,
+            "llm_calls_per_full_run": round(calls_per_run, 2),
+            "llm_calls_saved_fraction": round(saved / (saved + s["escalated_calls"]), 4) if saved else 0.0,
+            "agreement_rate": round(s["agreed"] / s["audited"], 4) if s["audited"] else None,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Triage many briefs for one developer with a local pre-filter.")
+    parser.add_argument("briefs", help="JSONL file with one {\"id\", \"description\"} per line")
+    parser.add_argument("-s", "--skills", nargs="+", help="Developer skills (default: app.py's profile)")
+    parser.add_argument("-o", "--output", help="JSONL file for results (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=8)
+    parser.add_argument("--audit", type=float, default=0.0, help="Fraction of tier-1 decisions also run in full")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Run every brief through both tiers and save thresholds to CASCADE_THRESHOLDS")
+    args = parser.parse_args(argv)
+
+    from batch import read_requests
+
+    records = list(read_requests(args.briefs))
+    # Lines read_requests could not use are reported as they are, like batch.py does
+    invalid = [record for record in records if "error" in record]
+    records = [record for record in records if "error" not in record]
+    if args.skills is None:
+        import app
+        args.skills = app.developer_skills
+
+    if args.calibrate:
+        # Audit everything with thresholds that decide nothing, then fit them
+        cascade = Cascade(thresholds={"reject_below": 101, "accept_above": -1}, audit_rate=1.0)
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(lambda r: cascade.assess(r["description"], args.skills), records))
+        pairs = [(r["local_score"], r.get("audit_confidence_score", r.get("confidence_score"))) for r in results]
+        thresholds = calibrate(pairs)
+        with open(THRESHOLDS_PATH, "w", encoding="utf-8") as f:
+            json.dump(thresholds, f, indent=2)
+        print(f"✅ Saved thresholds {thresholds} to {THRESHOLDS_PATH}", file=sys.stderr)
+        return
+
+    cascade = Cascade(audit_rate=args.audit)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in invalid:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            for record, result in zip(records, executor.map(
+                    lambda r: cascade.assess(r["description"], args.skills), records)):
+                out.write(json.dumps({"id": record["id"], **result}, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(json.dumps(cascade.report(), indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
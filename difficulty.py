@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import difficulty_model
+import prompts
+import skill_ontology
+import tracing
+from llm_cache import LRUCache
+from runner import invoke, record_parse
+from scoring import DIFFICULTY_LEVELS
+
+# === Per-skill learning difficulty ===
+#
+# One small request per missing skill, run in parallel. Each answer is
+# memoized under (fingerprint of the developer's canonical skill set, skill),
+# so common gaps like "GPT-4" or "Kubernetes" are looked up instead of
+# regenerated, and one bad answer only costs a retry for that skill. When a
+# trained local classifier is available (difficulty_model.py), it answers
+# the questions it is confident about and only the rest reach the LLM.
+
+MAX_ATTEMPTS = 2
+
+# Static instructions first so every call shares the same prompt prefix
+DIFFICULTY_PROMPT = """{backstory}
+
+How hard is it for this developer to learn the missing skill?
+Answer with exactly one word: Easy, Moderate, or Difficult.
+
+"""
+
+DIFFICULTY_INPUT = """Developer skills: {developer_skills}
+Missing skill: {skill}"""
+
+# Appended when the caller knows developer skills with a similar name
+# (skill_similarity.py); a similar name is a lead, not proof
+RELATED_INPUT = "\nDeveloper skills with a similar name (may be unrelated): {related}"
+
+# LLM answers are appended here as training data for difficulty_model.py
+JUDGMENT_PATH = os.getenv("DIFFICULTY_LOG_PATH")
+_log_lock = threading.Lock()
+
+memo = LRUCache(max_entries=100_000)
+stats = {"memo_hits": 0, "local": 0, "requests": 0, "failures": 0}
+_stats_lock = threading.Lock()
+
+
+def profile_fingerprint(developer_skills):
+    keys = sorted({skill_ontology.canonical_id(s) or skill_ontology.normalize(s) for s in developer_skills})
+    return hashlib.sha1("\n".join(keys).encode("utf-8")).hexdigest()
+
+
+def _count(name):
+    with _stats_lock:
+        stats[name] += 1
+
+
+LEVEL_PATTERN = re.compile(r'\b(' + '|'.join(DIFFICULTY_LEVELS) + r')\b', re.IGNORECASE)
+
+
+def parse_level(raw_output):
+    match = LEVEL_PATTERN.search(raw_output)
+    return match.group(1).capitalize() if match else None
+
+
+def assess_skill(llm, agent, skill, developer_skills, fingerprint=None, related=()):
+    # llm is the caller's own client: crewai may have replaced agent.llm with
+    # a model of its own that has no invoke(); the agent supplies the backstory.
+    # related: developer skills with a similar name, passed on to the LLM.
+    fingerprint = fingerprint or profile_fingerprint(developer_skills)
+    related = tuple(sorted(related))
+    key = (fingerprint, skill_ontology.canonical_id(skill) or skill_ontology.normalize(skill), related)
+    level = memo.get(key)
+    if level is not None:
+        _count("memo_hits")
+        return level
+
+    # The local model cannot see name similarity, so hinted skills go to the LLM
+    model = difficulty_model.default_model() if not related else None
+    if model is not None:
+        level, probability = model.predict(developer_skills, skill)
+        if probability >= difficulty_model.MIN_CONFIDENCE:
+            _count("local")
+            memo.set(key, level)
+            return level
+
+    prompt = prompts.fit(
+        "map_relations",
+        DIFFICULTY_PROMPT.format(backstory=agent.backstory),
+        DIFFICULTY_INPUT + (RELATED_INPUT if related else ""),
+        {
+            "developer_skills": prompts.encode_skills(developer_skills),
+            "skill": skill_ontology.canonical_name(skill),
+            "related": ", ".join(related),
+        },
+        trim=(),
+    )
+    with tracing.span("difficulty.skill", stage="map_relations", skill=skill) as s:
+        for attempt in range(MAX_ATTEMPTS):
+            _count("requests")
+            s.set(retries=attempt)
+            with tracing.count_llm_calls() as calls:
+                level = parse_level(invoke(llm, prompt, validate=parse_level, stage="map_relations"))
+            record_parse("map_relations", level is not None)
+            if level is not None:
+                memo.set(key, level)
+                # Cached or shared answers were logged when first made
+                if JUDGMENT_PATH and calls["calls"]:
+                    _log_judgment(developer_skills, skill, level)
+                return level
+        _count("failures")
+        return None
+
+
+def _log_judgment(developer_skills, skill, level):
+    line = json.dumps({
+        "developer_skills": skill_ontology.canonicalize(developer_skills),
+        "skill": skill_ontology.canonical_name(skill),
+        "level": level,
+    }, ensure_ascii=False)
+    with _log_lock, open(JUDGMENT_PATH, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def assess_difficulty(llm, agent, missing_skills, developer_skills, max_workers=8, related=None):
+    # Returns {missing skill: 'Easy' | 'Moderate' | 'Difficult'}; skills whose
+    # answers could not be parsed are left out rather than failing the batch.
+    # related: {missing skill: developer skills with a similar name}, optional.
+    related = related or {}
+    if not missing_skills:
+        return {}
+    fingerprint = profile_fingerprint(developer_skills)
+    workers = min(max_workers, len(missing_skills))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            tracing.submit(executor, assess_skill, llm, agent, skill, developer_skills, fingerprint,
+                           related.get(skill, ()))
+            for skill in missing_skills
+        ]
+        levels = [future.result() for future in futures]
+    return {skill: level for skill, level in zip(missing_skills, levels) if level is not None}
@@ -0,0 +1,257 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+
+import numpy as np
+
+import skill_ontology
+from scoring import DIFFICULTY_LEVELS
+from skill_registry import popcount, registry
+
+# === Distilled difficulty classifier ===
+#
+# The difficulty stage asks the same question over and over: how hard is
+# this missing skill for a developer who knows these skills? This module
+# learns the LLM's answers with a multinomial logistic regression on CPU.
+# The features come from the ontology: whether a parent, related or child
+# skill is known, and the count and share of one- and two-hop neighbours
+# known. They also include the target skill itself and the developer's
+# ontology skills, which capture which skills co-occur with easy or hard
+# answers. difficulty.assess_skill asks the model first and only calls the
+# LLM when the model's probability is below MIN_CONFIDENCE.
+#
+# Training data is the judgment log that difficulty.py writes when
+# DIFFICULTY_LOG_PATH is set. Replayable LLM_RECORD_PATH recordings of
+# difficulty prompts work too.
+#   python difficulty_model.py train judgments.jsonl       # fit, report on a held-out split, save
+#   python difficulty_model.py report judgments.jsonl      # agreement of the saved model
+
+MODEL_PATH = os.getenv("DIFFICULTY_MODEL_PATH", "difficulty_model.npz")
+MIN_CONFIDENCE = float(os.getenv("DIFFICULTY_MODEL_MIN_CONFIDENCE", 0.85))
+
+ONTOLOGY = list(skill_ontology.SKILLS)
+N = len(ONTOLOGY)
+# Ontology skills hold registry ids 0..N-1 in SKILLS order
+ONTOLOGY_MASK = (1 << N) - 1
+
+
+def _two_hop(i):
+    reach = 0
+    for j in registry.ids(registry.neighbours[i]):
+        reach |= registry.neighbours[j]
+    return reach & ~registry.neighbours[i] & ~(1 << i)
+
+
+PARENTS = [registry.mask_of_keys(parents) for _, _, parents, _ in skill_ontology.SKILLS.values()]
+RELATED = [registry.mask_of_keys(related) for _, _, _, related in skill_ontology.SKILLS.values()]
+# Skills that build on or list this one; neighbours() links edges both ways
+CHILDREN = [registry.neighbours[i] & ~PARENTS[i] & ~RELATED[i] for i in range(N)]
+TWO_HOP = [_two_hop(i) for i in range(N)]
+
+# bias, in ontology, parent / related / child known, neighbours known (log),
+# share of neighbours known, two-hop neighbours known (log), ontology skills known (log)
+DENSE = 9
+FEATURES = DENSE + (N + 1) + N
+
+
+def ontology_mask(developer_skills):
+    # Ontology skills of a profile; looks skills up without interning new ones
+    mask = 0
+    for skill in developer_skills:
+        skill_id = registry.id_of(skill)
+        if skill_id is not None and skill_id < N:
+            mask |= 1 << skill_id
+    return mask
+
+
+def features(developer_mask, skill):
+    x = np.zeros(FEATURES)
+    skill_id = registry.id_of(skill)
+    if skill_id is None or skill_id >= N:
+        skill_id = N  # skills outside the ontology share one slot
+    x[0] = 1.0
+    x[DENSE + skill_id] = 1.0  # target skill one-hot
+    if skill_id < N:
+        known = registry.neighbours[skill_id] & developer_mask
+        x[1] = 1.0
+        x[2] = bool(PARENTS[skill_id] & developer_mask)
+        x[3] = bool(RELATED[skill_id] & developer_mask)
+        x[4] = bool(CHILDREN[skill_id] & developer_mask)
+        x[5] = np.log1p(popcount(known))
+        x[6] = popcount(known) / max(1, popcount(registry.neighbours[skill_id]))
+        x[7] = np.log1p(popcount(TWO_HOP[skill_id] & developer_mask))
+    x[8] = np.log1p(popcount(developer_mask))
+    dev = developer_mask & ONTOLOGY_MASK
+    for i in registry.ids(dev):
+        x[DENSE + N + 1 + i] = 1.0
+    return x
+
+
+def _softmax(z):
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+class DifficultyModel:
+    def __init__(self, weights):
+        self.weights = weights  # (FEATURES, 3)
+
+    @classmethod
+    def fit(cls, X, y, l2=1e-3, epochs=800, learning_rate=0.5):
+        # Full-batch gradient descent on the L2-regularized cross-entropy
+        targets = np.eye(len(DIFFICULTY_LEVELS))[y]
+        weights = np.zeros((X.shape[1], len(DIFFICULTY_LEVELS)))
+        for _ in range(epochs):
+            grad = X.T @ (_softmax(X @ weights) - targets) / len(X) + l2 * weights
+            weights -= learning_rate * grad
+        return cls(weights)
+
+    def predict_proba(self, X):
+        return _softmax(np.atleast_2d(X) @ self.weights)
+
+    def predict(self, developer_skills, skill):
+        # (level, probability) for one missing skill
+        p = self.predict_proba(features(ontology_mask(developer_skills), skill))[0]
+        best = int(p.argmax())
+        return DIFFICULTY_LEVELS[best], float(p[best])
+
+    def save(self, path=MODEL_PATH):
+        np.savez(path, weights=self.weights, ontology=np.array(ONTOLOGY))
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        data = np.load(path)
+        if list(data["ontology"]) != ONTOLOGY:
+            raise ValueError(f"{path} was trained on a different skill ontology; retrain it")
+        return cls(data["weights"])
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_model():
+    # The model at DIFFICULTY_MODEL_PATH, loaded once; None when there is none
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                model = False
+                if MODEL_PATH and os.path.exists(MODEL_PATH):
+                    try:
+                        model = DifficultyModel.load(MODEL_PATH)
+                    except (OSError, ValueError, KeyError) as e:
+                        print(f"⚠️ Ignoring difficulty model: {e}", file=sys.stderr)
+                _default = model
+    return _default or None
+
+
+# === Training data ===
+
+def read_judgments(path):
+    # {"developer_skills": [...], "skill": "...", "level": "Easy" | ...} per line
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                if record.get("level") in DIFFICULTY_LEVELS:
+                    yield record["developer_skills"], record["skill"], record["level"]
+
+
+def read_recordings(path):
+    # Difficulty prompts in an LLM_RECORD_PATH file (see runner.py)
+    pattern = re.compile(r"Developer skills: (\[.*?\])\nMissing skill: ([^\n]+)", re.DOTALL)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            match = pattern.search(record["prompt"])
+            level = re.search(r"\b(Easy|Moderate|Difficult)\b", record["response"], re.IGNORECASE)
+            if match and level:
+                yield json.loads(match.group(1)), match.group(2).strip(), level.group(1).capitalize()
+
+
+def matrix(judgments):
+    X, y, keys = [], [], []
+    for developer_skills, skill, level in judgments:
+        X.append(features(ontology_mask(developer_skills), skill))
+        y.append(DIFFICULTY_LEVELS.index(level))
+        profile = ",".join(sorted({registry.key(s) for s in developer_skills}))
+        keys.append(f"{profile}:{registry.key(skill)}")
+    return np.array(X).reshape(-1, FEATURES), np.array(y, dtype=np.int64), keys
+
+
+def holdout(keys, fraction):
+    # Split by (profile, skill) so repeats of one question never straddle the split
+    return np.array([
+        int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF < fraction
+        for key in keys
+    ], dtype=bool)
+
+
+def report(model, X, y, min_confidence=MIN_CONFIDENCE):
+    if not len(y):
+        return {"examples": 0}
+    p = model.predict_proba(X)
+    predicted = p.argmax(axis=1)
+    confident = p.max(axis=1) >= min_confidence
+    confusion = np.zeros((3, 3), dtype=np.int64)
+    np.add.at(confusion, (y, predicted), 1)
+    return {
+        "examples": int(len(y)),
+        "accuracy": round(float((predicted == y).mean()), 4),
+        "min_confidence": min_confidence,
+        # Share of questions answered locally, and how often those answers match the LLM
+        "answered_locally": round(float(confident.mean()), 4),
+        "local_agreement": round(float((predicted == y)[confident].mean()), 4) if confident.any() else None,
+        "confusion": {
+            level: dict(zip(DIFFICULTY_LEVELS, map(int, row)))
+            for level, row in zip(DIFFICULTY_LEVELS, confusion)
+        },
+    }
+
+
+def _load(args):
+    judgments = []
+    for path in args.judgments:
+        judgments += read_judgments(path)
+    for path in args.recordings or ():
+        judgments += read_recordings(path)
+    return matrix(judgments)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train or evaluate the local difficulty classifier.")
+    parser.add_argument("command", choices=["train", "report"])
+    parser.add_argument("judgments", nargs="*", help="Judgment logs written via DIFFICULTY_LOG_PATH")
+    parser.add_argument("--recordings", nargs="+", help="LLM_RECORD_PATH files to mine for difficulty answers")
+    parser.add_argument("-m", "--model", default=MODEL_PATH, help="Model file to write or read")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Share of questions held out for the report")
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE)
+    args = parser.parse_args(argv)
+
+    X, y, keys = _load(args)
+    if not len(y):
+        parser.error("no labelled difficulty judgments found")
+
+    if args.command == "train":
+        test = holdout(keys, args.holdout)
+        model = DifficultyModel.fit(X[~test], y[~test])
+        model.save(args.model)
+        print(f"✅ Trained on {int((~test).sum())} judgments, saved to {args.model}", file=sys.stderr)
+        print(json.dumps({"held_out": report(model, X[test], y[test], args.min_confidence)}, indent=2))
+    else:
+        model = DifficultyModel.load(args.model)
+        print(json.dumps(report(model, X, y, args.min_confidence), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import ast
+import json
+import re
+
+import prompts
+import scoring
+from runner import invoke, kickoff, record_parse
+from scoring import DIFFICULTY_LEVELS
+
+# === Fused pipeline: one structured LLM call instead of four agents ===
+#
+# The model returns extracted skills, the matched/missing split and the
+# difficulty map as one JSON object; the confidence score is computed
+# locally by scoring.py. assess_crew() is the shared entry point of the
+# single-crew variants (app3.py, app4.py): fused mode with the crew as
+# fallback, or the crew alone.
+
+FUSED_SCHEMA = {
+    "client_skills": ["<technical skill required by the client>"],
+    "matched_skills": ["<client skill the developer has, exactly or via a closely related skill>"],
+    "missing_skills": ["<client skill the developer lacks>"],
+    "difficulty": {"<missing skill>": "Easy | Moderate | Difficult"},
+}
+
+FUSED_PROMPT = """You assess whether a developer can deliver a client's project.
+
+1. Extract the technical skills, libraries, frameworks, or tools required by the client request.
+2. Compare them with the developer's skills. Closely related skills count as matched
+   (e.g. Natural Language Processing ≈ Machine Learning, Flask ≈ Django).
+3. For each missing skill, rate how hard it is for this developer to learn:
+   'Easy' if it is a framework or library for a language the developer knows,
+   'Moderate' if it is in a related domain, otherwise 'Difficult'.
+
+Return ONLY a JSON object matching this schema. No explanations. No extra text.
+{schema}
+
+"""
+
+FUSED_INPUT = """Developer skills: {developer_skills}
+
+Client request:
+"{description}"
+"""
+
+
+class FusedParseError(ValueError):
+    pass
+
+
+def build_prompt(description, developer_skills):
+    return prompts.fit(
+        "fused",
+        FUSED_PROMPT.format(schema=json.dumps(FUSED_SCHEMA)),
+        FUSED_INPUT,
+        {"developer_skills": prompts.encode_skills(developer_skills), "description": description},
+    )
+
+
+def _string_list(value, field):
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise FusedParseError(f"'{field}' must be a list of strings")
+    return value
+
+
+def parse_response(raw_output):
+    match = re.search(r'\{.*\}', raw_output, re.DOTALL)
+    if not match:
+        raise FusedParseError("No JSON object found in output")
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError as e:
+        raise FusedParseError(f"Invalid JSON: {e}") from e
+
+    client_skills = _string_list(data.get('client_skills'), 'client_skills')
+    matched = _string_list(data.get('matched_skills', []), 'matched_skills')
+    missing = _string_list(data.get('missing_skills', []), 'missing_skills')
+    difficulty = data.get('difficulty', {})
+    if not isinstance(difficulty, dict):
+        raise FusedParseError("'difficulty' must be an object")
+    # The model answers under "difficulty"; results use "mapping", like the crew pipeline
+    mapping = {
+        skill: level for skill, level in difficulty.items()
+        if skill in missing and level in DIFFICULTY_LEVELS
+    }
+    return {
+        "client_skills": client_skills,
+        "matched_skills": matched,
+        "missing_skills": missing,
+        "mapping": mapping,
+    }
+
+
+def _is_valid(raw_output):
+    try:
+        parse_response(raw_output)
+        return True
+    except FusedParseError:
+        return False
+
+
+def run_fused(llm, description, developer_skills):
+    raw_output = invoke(llm, build_prompt(description, developer_skills), validate=_is_valid, stage="fused")
+    try:
+        result = parse_response(raw_output)
+    except FusedParseError:
+        record_parse("fused", False)
+        raise
+    record_parse("fused", True)
+    result["confidence_score"] = scoring.confidence(
+        result["matched_skills"], result["missing_skills"], result["mapping"]
+    )
+    return result
+
+
+def parse_report(output):
+    # (matched, missing, difficulty map) from a crew's last task dict, or None
+    match = re.search(r'\{.*\}', output, re.DOTALL)
+    try:
+        report = ast.literal_eval(match.group(0))
+        matched, missing, mapping = report['matched_skills'], report['missing_skills'], report['difficulty']
+    except Exception:
+        return None
+    if not (isinstance(matched, list) and isinstance(missing, list) and isinstance(mapping, dict)):
+        return None
+    return matched, missing, mapping
+
+
+def assess_crew(llm, build_crew, description, developer_skills, mode="crew"):
+    # build_crew(description, developer_skills) -> Crew whose last task returns
+    # the skill split and difficulty map; both modes score locally
+    if mode == "fused":
+        try:
+            return {"mode": "fused", **run_fused(llm, description, developer_skills)}
+        except (FusedParseError, prompts.PromptBudgetError) as e:
+            print(f"❌ Fused assessment failed ({e}), falling back to the crew.")
+    output = kickoff(build_crew(description, developer_skills), validate=lambda out: parse_report(out) is not None)
+    report = parse_report(output)
+    if report is None:
+        record_parse("map_relations", False)
+        score = None
+    else:
+        score = scoring.confidence(*report)
+        record_parse("map_relations", True)
+    return {"mode": "crew", "confidence_score": score, "raw_output": output}
@@ -0,0 +1,146 @@
+import hashlib
+import threading
+
+import scoring
+import skill_ontology
+import tracing
+from skill_registry import registry
+
+# === Incremental re-assessment ===
+#
+# An IncrementalAssessor keeps the last result of each stage together with
+# the fingerprint of what it depended on. When the brief or the profile is
+# edited, only the affected stages run again:
+#   * extraction, only if the (normalized) brief changed
+#   * the matched/missing split, recomputed locally every time, except for
+#     skills the ontology does not know: the LLM's verdict on each is kept
+#     with the (canonical) developer skills it was judged against, and only
+#     asked again when the edit can change it. A match survives added skills
+#     and a miss survives removed ones; a miss after additions is only checked
+#     against the added skills.
+#   * difficulty, only for skills that are newly missing or whose
+#     dependency changed. For an ontology skill the dependency is the set of
+#     developer skills linked to it (adding Python makes Flask easier; adding
+#     Rust does not). For unknown skills it is just the skill itself.
+#   * the score, always (it is arithmetic)
+# One assessor holds one (brief, profile) conversation, e.g. a UI session.
+
+
+def brief_fingerprint(description):
+    return hashlib.sha1(" ".join(description.split()).casefold().encode("utf-8")).hexdigest()
+
+
+def skill_dependency(skill, developer_mask):
+    # What a missing skill's difficulty rating depends on, as a hashable key:
+    # the skill's canonical key and the bitmask of linked developer skills
+    # (none for skills outside the ontology)
+    skill_id = registry.id_of(skill)
+    linked = registry.similar(skill_id, developer_mask) if skill_id is not None and skill_id < registry.known else 0
+    return (registry.key(skill), linked)
+
+
+class IncrementalAssessor:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.brief_key = None
+        self.client_skills = None
+        # missing skill -> (dependency key, difficulty level)
+        self.difficulty = {}
+        # unknown client skill -> (developer skill keys judged against, matched)
+        self.unknown = {}
+
+    def assess(self, description, developer_skills):
+        import app
+
+        with self._lock, tracing.span("assess", mode="incremental") as s:
+            recomputed = {"extract_skills": False, "compare_skills": [], "map_relations": []}
+
+            brief_key = brief_fingerprint(description)
+            if brief_key != self.brief_key:
+                self.client_skills = app.extract_skills(description)
+                self.brief_key = brief_key
+                recomputed["extract_skills"] = True
+            client_skills = self.client_skills
+
+            matched, missing, asked = self._compare(app, client_skills, developer_skills)
+            recomputed["compare_skills"] = asked
+
+            developer_mask = registry.mask(developer_skills)
+            dependencies = {skill: skill_dependency(skill, developer_mask) for skill in missing}
+            stale = [
+                skill for skill in missing
+                if self.difficulty.get(skill, (None,))[0] != dependencies[skill]
+            ]
+            fresh = app.map_relations(stale, developer_skills) if stale else {}
+            recomputed["map_relations"] = stale
+
+            # Skills no longer missing are dropped; unparsed answers are retried next time
+            self.difficulty = {
+                skill: (dependencies[skill], fresh[skill] if skill in fresh else self.difficulty[skill][1])
+                for skill in missing
+                if skill in fresh or (skill not in stale and skill in self.difficulty)
+            }
+            mapping = {skill: level for skill, (_, level) in self.difficulty.items()}
+            s.set(reextracted=recomputed["extract_skills"], recompared=len(asked), reassessed=len(stale))
+
+            return {
+                "mode": "incremental",
+                "client_skills": client_skills,
+                "matched_skills": matched,
+                "missing_skills": missing,
+                "mapping": mapping,
+                "confidence_score": scoring.confidence(matched, missing, mapping),
+                "recomputed": recomputed,
+            }
+
+    def _compare(self, app, client_skills, developer_skills):
+        # app.compare_skills, sending unknown skills to the LLM only when their
+        # cached verdict may no longer hold; also returns the skills it asked about
+        comparison = skill_ontology.compare(developer_skills, client_skills)
+        matched = comparison["matched_skills"]
+        missing = comparison["similar_skills"] + comparison["missing_skills"]
+        profile = frozenset(registry.key(skill) for skill in developer_skills)
+
+        verdicts, full, partial = {}, [], {}
+        for skill in comparison["unknown_skills"]:
+            judged, was_matched = self.unknown.get(skill, (None, None))
+            if judged is None:
+                full.append(skill)
+            elif judged <= profile if was_matched else profile <= judged:
+                verdicts[skill] = self.unknown[skill]
+            elif not was_matched:
+                # Missing before, so only a skill added since can match it
+                partial.setdefault(judged, []).append(skill)
+            else:
+                full.append(skill)
+
+        asked = list(full)
+        if full:
+            self._judge(app, full, developer_skills, profile, profile, verdicts)
+        for judged, skills in partial.items():
+            added = [skill for skill in developer_skills if registry.key(skill) not in judged]
+            asked += skills
+            self._judge(app, skills, added, profile, judged | profile, verdicts)
+
+        self.unknown = verdicts
+        for skill in comparison["unknown_skills"]:
+            if skill in verdicts:
+                (matched if verdicts[skill][1] else missing).append(skill)
+            else:
+                # Unparsed answers count as missing and are asked again next time
+                missing.append(skill)
+        app.log("🧠 Matched Skills:", matched)
+        app.log("⚠️ Missing Skills:", missing)
+        return matched, missing, asked
+
+    @staticmethod
+    def _judge(app, skills, developer_skills, matched_under, missing_under, verdicts):
+        # Ask about skills against developer_skills; a match holds for the
+        # profile, a miss for every developer skill it has been checked against
+        answer = app.compare_unknown_skills(skills, developer_skills, fallback=False)
+        if answer is None:
+            return
+        llm_matched = {registry.key(skill) for skill in answer[0]}
+        for skill in skills:
+            is_matched = registry.key(skill) in llm_matched
+            verdicts[skill] = (matched_under if is_matched else missing_under, is_matched)
@@ -0,0 +1,140 @@
+import argparse
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import skill_ontology
+import tracing
+from llm_backend import count_tokens
+
+# === Chunked ingestion for long briefs and attached documents ===
+#
+# A multi-page RFP or product manual does not fit one extraction prompt, and
+# trimming it loses most of the requirements. Long text is cut into chunks
+# that fit the extract_skills budget, each chunk is extracted in parallel
+# (map), and the lists are merged through the canonical skill normalizer
+# (reduce). Files at least MMAP_MIN_BYTES long are memory-mapped, and only
+# 2 * workers chunks are in flight at once, so memory stays flat however long
+# the document is and latency follows the slowest chunk, not the page count.
+
+CHUNK_TOKENS = int(os.getenv("INGEST_CHUNK_TOKENS", 400))
+MMAP_MIN_BYTES = 1 << 20
+# Preferred cut points, best first; all are ASCII, so cutting after one never
+# splits a UTF-8 character (a hard cut backs off to a character boundary)
+BREAKS = (b"\n\n", b"\n", b". ", b" ")
+
+
+def needs_chunking(text, chunk_tokens=CHUNK_TOKENS):
+    return count_tokens(text) > chunk_tokens
+
+
+def iter_chunks(buf, chunk_tokens=CHUNK_TOKENS):
+    # Yields str chunks of a bytes-like buffer (bytes or mmap), each cut at
+    # the latest paragraph, line, sentence or word break within the limit
+    limit = chunk_tokens * 4
+    start, size = 0, len(buf)
+    while start < size:
+        end = min(start + limit, size)
+        if end < size:
+            for sep in BREAKS:
+                cut = buf.rfind(sep, start + limit // 2, end)
+                if cut != -1:
+                    end = cut + len(sep)
+                    break
+            else:
+                # No break in reach: never cut inside a character (continuation bytes are 10xxxxxx)
+                while end > start + 1 and buf[end] & 0xC0 == 0x80:
+                    end -= 1
+        chunk = buf[start:end].decode("utf-8", errors="ignore").strip()
+        if chunk:
+            yield chunk
+        start = end
+
+
+def text_chunks(text, chunk_tokens=CHUNK_TOKENS):
+    return iter_chunks(text.encode("utf-8"), chunk_tokens)
+
+
+def file_chunks(path, chunk_tokens=CHUNK_TOKENS):
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        if size < MMAP_MIN_BYTES:
+            yield from iter_chunks(f.read(), chunk_tokens)
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield from iter_chunks(buf, chunk_tokens)
+
+
+def extract_chunked(chunks, extract, workers=8):
+    # extract(chunk) -> list of skills, or None when its answer did not parse.
+    # Returns the merged, deduplicated list (most-mentioned first, ties in
+    # document order), or None if no chunk produced a list.
+    results = {}  # chunk index -> skills
+    with tracing.span("ingest.extract", stage="extract_skills") as s, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        chunk_count = 0
+
+        def collect(done):
+            for future in done:
+                index, skills = futures.pop(future), future.result()
+                if skills is not None:
+                    results[index] = skill_ontology.canonicalize(skills)
+
+        futures = {}
+        for chunk in chunks:
+            future = tracing.submit(executor, extract, chunk)
+            futures[future] = chunk_count
+            chunk_count += 1
+            pending.add(future)
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+        # Merge in chunk order, not completion order, so ties break the same way every run
+        mentions = {}
+        for index in sorted(results):
+            for skill in results[index]:
+                mentions[skill] = mentions.get(skill, 0) + 1
+        s.set(chunks=chunk_count, parsed_chunks=len(results), skills=len(mentions))
+
+    if not results:
+        return None
+    # Stable sort keeps first-seen order among equally mentioned skills
+    return sorted(mentions, key=mentions.get, reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract skills from a long brief, RFP or manual, and optionally assess it.")
+    parser.add_argument("path", help="Text file to ingest")
+    parser.add_argument("-s", "--skills", nargs="+", help="Developer skills to assess against (default: app.py's profile)")
+    parser.add_argument("-w", "--workers", type=int, default=8, help="Chunks extracted concurrently")
+    parser.add_argument("--extract-only", action="store_true", help="Print the merged skill list and stop")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the per-stage banners")
+    args = parser.parse_args(argv)
+
+    import app
+    from scheduler import run_stages
+
+    app.VERBOSE = args.verbose
+    client_skills = app.extract_skills_from_file(args.path, workers=args.workers)
+    if args.extract_only:
+        print(json.dumps(client_skills, ensure_ascii=False))
+        return
+
+    stages = [stage for stage in app.PIPELINE if stage.name != "extract_skills"]
+    values, timing = run_stages(stages, {
+        "client_skills": client_skills,
+        "developer_skills": args.skills or app.developer_skills,
+    })
+    result = {k: values[k] for k in ("matched_skills", "missing_skills", "mapping", "pre_score", "confidence_score")}
+    print(json.dumps({"client_skills": client_skills, **result, "timing": timing}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
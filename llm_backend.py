@@ -0,0 +1,410 @@
+import ast
+import functools
+import itertools
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+
+import skill_ontology
+
+# === LLM backends ===
+#
+# make_llm() is the one place the apps build their chat model. With
+# LLM_BACKEND=fake it returns FakeLLM, a local stand-in that needs no network
+# or API key: it replays recorded responses or generates answers in the shape
+# each stage expects, with configurable first-token/per-token latency,
+# jitter and error rate. That makes every pipeline reproducible offline.
+#
+# The app modules call make_llm() and build their agents at import time.
+# Modules that reuse app's stages (cascade, incremental, ingest, roster_index,
+# team) therefore import app inside the functions that need it, so they stay
+# importable, and their local work usable, without building a client.
+
+BACKEND = os.getenv("LLM_BACKEND", "live")
+ROUTED = bool(os.getenv("LLM_ROUTER"))
+
+
+def make_llm(provider, model, temperature=0.3, **kwargs):
+    if ROUTED:
+        from router import make_router
+        return make_router((provider, model, kwargs), temperature)
+    return make_client(provider, model, temperature, **kwargs)
+
+
+def make_client(provider, model, temperature=0.3, **kwargs):
+    if BACKEND == "fake":
+        return FakeLLM(model=f"fake/{model}", temperature=temperature)
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(model_name=model, temperature=temperature, **kwargs)
+    if provider == "gemini":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(model=model, temperature=temperature, **kwargs)
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+def is_local(llm):
+    llm = client_of(llm) or llm
+    backends = getattr(llm, "backends", None)
+    if backends is not None:
+        # A router is local when every client it routes to is
+        return all(is_local(b.llm) for b in backends)
+    return isinstance(llm, FakeLLM)
+
+
+# === Agent models ===
+#
+# FakeLLM and Router are not models crewai accepts: 0.28 needs LangChain
+# callbacks and bind(), 0.86 rebuilds any other model as a litellm LLM from
+# its name, and 1.x only takes a BaseLLM. agent_llm() hands crewai a model of
+# the type it expects under a name of its own ("<model>#<n>"), since only the
+# name survives 0.86's rebuild, and remembers the client under that name.
+# client_of() finds it again from whatever the agent ends up holding, and
+# runner.kickoff runs those crews itself, before crewai calls anything.
+
+_agent_clients = {}
+_agent_clients_lock = threading.Lock()
+_agent_numbers = itertools.count(1)
+
+
+def _is_own_client(llm):
+    return isinstance(llm, FakeLLM) or getattr(llm, "backends", None) is not None
+
+
+def agent_llm(llm):
+    # The model to give a crewai Agent; LangChain chat models pass unchanged
+    if not _is_own_client(llm):
+        return llm
+    with _agent_clients_lock:
+        # Clients often share a model name; each wrapper gets its own
+        name = f"{llm.model_name}#{next(_agent_numbers)}"
+        _agent_clients[name] = llm
+    return _agent_model(name, llm.temperature)
+
+
+def client_of(llm):
+    # The FakeLLM or Router behind an agent's model, or None for other models
+    if _is_own_client(llm):
+        return llm
+    name = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+    return _agent_clients.get(name) if isinstance(name, str) else None
+
+
+def _agent_model(model, temperature):
+    try:
+        from crewai.llms.base_llm import BaseLLM
+    except ImportError:
+        # crewai before BaseLLM drives LangChain chat models
+        return _langchain_model_class()(model_name=model, temperature=temperature)
+    return _crewai_model_class(BaseLLM)(model=model, temperature=temperature)
+
+
+@functools.lru_cache(maxsize=None)
+def _crewai_model_class(base):
+    class AgentModel(base):
+        # Forwards crewai's calls to the client registered under the model name
+        def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+            return client_of(self).invoke(_prompt_text(messages)).content
+
+        def supports_function_calling(self):
+            return False
+
+    return AgentModel
+
+
+@functools.lru_cache(maxsize=None)
+def _langchain_model_class():
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+
+    class AgentChatModel(BaseChatModel):
+        model_name: str
+        temperature: float = 0.3
+
+        @property
+        def _llm_type(self):
+            return "agent-client"
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            text = client_of(self).invoke(_prompt_text(messages)).content
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    return AgentChatModel
+
+
+def count_tokens(text):
+    # Rough BPE-style estimate: about four characters per token
+    return max(1, (len(text) + 3) // 4)
+
+
+class FakeLLMError(RuntimeError):
+    pass
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+def _env_float(name, default):
+    return float(os.getenv(name, default))
+
+
+class FakeLLM:
+    def __init__(self, model="fake/model", temperature=0.3,
+                 first_token_ms=None, per_token_ms=None, jitter=None,
+                 error_rate=None, seed=None, recordings=None):
+        self.model_name = model
+        self.temperature = temperature
+        self.first_token_ms = _env_float("FAKE_LLM_FIRST_TOKEN_MS", 0) if first_token_ms is None else first_token_ms
+        self.per_token_ms = _env_float("FAKE_LLM_PER_TOKEN_MS", 0) if per_token_ms is None else per_token_ms
+        self.jitter = _env_float("FAKE_LLM_JITTER", 0) if jitter is None else jitter
+        self.error_rate = _env_float("FAKE_LLM_ERROR_RATE", 0) if error_rate is None else error_rate
+        seed = int(os.getenv("FAKE_LLM_SEED", 0)) if seed is None else seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.recordings = load_recordings(recordings or os.getenv("FAKE_LLM_RECORDINGS"))
+        self.stats = {"calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        # Same counters plus elapsed time, split by classify_prompt() stage
+        self.stage_stats = {}
+
+    # --- LangChain-style interface ---
+
+    def invoke(self, prompt):
+        started = time.perf_counter()
+        text = self._respond(prompt)
+        self._sleep(self.first_token_ms + self.per_token_ms * count_tokens(text))
+        self._record_stage(prompt, text, started)
+        return FakeMessage(text)
+
+    def stream(self, prompt):
+        started = time.perf_counter()
+        text = self._respond(prompt)
+        sent = []
+        try:
+            self._sleep(self.first_token_ms)
+            for piece in re.findall(r'\s*\S{1,4}', text):
+                self._sleep(self.per_token_ms)
+                sent.append(piece)
+                yield FakeMessage(piece)
+        finally:
+            # Only the tokens actually streamed before the caller stopped count
+            self._record_stage(prompt, "".join(sent), started)
+
+    def bind(self, **kwargs):
+        # Agent frameworks bind stop words onto the model; nothing to do here
+        return self
+
+    # --- internals ---
+
+    def _sleep(self, ms):
+        if ms <= 0:
+            return
+        with self._lock:
+            factor = 1 + self._rng.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, ms * factor) / 1000)
+
+    def _record_stage(self, prompt, text, started):
+        stage = classify_prompt(_prompt_text(prompt))
+        with self._lock:
+            entry = self.stage_stats.setdefault(
+                stage, {"calls": 0, "ms": 0.0, "prompt_tokens": 0, "completion_tokens": 0}
+            )
+            entry["calls"] += 1
+            entry["ms"] += (time.perf_counter() - started) * 1000
+            entry["prompt_tokens"] += count_tokens(_prompt_text(prompt))
+            completion_tokens = count_tokens(text) if text else 0
+            entry["completion_tokens"] += completion_tokens
+            self.stats["completion_tokens"] += completion_tokens
+
+    def _respond(self, prompt):
+        prompt = _prompt_text(prompt)
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["prompt_tokens"] += count_tokens(prompt)
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.stats["errors"] += 1
+        if failed:
+            raise FakeLLMError("Simulated provider error (429 Too Many Requests)")
+        text = self._replay(prompt)
+        if text is None:
+            text = generate_response(prompt)
+        return text
+
+    def _replay(self, prompt):
+        exact = self.recordings["prompts"].get(prompt)
+        if exact is not None:
+            return exact
+        for needle, response in self.recordings["matches"]:
+            if needle in prompt:
+                return response
+        return None
+
+
+def _prompt_text(prompt):
+    if isinstance(prompt, str):
+        return prompt
+    # List of chat messages: LangChain message objects or {"role", "content"} dicts
+    return "\n".join(
+        m.get("content", "") if isinstance(m, dict) else getattr(m, "content", str(m))
+        for m in prompt
+    )
+
+
+def load_recordings(path):
+    # JSONL lines: {"prompt": "<exact prompt>", "response": "..."} or
+    # {"match": "<substring of the prompt>", "response": "..."}
+    recordings = {"prompts": {}, "matches": []}
+    if not path or not os.path.exists(path):
+        return recordings
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "prompt" in record:
+                recordings["prompts"][record["prompt"]] = record["response"]
+            elif "match" in record:
+                recordings["matches"].append((record["match"], record["response"]))
+    return recordings
+
+
+# === Schema-valid response generation ===
+
+def _stable_choice(text, options):
+    return options[zlib.crc32(text.encode("utf-8")) % len(options)]
+
+
+def _description(prompt):
+    quoted = re.findall(r'"([^"]{20,})"', prompt, re.DOTALL)
+    return quoted[-1] if quoted else prompt
+
+
+def fake_extract(description):
+    return skill_ontology.find_skills(description) or ["Python"]
+
+
+def _literal_lists(prompt):
+    lists = []
+    for match in re.findall(r'\[[^\[\]]*\]', prompt):
+        try:
+            value = ast.literal_eval(match)
+        except (ValueError, SyntaxError):
+            try:
+                value = json.loads(match)
+            except ValueError:
+                continue
+        if isinstance(value, list) and value and all(isinstance(v, str) for v in value):
+            lists.append(value)
+    return lists
+
+
+# How runner._local_kickoff and crewai introduce the output of earlier tasks
+CONTEXT_MARKERS = re.compile(r"Context from previous tasks:|This is the context you're working with:")
+
+
+def _context_split(prompt):
+    # {'matched_skills': [...], 'missing_skills': [...]} from the context block
+    # at the end of a chained task's prompt; {} when there is none
+    parts = CONTEXT_MARKERS.split(prompt)
+    if len(parts) < 2:
+        return {}
+    for match in reversed(re.findall(r"\{[^{}]*\}", parts[-1])):
+        try:
+            value = ast.literal_eval(match)
+        except (ValueError, SyntaxError):
+            continue
+        if isinstance(value, dict) and "missing_skills" in value:
+            return value
+    return {}
+
+
+def fake_difficulty(skill, developer_skills):
+    skill_id = skill_ontology.canonical_id(skill)
+    dev_ids = {skill_ontology.canonical_id(s) for s in developer_skills}
+    if skill_id and skill_ontology.NEIGHBOURS[skill_id] & dev_ids:
+        return "Easy"
+    return _stable_choice(skill, ["Moderate", "Moderate", "Difficult"])
+
+
+def classify_prompt(prompt):
+    # Which pipeline stage a prompt belongs to, judged from its wording
+    if '"client_skills"' in prompt:
+        return "fused"
+    if "Missing skill:" in prompt:
+        return "difficulty"
+    if "integer percentage" in prompt or "confidence score" in prompt.lower():
+        return "score"
+    if "'Easy', 'Moderate', or 'Difficult'" in prompt:
+        return "difficulty_map"
+    if "matched_skills" in prompt:
+        return "compare"
+    if "list of strings" in prompt:
+        return "extract"
+    return "other"
+
+
+def generate_response(prompt):
+    kind = classify_prompt(prompt)
+    lists = _literal_lists(prompt)
+
+    if kind == "fused":
+        developer_skills = json.loads(re.search(r'Developer skills: (\[.*?\])\n', prompt).group(1))
+        client_skills = fake_extract(_description(prompt))
+        comparison = skill_ontology.compare(developer_skills, client_skills)
+        matched = comparison["matched_skills"] + comparison["similar_skills"]
+        missing = comparison["missing_skills"] + comparison["unknown_skills"]
+        return json.dumps({
+            "client_skills": client_skills,
+            "matched_skills": matched,
+            "missing_skills": missing,
+            "difficulty": {s: fake_difficulty(s, developer_skills) for s in missing},
+        })
+
+    if kind == "difficulty":
+        skill = re.search(r'Missing skill: (.+)', prompt).group(1).strip()
+        known = json.loads(re.search(r'Developer skills: (\[.*\])', prompt).group(1))
+        return fake_difficulty(skill, known)
+
+    if kind == "score":
+        return str(40 + zlib.crc32(prompt.encode("utf-8")) % 56)
+
+    if kind == "difficulty_map":
+        # The skill split comes from the previous task's output, never from
+        # the example dict in the task description
+        split = _context_split(prompt)
+        skills = split.get("missing_skills", [])
+        developer_skills = lists[0] if lists else []
+        mapping = {s: fake_difficulty(s, developer_skills) for s in skills}
+        if "'difficulty'" in prompt:
+            # Report that carries the previous task's skill split along
+            return repr({
+                "matched_skills": split.get("matched_skills", []),
+                "missing_skills": skills,
+                "difficulty": mapping,
+            })
+        return repr(mapping)
+
+    if kind == "compare" and len(lists) >= 2:
+        comparison = skill_ontology.compare(lists[0], lists[-1])
+        result = {
+            "matched_skills": comparison["matched_skills"],
+            "missing_skills": comparison["missing_skills"] + comparison["unknown_skills"],
+        }
+        if "similar_skills" in prompt:
+            result["similar_skills"] = comparison["similar_skills"]
+        else:
+            result["matched_skills"] += comparison["similar_skills"]
+        return repr(result)
+
+    if kind == "extract":
+        return repr(fake_extract(_description(prompt)))
+
+    return "OK"
@@ -0,0 +1,156 @@
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+import skill_ontology
+import tracing
+
+# === Near-duplicate brief reuse ===
+#
+# Client briefs are heavily templated, so the same request arrives in many
+# slightly different wordings that an exact-key cache never matches. Each
+# brief is fingerprinted as a MinHash signature over its word shingles, and an
+# LSH index (signature bands -> entries) finds past briefs likely to be
+# similar without comparing against all of them. A candidate is reused when
+# its estimated Jaccard similarity reaches the threshold and the brief names
+# the same ontology skills, so "...using Flask" never borrows the skills of
+# "...using Django". Any word that is a skill alias counts, even one
+# find_skills ignores as an ordinary word, so "...on GCP" and "...in go" never
+# borrow from "...on AWS" and "...in rust" either.
+
+DEFAULT_THRESHOLD = float(os.getenv("BRIEF_REUSE_THRESHOLD", 0.8))
+DEFAULT_MAX_ENTRIES = int(os.getenv("BRIEF_REUSE_MAX_ENTRIES", 10_000))
+NUM_PERM = 128
+SHINGLE_WORDS = 2
+
+# Universal hashing modulo a prime below 2**32: a * x + b stays within uint64
+_PRIME = np.uint64(4294967291)
+
+
+def shingles(text, size=SHINGLE_WORDS):
+    words = re.findall(r"\w+", text.casefold())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def lsh_bands(threshold, num_perm=NUM_PERM):
+    # Rows per band for the strictest banding whose S-curve midpoint,
+    # (1 / bands) ** (1 / rows), still sits at or below the threshold
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class MinHasher:
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        # (num_perm,) uint64 signature, or None for text without words
+        grams = shingles(text)
+        if not grams:
+            return None
+        x = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+        return ((self.a[:, None] * x[None, :] + self.b[:, None]) % _PRIME).min(axis=1)
+
+
+def skill_guard(text):
+    # Skills the brief names, plus every word that is itself a skill alias
+    words = re.findall(r"[\w+#]+(?:\.[\w+#]+)*", text.casefold())
+    aliased = {
+        skill_ontology.SKILLS[skill_ontology.ALIASES[key]][0]
+        for key in map(skill_ontology.normalize, words)
+        if key in skill_ontology.ALIASES
+    }
+    return frozenset(skill_ontology.find_skills(text)) | aliased
+
+
+def jaccard_estimate(sig_a, sig_b):
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class BriefIndex:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, max_entries=DEFAULT_MAX_ENTRIES, num_perm=NUM_PERM):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        self._entries = OrderedDict()  # id -> (signature, ontology skills, value)
+        self._buckets = {}  # (band, band bytes) -> set of ids
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "reused": 0, "indexed": 0}
+
+    def _band_keys(self, signature):
+        r = self.rows
+        return [(i, signature[i * r:(i + 1) * r].tobytes()) for i in range(self.bands)]
+
+    def lookup(self, text, stage="extract_skills"):
+        # Value stored for the most similar indexed brief, or None
+        signature = self.hasher.signature(text)
+        found = None
+        if signature is not None:
+            skills = skill_guard(text)
+            with self._lock:
+                candidates = set()
+                for key in self._band_keys(signature):
+                    candidates |= self._buckets.get(key, set())
+                best = self.threshold
+                for entry_id in candidates:
+                    other, other_skills, value = self._entries[entry_id]
+                    similarity = jaccard_estimate(signature, other)
+                    if similarity >= best and other_skills == skills:
+                        best, found = similarity, (entry_id, value, similarity)
+                if found:
+                    self._entries.move_to_end(found[0])
+        with self._lock:
+            self.stats["lookups"] += 1
+            self.stats["reused"] += found is not None
+        tracing.count_reuse(stage, found is not None, similarity=found[2] if found else None)
+        return found[1] if found else None
+
+    def add(self, text, value):
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return
+        skills = skill_guard(text)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (signature, skills, value)
+            for key in self._band_keys(signature):
+                self._buckets.setdefault(key, set()).add(entry_id)
+            self.stats["indexed"] += 1
+            while len(self._entries) > self.max_entries:
+                old_id, (old_signature, _, _) = self._entries.popitem(last=False)
+                for key in self._band_keys(old_signature):
+                    bucket = self._buckets.get(key)
+                    if bucket is not None:
+                        bucket.discard(old_id)
+                        if not bucket:
+                            del self._buckets[key]
+
+    def reuse_rate(self):
+        with self._lock:
+            return self.stats["reused"] / self.stats["lookups"] if self.stats["lookups"] else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def __len__(self):
+        return len(self._entries)
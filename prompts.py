@@ -0,0 +1,116 @@
+import json
+import threading
+
+import skill_ontology
+import tracing
+from llm_backend import count_tokens
+
+# === Prompt assembly ===
+#
+# Every stage prompt is laid out static-first: the agent's role/goal/backstory,
+# then the stage's fixed instructions, and only then the request's data. Calls
+# for the same stage therefore share a byte-identical prefix that providers can
+# cache. Skill lists are sent in one compact canonical form (deduplicated,
+# sorted, ontology ids where known) instead of a Python repr in whatever order
+# the caller had. Each stage has a token budget; render() counts every prompt
+# and trims the longest free-text field when a prompt would exceed it, but
+# never below a reserved share of the budget.
+
+TEMPLATES = {
+    "extract_skills": (
+        "Extract the technical skills, libraries, frameworks, or tools required by the "
+        "non-technical project description below. ONLY return a Python list of strings.\n"
+        "No explanations. No thoughts. No extra text.\n"
+        "Respond exactly like this: ['LangChain', 'Flask', 'Kubernetes', 'GPT-4']",
+        'Client request:\n"{description}"',
+    ),
+    "compare_skills": (
+        "Compare the developer skills with the client required skills. "
+        "Identify which client skills match and which are missing. "
+        "Return a Python dict with keys 'matched_skills' and 'missing_skills' (lists of client skills).",
+        "Developer skills: {developer_skills}\nClient required skills: {client_skills}",
+    ),
+}
+
+# Prompt token budget per stage. Agent tasks get the agent prefix on top
+# (runner.task_prompt); direct-call stages include it in their static part.
+BUDGETS = {
+    "extract_skills": 600,
+    "compare_skills": 500,
+    "map_relations": 250,
+    "fused": 900,
+}
+
+# Share of the budget a trimmed field keeps however long the rest of the prompt is
+MIN_TRIM_SHARE = 0.25
+
+stats = {}
+_stats_lock = threading.Lock()
+
+
+class PromptBudgetError(ValueError):
+    # The rest of the prompt leaves too little of the budget for a trimmed field
+    pass
+
+
+def encode_skills(skills, ids=True):
+    # Compact JSON list: deduplicated and sorted; with ids=True known skills
+    # become ontology ids ("Node.js" -> "nodejs"). Use ids=False for lists the
+    # model has to echo back, so answers keep the caller's display names.
+    if ids:
+        keys = {skill_ontology.canonical_id(s) or s.strip() for s in skills}
+    else:
+        keys = set(skill_ontology.canonicalize(skills))
+    return json.dumps(sorted(keys, key=str.lower), ensure_ascii=False, separators=(",", ":"))
+
+
+def system_prefix(agent):
+    return f"You are {agent.role}. {agent.goal}\n{agent.backstory}"
+
+
+def render(stage, trim=("description",), **values):
+    # Stage instructions followed by the formatted data block
+    instructions, data = TEMPLATES[stage]
+    return fit(stage, instructions + "\n\n", data, values, trim)
+
+
+def fit(stage, static, data_template, values, trim=("description",)):
+    # static + data_template.format(**values), cutting the longest field named
+    # in `trim` until the prompt fits the stage budget. The field keeps at
+    # least MIN_TRIM_SHARE of the budget; when the rest of the prompt (a large
+    # skill list, say) leaves less than that, raises PromptBudgetError rather
+    # than sending a prompt with the brief cut away.
+    budget = BUDGETS.get(stage)
+    text = static + data_template.format(**values)
+    tokens = count_tokens(text)
+    trimmed = False
+    if budget and tokens > budget:
+        fields = [f for f in trim if isinstance(values.get(f), str)]
+        if fields:
+            field = max(fields, key=lambda f: len(values[f]))
+            keep = len(values[field]) - (tokens - budget) * 4 - 3
+            reserve = min(len(values[field]), int(budget * MIN_TRIM_SHARE) * 4)
+            if keep < reserve:
+                account(stage, text)
+                raise PromptBudgetError(
+                    f"{stage} prompt is {tokens} tokens against a budget of {budget}; "
+                    f"the rest of it leaves too little room for '{field}'"
+                )
+            values = {**values, field: values[field][:keep].rstrip() + "..."}
+            text = static + data_template.format(**values)
+            trimmed = True
+    account(stage, text, trimmed)
+    return text
+
+
+def account(stage, text, trimmed=False):
+    tokens = count_tokens(text)
+    budget = BUDGETS.get(stage)
+    with _stats_lock:
+        entry = stats.setdefault(stage, {"prompts": 0, "tokens": 0, "over_budget": 0, "trimmed": 0})
+        entry["prompts"] += 1
+        entry["tokens"] += tokens
+        entry["over_budget"] += bool(budget and tokens > budget)
+        entry["trimmed"] += trimmed
+    tracing.annotate(prompt_budget=budget, prompt_trimmed=trimmed)
+    return tokens
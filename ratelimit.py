@@ -0,0 +1,227 @@
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import tracing
+from llm_backend import count_tokens
+
+# === Rate-limit-aware call scheduler ===
+#
+# Provider quotas (requests and tokens per minute) are the real throughput
+# ceiling, so every model call goes through a Limiter shared per model:
+#   * two token buckets, one for requests and one for tokens, refill at the
+#     quota rate; a call waits until both can cover its estimated cost
+#   * the concurrency limit moves AIMD-style: +1/limit per success while
+#     latency stays near its baseline, halved on a 429
+#   * waiters are served in priority order, so interactive requests
+#     (server.py, scripts) go ahead of batch jobs (batch.py)
+# 429s are retried with exponential backoff (or the provider's Retry-After).
+
+INTERACTIVE = 0
+BATCH = 1
+
+# Free-tier quotas: (requests per minute, tokens per minute). Override with
+# LLM_RPM / LLM_TPM; models not listed here, and the fake backend, are
+# unlimited unless overridden.
+QUOTAS = {
+    "llama3-8b-8192": (30, 30_000),
+    "llama3-70b-8192": (30, 6_000),
+    "gemini-1.5-flash": (15, 1_000_000),
+    "gemini-1.5-flash-latest": (15, 1_000_000),
+}
+
+# Completion tokens are unknown until the reply arrives; reserve this many
+# and settle the difference afterwards.
+EXPECTED_COMPLETION_TOKENS = 256
+
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 16))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 3))
+RETRY_BASE_S = float(os.getenv("LLM_RETRY_BASE_MS", 500)) / 1000
+# Latency above this multiple of the running baseline counts as congestion
+LATENCY_TOLERANCE = 2.0
+
+_priority = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(level):
+    # Calls made inside this block (and in spans submitted from it) queue at `level`
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost, now):
+        # Seconds until `cost` is available (0 if it is now)
+        self._refill(now)
+        cost = min(cost, self.capacity)
+        return 0.0 if self.level >= cost else (cost - self.level) / self.rate
+
+    def take(self, cost):
+        self.level -= min(cost, self.capacity)
+
+    def settle(self, delta):
+        # Positive delta: the call cost more than reserved. Level may go
+        # negative, which simply delays later callers.
+        self.level -= delta
+
+
+class Limiter:
+    def __init__(self, rpm=None, tpm=None, max_concurrency=MAX_CONCURRENCY):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max_concurrency
+        # Start cautiously only where a quota is known to bite
+        self.limit = float(min(4, max_concurrency) if rpm or tpm else max_concurrency)
+        self.in_flight = 0
+        self.latency_baseline = None
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+        self.stats = {"calls": 0, "throttled": 0, "rate_limited": 0, "retries": 0, "wait_s": 0.0}
+
+    def call(self, fn, prompt_tokens, measure=None, requests=1):
+        # Runs fn() within the quota and returns its result; measure(result)
+        # gives the completion tokens actually used, to settle the reservation.
+        # requests is how many model requests fn() makes (one per crew task).
+        estimate = prompt_tokens + EXPECTED_COMPLETION_TOKENS * requests
+        for attempt in range(MAX_RETRIES + 1):
+            self._acquire(estimate, requests)
+            started = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                retry_after = _rate_limited(e)
+                self._release(started, estimate, rate_limited=retry_after is not None)
+                if retry_after is None or attempt == MAX_RETRIES:
+                    raise
+                with self._cond:
+                    self.stats["retries"] += 1
+                tracing.annotate(rate_limited_retries=attempt + 1)
+                time.sleep(retry_after or RETRY_BASE_S * 2 ** attempt * random.uniform(1, 1.5))
+                continue
+            self._release(started, estimate, rate_limited=False)
+            if measure is not None and self.tokens:
+                with self._cond:
+                    self.tokens.settle(prompt_tokens + measure(result) - estimate)
+            return result
+
+    def _acquire(self, cost, requests=1):
+        entry = (_priority.get(), next(self._seq))
+        waited = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            throttled = False
+            while True:
+                delay = None
+                if self._waiters[0] == entry and self.in_flight < int(self.limit):
+                    now = time.monotonic()
+                    delay = max(
+                        self.requests.wait_time(requests, now) if self.requests else 0.0,
+                        self.tokens.wait_time(cost, now) if self.tokens else 0.0,
+                    )
+                    if delay == 0:
+                        break
+                throttled = True
+                self._cond.wait(timeout=delay)
+            heapq.heappop(self._waiters)
+            if self.requests:
+                self.requests.take(requests)
+            if self.tokens:
+                self.tokens.take(cost)
+            self.in_flight += 1
+            self.stats["calls"] += 1
+            self.stats["throttled"] += throttled
+            self.stats["wait_s"] += time.monotonic() - waited
+            # The next waiter may be able to go too
+            self._cond.notify_all()
+        if throttled:
+            tracing.annotate(rate_limit_wait_ms=round((time.monotonic() - waited) * 1000, 3))
+
+    def _release(self, started, cost, rate_limited):
+        # Latency per reserved token, so long prompts do not read as congestion
+        latency = (time.monotonic() - started) / cost
+        with self._cond:
+            self.in_flight -= 1
+            if rate_limited:
+                self.stats["rate_limited"] += 1
+                self.limit = max(1.0, self.limit / 2)
+            elif self.latency_baseline is not None and latency > self.latency_baseline * LATENCY_TOLERANCE:
+                self.limit = max(1.0, self.limit * 0.9)
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            if not rate_limited:
+                # Slow-moving average so one outlier does not reset the baseline
+                self.latency_baseline = latency if self.latency_baseline is None else (
+                    0.9 * self.latency_baseline + 0.1 * latency
+                )
+            self._cond.notify_all()
+
+
+# Exception classes the provider SDKs raise for 429s (groq, openai, litellm,
+# anthropic: RateLimitError; google-api-core: ResourceExhausted, TooManyRequests)
+RATE_LIMIT_ERRORS = ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+
+def _status(error):
+    response = getattr(error, "response", None)
+    for status in (getattr(error, "status_code", None), getattr(response, "status_code", None),
+                   getattr(error, "code", None)):
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def _rate_limited(error):
+    # Returns the Retry-After delay in seconds (0 when unknown) for 429s, else
+    # None. Frameworks wrap provider errors, so the causes are checked too.
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if _status(error) == 429 or any(cls.__name__ in RATE_LIMIT_ERRORS for cls in type(error).__mro__):
+            headers = getattr(getattr(error, "response", None), "headers", None) or {}
+            try:
+                return float(headers.get("retry-after", 0))
+            except (TypeError, ValueError):
+                return 0
+        error = error.__cause__ or error.__context__
+    return None
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(model):
+    model = str(model)
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            rpm, tpm = (None, None) if model.startswith("fake/") else QUOTAS.get(model.split("/")[-1], (None, None))
+            rpm = int(os.getenv("LLM_RPM", 0)) or rpm
+            tpm = int(os.getenv("LLM_TPM", 0)) or tpm
+            limiter = _limiters[model] = Limiter(rpm, tpm)
+        return limiter
+
+
+def call(model, prompt, fn, measure=None, requests=1):
+    # Schedule fn() (`requests` model calls for `prompt`) under model's limiter
+    return limiter_for(model).call(fn, count_tokens(prompt), measure, requests)
@@ -0,0 +1,129 @@
+import argparse
+import json
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import scoring
+from skill_registry import SkillProfile, popcount, registry
+
+# === Roster index: "who can do this brief?" ===
+#
+# An inverted index from interned skill id to the developers who have it.
+# Ranking a brief is one bincount over the posting lists of its required
+# skills, so the expensive LLM stages only ever see the top-k shortlist.
+# Profiles are kept as skill bitmasks (see skill_registry.py), not lists of strings.
+
+
+class RosterIndex:
+    def __init__(self):
+        self.profiles = []
+        # Relative cost of staffing each developer (team.py minimizes the sum)
+        self.costs = []
+        self._postings = defaultdict(list)
+        self._frozen = {}
+
+    def add(self, developer_id, skills, cost=1.0):
+        position = len(self.profiles)
+        profile = SkillProfile(developer_id, skills)
+        self.profiles.append(profile)
+        self.costs.append(float(cost))
+        for skill_id in registry.ids(profile.mask) + list(profile.extra):
+            self._postings[skill_id].append(position)
+        self._frozen.clear()
+
+    def postings(self, skill_id):
+        if skill_id not in self._frozen:
+            self._frozen[skill_id] = np.asarray(self._postings.get(skill_id, ()), dtype=np.int32)
+        return self._frozen[skill_id]
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def top_k(self, client_skills, k=10):
+        # Returns [(developer_id, match_ratio, developer_skills), ...], best first
+        # Looked up, not interned: skills nobody has interned have no postings
+        client_mask, others = registry.lookup(client_skills)
+        required = popcount(client_mask) + len(others)
+        skill_ids = registry.ids(client_mask) + [
+            skill_id for skill_id in map(registry.id_of, others) if skill_id is not None
+        ]
+        if not skill_ids or not self.profiles:
+            return []
+        lists = [self.postings(skill_id) for skill_id in skill_ids]
+        counts = np.bincount(np.concatenate(lists), minlength=len(self))
+        # Developers with none of the required skills are never candidates
+        k = min(k, int(np.count_nonzero(counts)))
+        if k == 0:
+            return []
+        best = np.argpartition(-counts, k - 1)[:k]
+        best = best[np.argsort(-counts[best], kind="stable")]
+        return [
+            (self.profiles[i].id, float(counts[i]) / required, self.profiles[i].skills)
+            for i in best
+        ]
+
+    @classmethod
+    def from_jsonl(cls, path):
+        # One developer per line: {"id": "dev-1", "developer_skills": ["Python", ...], "cost": 1.0}
+        index = cls()
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if line:
+                    record = json.loads(line)
+                    index.add(record.get("id", line_no), record["developer_skills"], record.get("cost", 1.0))
+        return index
+
+
+def rank_roster(description, index, k=10, workers=4):
+    # Extract once, shortlist locally, then run the LLM stages on the shortlist only.
+    import app
+
+    client_skills = app.extract_skills(description)
+    shortlist = index.top_k(client_skills, k)
+
+    def assess_candidate(candidate):
+        developer_id, match_ratio, skills = candidate
+        matched, missing = app.compare_skills(client_skills, skills)
+        mapping = app.map_relations(missing, skills)
+        return {
+            "id": developer_id,
+            "match_ratio": round(match_ratio, 3),
+            "matched_skills": matched,
+            "missing_skills": missing,
+            "mapping": mapping,
+        }
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(assess_candidate, shortlist))
+    # Score and rank the whole shortlist in one vectorized pass
+    order, scores = scoring.default_scorer.rank(
+        (r["matched_skills"], r["missing_skills"], r["mapping"]) for r in results
+    )
+    for result, score in zip(results, scores):
+        result["confidence_score"] = int(score)
+    return client_skills, [results[i] for i in order]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a developer roster against one client brief.")
+    parser.add_argument("roster", help="JSONL file with one developer profile per line")
+    parser.add_argument("brief", help="Non-technical client description")
+    parser.add_argument("-k", type=int, default=10, help="Shortlist size sent to the LLM stages")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the per-stage banners")
+    args = parser.parse_args(argv)
+
+    import app
+
+    app.VERBOSE = args.verbose
+    index = RosterIndex.from_jsonl(args.roster)
+    client_skills, results = rank_roster(args.brief, index, k=args.k)
+    print("✅ Required Skills:", client_skills)
+    for rank, result in enumerate(results, 1):
+        print(f"{rank}. {result['id']} — {result['confidence_score']}% (match ratio {result['match_ratio']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import copy
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import ratelimit
+import tracing
+
+# === Multi-provider router ===
+#
+# Router looks like a chat model (invoke/stream/bind), so agents and runner
+# use it unchanged, but holds several clients (Groq, Gemini, ...). It keeps
+# rolling latency and error stats per backend and sends each call to the
+# fastest healthy one for the current pipeline stage, failing over to the
+# next on errors. For stages listed in hedge_stages it hedges: if the first
+# backend has not answered within its p95 latency, the same prompt goes to
+# the next backend and the first valid answer wins.
+#
+# Set LLM_ROUTER=1 to have make_llm() return a Router; ROUTER_BACKENDS picks
+# the pool ("provider:model,..."), ROUTER_HEDGE_STAGES the hedged stages.
+
+DEFAULT_BACKENDS = "groq:groq/llama3-8b-8192,gemini:gemini-1.5-flash-latest"
+DEFAULT_HEDGE_STAGES = "extract_skills,fused"
+API_KEY_ENV = {"groq": "GROQ_API_KEY", "gemini": "GOOGLE_API_KEY"}
+
+WINDOW = 100
+# Hedge delay until a backend has this many samples for the stage
+MIN_SAMPLES = 5
+DEFAULT_HEDGE_DELAY_S = float(os.getenv("ROUTER_HEDGE_DELAY_MS", 1000)) / 1000
+# Consecutive failures that take a backend out of rotation, and for how long
+TRIP_AFTER = 3
+COOLDOWN_S = 30.0
+
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="router")
+
+
+class BackendStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.outcomes = deque(maxlen=WINDOW)
+        self.latencies = {}
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def record(self, stage, latency, ok):
+        with self._lock:
+            self.outcomes.append(ok)
+            if ok:
+                self.latencies.setdefault(stage, deque(maxlen=WINDOW)).append(latency)
+                self.consecutive_failures = 0
+            else:
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= TRIP_AFTER:
+                    self.open_until = time.monotonic() + COOLDOWN_S
+
+    def healthy(self):
+        return time.monotonic() >= self.open_until
+
+    def error_rate(self):
+        with self._lock:
+            return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def percentile(self, stage, pct):
+        # None until there are enough samples to trust
+        with self._lock:
+            samples = sorted(self.latencies.get(stage, ()))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(pct / 100 * len(samples)))]
+
+    def snapshot(self):
+        return {
+            "healthy": self.healthy(),
+            "error_rate": round(self.error_rate(), 3),
+            "p50_ms": {s: round(self.percentile(s, 50) * 1000, 1)
+                       for s in list(self.latencies) if self.percentile(s, 50) is not None},
+        }
+
+
+class Backend:
+    def __init__(self, name, llm, stats=None):
+        self.name = name
+        self.llm = llm
+        self.stats = stats or BackendStats()
+
+
+class Router:
+    def __init__(self, backends, hedge_stages=(), temperature=None):
+        # backends: list of (name, llm) pairs, in order of preference
+        self.backends = [Backend(name, llm) for name, llm in backends]
+        self.hedge_stages = set(hedge_stages)
+        self.model_name = "router:" + "+".join(b.name for b in self.backends)
+        self.temperature = temperature if temperature is not None else getattr(backends[0][1], "temperature", None)
+        self.stats = {"calls": 0, "failovers": 0, "hedges": 0, "hedge_wins": 0}
+        self._lock = threading.Lock()
+
+    # --- LangChain-style interface ---
+
+    def invoke(self, prompt, validate=None):
+        stage = _current_stage()
+        ordered = self._ordered(stage)
+        self._count("calls")
+        if stage in self.hedge_stages and len(ordered) > 1:
+            return self._hedged(prompt, stage, ordered, validate)
+        last_error = None
+        for i, backend in enumerate(ordered):
+            if i:
+                self._count("failovers")
+            try:
+                return self._call(backend, prompt, stage)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def stream(self, prompt):
+        # Fails over only while nothing has been yielded yet
+        stage = _current_stage()
+        self._count("calls")
+        last_error = None
+        for i, backend in enumerate(self._ordered(stage)):
+            if i:
+                self._count("failovers")
+            started = time.monotonic()
+            yielded = False
+            try:
+                for chunk in backend.llm.stream(prompt):
+                    if not yielded:
+                        tracing.annotate(backend=backend.name)
+                    yielded = True
+                    yield chunk
+            except GeneratorExit:
+                raise
+            except Exception as e:
+                backend.stats.record(stage, time.monotonic() - started, ok=False)
+                if yielded:
+                    raise
+                last_error = e
+                continue
+            backend.stats.record(stage, time.monotonic() - started, ok=True)
+            return
+        raise last_error
+
+    def bind(self, **kwargs):
+        # Bound copies share the original's health and latency stats
+        bound = copy.copy(self)
+        bound.backends = [Backend(b.name, b.llm.bind(**kwargs), b.stats) for b in self.backends]
+        return bound
+
+    # --- routing ---
+
+    def _ordered(self, stage):
+        # Healthy backends, fastest first (untried ones first, so each gets
+        # measured); backends with a tripped circuit go last as a fallback.
+        def score(backend):
+            p50 = backend.stats.percentile(stage, 50)
+            return (p50 or 0.0) * (1 + 4 * backend.stats.error_rate())
+        healthy = sorted((b for b in self.backends if b.stats.healthy()), key=score)
+        return healthy + [b for b in self.backends if not b.stats.healthy()]
+
+    def _call(self, backend, prompt, stage):
+        started = time.monotonic()
+        try:
+            response = ratelimit.call(backend.name, prompt, lambda: backend.llm.invoke(prompt))
+        except Exception:
+            backend.stats.record(stage, time.monotonic() - started, ok=False)
+            raise
+        backend.stats.record(stage, time.monotonic() - started, ok=True)
+        tracing.annotate(backend=backend.name)
+        return response
+
+    def _hedged(self, prompt, stage, ordered, validate):
+        remaining = list(ordered)
+        pending = {}
+        fallback = None
+        last_error = None
+
+        def launch():
+            backend = remaining.pop(0)
+            pending[tracing.submit(_executor, self._call, backend, prompt, stage)] = backend
+            return backend.stats.percentile(stage, 95) or DEFAULT_HEDGE_DELAY_S
+
+        timeout = launch()
+        while pending:
+            done, _ = wait(pending, timeout=timeout if remaining else None, return_when=FIRST_COMPLETED)
+            if not done:
+                # The leading request is slower than its p95: hedge
+                self._count("hedges")
+                tracing.annotate(hedged=True)
+                timeout = launch()
+                continue
+            for future in done:
+                backend = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                content = response.content if hasattr(response, 'content') else str(response)
+                if validate is None or validate(content):
+                    if backend is not ordered[0]:
+                        self._count("hedge_wins")
+                    # The losers' answers are discarded; they still update the stats
+                    return response
+                fallback = fallback or response
+            if not pending and remaining:
+                self._count("failovers")
+                timeout = launch()
+        if fallback is not None:
+            return fallback
+        raise last_error
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def health(self):
+        return {b.name: b.stats.snapshot() for b in self.backends}
+
+
+def _current_stage():
+    # Nearest enclosing span's stage; scheduler stages ("extract_skills", ...)
+    # take precedence over the agent role names on crew.kickoff spans.
+    s = tracing.current_span()
+    first = None
+    while s is not None:
+        stage = s.attributes.get("stage")
+        if s.name == "stage":
+            return stage
+        first = first or stage
+        s = s.parent
+    return first or ""
+
+
+def _backend(llm, model):
+    # Named like the client reports itself, so fake clients get fake quotas
+    return getattr(llm, "model_name", None) or model, llm
+
+
+def make_router(primary, temperature=0.3, hedge_stages=None):
+    # primary: (provider, model, kwargs) the app asked for; it leads the pool
+    from llm_backend import make_client
+
+    provider, model, kwargs = primary
+    backends = [_backend(make_client(provider, model, temperature, **kwargs), model)]
+    for entry in os.getenv("ROUTER_BACKENDS", DEFAULT_BACKENDS).split(","):
+        other_provider, _, other_model = entry.strip().partition(":")
+        if not other_model or other_model == model:
+            continue
+        key = os.getenv(API_KEY_ENV.get(other_provider, ""))
+        extra = {"api_key": key} if key else {}
+        backends.append(_backend(make_client(other_provider, other_model, temperature, **extra), other_model))
+    if hedge_stages is None:
+        hedge_stages = [s for s in os.getenv("ROUTER_HEDGE_STAGES", DEFAULT_HEDGE_STAGES).split(",") if s]
+    return Router(backends, hedge_stages, temperature)
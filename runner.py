@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+
+import prompts
+import ratelimit
+import tracing
+from llm_backend import client_of, count_tokens, is_local
+from llm_cache import default_cache, make_key
+from router import Router
+from singleflight import SingleFlight
+
+# === Single entry point for running a Crew ===
+#
+# Every module calls kickoff(crew) instead of crew.kickoff() so that
+# repeated runs with identical prompts are answered from the cache, and
+# identical calls already in flight are shared instead of sent twice.
+
+cache = default_cache()
+inflight = SingleFlight()
+
+# Direct calls are appended here as {"prompt", "response"} lines, which
+# FAKE_LLM_RECORDINGS can replay later
+RECORD_PATH = os.getenv("LLM_RECORD_PATH")
+_record_lock = threading.Lock()
+
+# How often each stage managed to parse the model's reply
+parse_stats = {}
+_parse_lock = threading.Lock()
+
+
+def record_parse(stage, ok):
+    with _parse_lock:
+        entry = parse_stats.setdefault(stage, {"ok": 0, "failed": 0})
+        entry["ok" if ok else "failed"] += 1
+    tracing.count_parse(stage, ok)
+
+
+def llm_signature(llm):
+    # Agent wrappers (llm_backend.agent_llm) are keyed by their client's model
+    llm = client_of(llm) or llm
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+    return str(model), getattr(llm, "temperature", None)
+
+
+def crew_key(crew):
+    parts = []
+    for task in crew.tasks:
+        agent = task.agent
+        model, temperature = llm_signature(agent.llm)
+        parts.append((
+            agent.role, agent.goal, agent.backstory,
+            task.description, task.expected_output,
+            model, temperature,
+        ))
+    return make_key("crew", parts)
+
+
+def _token_usage(usage):
+    # LangChain messages and crewai outputs report usage under different names
+    if not usage:
+        return None
+    if not isinstance(usage, dict):
+        usage = vars(usage) if hasattr(usage, "__dict__") else {}
+    prompt = usage.get("prompt_tokens", usage.get("input_tokens"))
+    completion = usage.get("completion_tokens", usage.get("output_tokens"))
+    if prompt is None and completion is None:
+        return None
+    return prompt or 0, completion or 0
+
+
+def kickoff(crew, validate=None):
+    # validate works as in invoke(): outputs it rejects are returned but not cached
+    agent = crew.tasks[-1].agent
+    with tracing.span("crew.kickoff", stage=agent.role, model=llm_signature(agent.llm)[0],
+                      tasks=len(crew.tasks)) as s:
+        key = crew_key(crew)
+        if cache is not None:
+            cached = cache.get(key)
+            s.set(cache_hit=cached is not None)
+            if cached is not None:
+                return cached
+
+        output, shared = inflight.do(key, lambda: _run_crew(crew, s))
+        s.set(coalesced=shared)
+        if cache is not None and not shared and (validate is None or validate(output)):
+            cache.set(key, output)
+        return output
+
+
+def _run_crew(crew, s):
+    if all(client_of(task.agent.llm) is not None for task in crew.tasks):
+        # crewai cannot call these clients (see llm_backend.agent_llm); token
+        # counts go on the per-task llm.invoke spans instead
+        return _local_kickoff(crew)
+    # crewai makes the calls itself, so the whole crew is scheduled at once,
+    # reserving one request per task
+    s.set(llm_calls=len(crew.tasks))
+    prompt = "\n".join(task_prompt(t) for t in crew.tasks)
+    result = ratelimit.call(llm_signature(crew.tasks[-1].agent.llm)[0], prompt, crew.kickoff,
+                            requests=len(crew.tasks))
+    output = result.output if hasattr(result, 'output') else str(result)
+    usage = _token_usage(getattr(result, 'token_usage', None) or getattr(crew, 'usage_metrics', None))
+    if usage is None:
+        usage = (sum(count_tokens(task_prompt(t)) for t in crew.tasks), count_tokens(output))
+    s.set(prompt_tokens=usage[0], completion_tokens=usage[1])
+    return output
+
+
+def invoke(llm, prompt, validate=None, stage="llm"):
+    # Direct LLM call (no agent loop), cached like kickoff(). When validate is
+    # given, outputs it rejects are returned but not cached, so a retry asks again.
+    llm = client_of(llm) or llm
+    with tracing.span("llm.invoke", stage=stage, model=llm_signature(llm)[0]) as s:
+        key = make_key("invoke", *llm_signature(llm), prompt)
+        if cache is not None:
+            cached = cache.get(key)
+            s.set(cache_hit=cached is not None)
+            if cached is not None:
+                return cached
+
+        output, shared = inflight.do(key, lambda: _invoke_llm(llm, prompt, s, validate))
+        s.set(coalesced=shared)
+        if cache is not None and not shared and (validate is None or validate(output)):
+            cache.set(key, output)
+        return output
+
+
+def _invoke_llm(llm, prompt, s, validate=None):
+    if isinstance(llm, Router):
+        # The router checks answers itself so a hedged call returns the first valid one
+        call = lambda: llm.invoke(prompt, validate=validate)
+    else:
+        call = lambda: llm.invoke(prompt)
+    response = _limited(llm, prompt, call)
+    output = response.content if hasattr(response, 'content') else str(response)
+    usage = _token_usage(getattr(response, 'usage_metadata', None)) or _token_usage(
+        (getattr(response, 'response_metadata', None) or {}).get('token_usage'))
+    if usage is None:
+        usage = (count_tokens(prompt), count_tokens(output))
+    s.set(prompt_tokens=usage[0], completion_tokens=usage[1])
+    if RECORD_PATH and not is_local(llm):
+        _record(prompt, output)
+    return output
+
+
+def _limited(llm, prompt, call):
+    # A Router schedules each backend call under that backend's limiter
+    # (Router._call); a second slot under the router's name would double the
+    # reservations and nest the retries.
+    if isinstance(llm, Router):
+        return call()
+    return ratelimit.call(llm_signature(llm)[0], prompt, call, _completion_tokens)
+
+
+def _completion_tokens(response):
+    return count_tokens(response.content if hasattr(response, 'content') else str(response))
+
+
+def _record(prompt, output):
+    line = json.dumps({"prompt": prompt, "response": output}, ensure_ascii=False)
+    with _record_lock, open(RECORD_PATH, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def task_prompt(task):
+    # Flatten an agent + task into one prompt for calls that skip the agent loop
+    # Static parts first (agent, expected output) so prompts for the same
+    # stage share a cacheable prefix; the task description carries the data.
+    return (
+        f"{prompts.system_prefix(task.agent)}\n\n"
+        f"Expected output: {task.expected_output}\n\n{task.description}"
+    )
+
+
+def _local_kickoff(crew):
+    # Sequential process for FakeLLM and Router agents: each task sees the output
+    # of its context tasks (or of the previous task), as a Crew would pass it.
+    outputs = {}
+    previous = None
+    for task in crew.tasks:
+        context = task.context if isinstance(task.context, list) else ([previous] if previous else [])
+        prompt = task_prompt(task)
+        if context:
+            prompt += "\n\nContext from previous tasks:\n" + "\n".join(outputs[id(t)] for t in context)
+        with tracing.span("llm.invoke", stage=task.agent.role) as s:
+            llm = client_of(task.agent.llm)
+            response = _limited(llm, prompt, lambda: llm.invoke(prompt))
+            s.set(prompt_tokens=count_tokens(prompt), completion_tokens=count_tokens(response.content))
+        outputs[id(task)] = response.content
+        previous = task
+    return outputs[id(previous)]
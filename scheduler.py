@@ -0,0 +1,82 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import tracing
+
+# === Stage-graph scheduler ===
+#
+# Stages declare the named values they need and the ones they produce.
+# A stage starts as soon as all of its inputs exist, so independent stages
+# run side by side. After the run, the report names the critical path: the
+# chain of dependent stages whose summed durations set the total latency.
+
+
+class Stage:
+    def __init__(self, name, fn, inputs=(), outputs=None):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        # A stage with several outputs must return a tuple in the same order
+        self.outputs = tuple(outputs) if outputs else (name,)
+
+
+def _timed(stage, args, submitted):
+    started = time.perf_counter()
+    with tracing.span("stage", stage=stage.name, queue_wait_ms=round((started - submitted) * 1000, 3)):
+        result = stage.fn(*args)
+    return result, started, time.perf_counter()
+
+
+def run_stages(stages, values, max_workers=None):
+    values = dict(values)
+    producers = {output: stage for stage in stages for output in stage.outputs}
+    pending = {stage.name: stage for stage in stages}
+    running = {}
+    timings = {}
+    path_cost = {}
+    path_prev = {}
+
+    run_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or len(stages) or 1) as executor:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(i in values for i in stage.inputs):
+                    del pending[name]
+                    args = [values[i] for i in stage.inputs]
+                    future = tracing.submit(executor, _timed, stage, args, time.perf_counter())
+                    running[future] = stage
+            if not running:
+                raise ValueError(f"Stages with unsatisfiable inputs: {sorted(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                result, started, finished = future.result()
+                if len(stage.outputs) == 1:
+                    values[stage.outputs[0]] = result
+                else:
+                    values.update(zip(stage.outputs, result))
+
+                duration = finished - started
+                timings[stage.name] = {
+                    "start_ms": round((started - run_started) * 1000, 2),
+                    "duration_ms": round(duration * 1000, 2),
+                }
+                upstream = {producers[i].name for i in stage.inputs if i in producers}
+                slowest = max(upstream, key=path_cost.get, default=None)
+                path_cost[stage.name] = duration + (path_cost[slowest] if slowest else 0)
+                path_prev[stage.name] = slowest
+
+    wall = time.perf_counter() - run_started
+    last = max(path_cost, key=path_cost.get, default=None)
+    critical_path = []
+    while last:
+        critical_path.append(last)
+        last = path_prev[last]
+    report = {
+        "wall_ms": round(wall * 1000, 2),
+        "critical_path": critical_path[::-1],
+        "critical_path_ms": round(path_cost[critical_path[0]] * 1000, 2) if critical_path else 0.0,
+        "stages": timings,
+    }
+    return values, report
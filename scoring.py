@@ -0,0 +1,65 @@
+import numpy as np
+
+# === Deterministic confidence scoring ===
+#
+# The score every variant reports: matched% + easy% - difficult%, truncated
+# to an integer and clamped to 0-100 (the formula app2.py computes). Weights
+# are configurable per Scorer. Scoring works on count arrays, so one call
+# scores and ranks a whole batch of candidates with vectorized NumPy ops
+# instead of asking the model to do arithmetic.
+
+DIFFICULTY_LEVELS = ('Easy', 'Moderate', 'Difficult')
+
+# Contribution of each skill to the score, as a share of the required skills
+DEFAULT_WEIGHTS = {"matched": 1.0, "Easy": 1.0, "Moderate": 0.0, "Difficult": -1.0}
+
+
+class Scorer:
+    def __init__(self, weights=None):
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        # Column order matches counts(): matched, Easy, Moderate, Difficult
+        self.weights = np.array([weights["matched"], *(weights[level] for level in DIFFICULTY_LEVELS)])
+
+    def score_counts(self, counts, totals):
+        # counts: (n, 4) array of matched/Easy/Moderate/Difficult counts;
+        # totals: (n,) required skills per candidate. Returns (n,) int scores.
+        counts = np.asarray(counts, dtype=np.float64).reshape(-1, 4)
+        totals = np.asarray(totals, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Multiply before dividing so whole-number weights give exact percentages
+            raw = np.where(totals > 0, counts @ self.weights * 100 / totals, 0.0)
+        return np.clip(np.trunc(raw), 0, 100).astype(np.int64)
+
+    def score_batch(self, candidates):
+        # candidates: iterable of (matched_skills, missing_skills, difficulty)
+        counts, totals = counts_matrix(candidates)
+        return self.score_counts(counts, totals)
+
+    def rank(self, candidates):
+        # Candidate indices, best score first (ties keep input order), and the scores
+        scores = self.score_batch(candidates)
+        order = np.argsort(-scores, kind="stable")
+        return order, scores
+
+    def score(self, matched_skills, missing_skills, difficulty):
+        return int(self.score_batch([(matched_skills, missing_skills, difficulty)])[0])
+
+
+def counts_matrix(candidates):
+    candidates = list(candidates)
+    counts = np.zeros((len(candidates), 4), dtype=np.int64)
+    totals = np.zeros(len(candidates), dtype=np.int64)
+    for i, (matched, missing, difficulty) in enumerate(candidates):
+        counts[i, 0] = len(matched)
+        for level in difficulty.values():
+            if level in DIFFICULTY_LEVELS:
+                counts[i, 1 + DIFFICULTY_LEVELS.index(level)] += 1
+        totals[i] = len(matched) + len(missing)
+    return counts, totals
+
+
+default_scorer = Scorer()
+
+
+def confidence(matched_skills, missing_skills, difficulty):
+    return default_scorer.score(matched_skills, missing_skills, difficulty)
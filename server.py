@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import app
+import tracing
+from incremental import IncrementalAssessor
+from llm_cache import LRUCache
+
+# === Warm assessment service ===
+#
+# Importing crewai/langchain and building the model client and agents takes
+# seconds, so a script run pays that before the first token. This server does
+# it once at startup and then answers over HTTP (TCP or a Unix socket), keeping
+# client connections alive between requests:
+#   POST /assess   {"description": "...", "developer_skills": [...], "mode": "crew" | "fused"}
+#                  With a "session" id (string or integer) the request is assessed
+#                  incrementally against that session's previous one (see
+#                  incremental.py); sessions run the crew pipeline only.
+#   GET  /healthz
+#   GET  /metrics  (Prometheus text, see tracing.py)
+# Handlers are asyncio coroutines; the blocking pipeline runs on a thread pool.
+
+MAX_BODY_BYTES = 1 << 20
+MAX_SESSIONS = 10_000
+KEEPALIVE_TIMEOUT = 75
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class AssessmentServer:
+    def __init__(self, workers=8):
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.in_flight = 0
+        self.sessions = LRUCache(max_entries=MAX_SESSIONS)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request_line, reader, writer):
+        try:
+            method, path, version = request_line.decode("latin-1").split()
+        except ValueError:
+            await self._respond(writer, 400, {"error": "Malformed request line"}, keep_alive=False)
+            return False
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        length = headers.get("content-length") or "0"
+        if not length.isdigit():
+            await self._respond(writer, 400, {"error": "Invalid Content-Length"}, keep_alive=False)
+            return False
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            await self._respond(writer, 413, {"error": "Request body too large"}, keep_alive=False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        try:
+            status, payload = 200, await self.route(method, path, body)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        await self._respond(writer, status, payload, keep_alive)
+        return keep_alive
+
+    async def route(self, method, path, body):
+        path = path.split("?", 1)[0]
+        if path == "/assess":
+            if method != "POST":
+                raise HTTPError(405, "Use POST /assess")
+            return await self.assess(body)
+        if path == "/healthz":
+            return {"status": "ok", "in_flight": self.in_flight}
+        if path == "/metrics":
+            return tracing.prometheus_text()
+        raise HTTPError(404, f"No route for {path}")
+
+    async def assess(self, body):
+        try:
+            record = json.loads(body or b"{}")
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        if not isinstance(record, dict):
+            raise HTTPError(400, 'Body must be a JSON object with a "description"')
+        description = record.get("description")
+        if not isinstance(description, str) or not description.strip():
+            raise HTTPError(400, '"description" must be a non-empty string')
+        mode = record.get("mode", "crew")
+        if mode not in ("crew", "fused"):
+            raise HTTPError(400, f"Unknown mode: {mode}")
+
+        developer_skills = record.get("developer_skills", app.developer_skills)
+        if not isinstance(developer_skills, list) or not all(isinstance(s, str) for s in developer_skills):
+            raise HTTPError(400, '"developer_skills" must be a list of strings')
+        session = record.get("session")
+        if session is not None:
+            if isinstance(session, bool) or not isinstance(session, (str, int)):
+                raise HTTPError(400, '"session" must be a string or an integer')
+            if mode != "crew":
+                # Sessions re-run only the staged pipeline's changed stages
+                raise HTTPError(400, f'"mode": "{mode}" cannot be combined with a "session"')
+            assessor = self.sessions.get(session)
+            if assessor is None:
+                assessor = IncrementalAssessor()
+                self.sessions.set(session, assessor)
+            run = lambda: assessor.assess(description, developer_skills)
+        else:
+            run = lambda: app.assess(description, developer_skills, mode=mode)
+
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self.executor, run)
+        finally:
+            self.in_flight -= 1
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8000, unix_socket=None, workers=8):
+    server = AssessmentServer(workers=workers)
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        listener = await asyncio.start_unix_server(server.handle_connection, path=unix_socket)
+        where = unix_socket
+    else:
+        listener = await asyncio.start_server(server.handle_connection, host, port)
+        where = f"http://{host}:{port}"
+    print(f"🚀 Serving assessments on {where} ({workers} workers)", file=sys.stderr)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve assessments from a warm, long-running process.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8000)
+    parser.add_argument("-u", "--unix-socket", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("-w", "--workers", type=int, default=8, help="Assessments run concurrently")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the per-stage banners")
+    args = parser.parse_args(argv)
+
+    app.VERBOSE = args.verbose
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_socket, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
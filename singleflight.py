@@ -0,0 +1,58 @@
+import threading
+
+# === Single-flight request coalescing ===
+#
+# When several threads ask for the same key at once, only the first (the
+# leader) runs the work; the rest wait for it and receive the same result,
+# or the same exception. Nothing is remembered once the call finishes; that
+# is the response cache's job. This only collapses bursts of identical work
+# that are in flight at the same moment.
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    def do(self, key, fn):
+        # Returns (result, shared); shared is True when another thread did the work
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.stats["leaders"] += 1
+                leader = True
+            else:
+                call.followers += 1
+                self.stats["coalesced"] += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
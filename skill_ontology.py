@@ -0,0 +1,251 @@
+import re
+
+# === Skill ontology ===
+#
+# Each entry: canonical id -> (display name, aliases, parents, related).
+# "parents" point from a library/framework to the language or platform it
+# builds on (LangChain -> Python); "related" are peers you can move between
+# with little effort (Flask ~ Django). Both kinds of edge count as "similar".
+
+SKILLS = {
+    # Languages
+    "python": ("Python", ["py", "python3"], [], []),
+    "javascript": ("JavaScript", ["js", "ecmascript"], [], ["typescript"]),
+    "typescript": ("TypeScript", ["ts"], ["javascript"], []),
+    "java": ("Java", [], [], ["kotlin"]),
+    "kotlin": ("Kotlin", [], [], []),
+    "go": ("Go", ["golang"], [], []),
+    "rust": ("Rust", [], [], []),
+    "cpp": ("C++", ["cplusplus", "cpp"], [], []),
+    "csharp": ("C#", ["csharp", "c sharp"], [], []),
+    "dart": ("Dart", [], [], []),
+    "sql": ("SQL", [], [], []),
+    "html": ("HTML", ["html5"], [], ["css"]),
+    "css": ("CSS", ["css3"], [], ["html"]),
+
+    # Web frameworks
+    "flask": ("Flask", [], ["python"], ["django", "fastapi"]),
+    "django": ("Django", [], ["python"], ["flask", "fastapi"]),
+    "fastapi": ("FastAPI", ["fast api"], ["python"], ["flask", "django"]),
+    "nodejs": ("Node.js", ["node", "nodejs", "node js"], ["javascript"], ["express"]),
+    "express": ("Express", ["expressjs", "express.js"], ["nodejs"], []),
+    "react": ("React", ["reactjs", "react.js"], ["javascript"], ["vue", "angular", "nextjs"]),
+    "nextjs": ("Next.js", ["next", "nextjs"], ["react"], []),
+    "vue": ("Vue", ["vuejs", "vue.js"], ["javascript"], ["react", "angular"]),
+    "angular": ("Angular", ["angularjs"], ["typescript"], ["react", "vue"]),
+    "graphql": ("GraphQL", [], [], ["rest_api"]),
+    "rest_api": ("REST API", ["rest", "restful api", "rest apis", "api development"], [], ["graphql", "fastapi"]),
+    "websockets": ("WebSockets", ["websocket"], [], ["rest_api"]),
+    "flutter": ("Flutter", [], ["dart"], ["react_native"]),
+    "react_native": ("React Native", [], ["react"], ["flutter"]),
+
+    # Data stores
+    "postgresql": ("PostgreSQL", ["postgres", "psql"], ["sql"], ["mysql"]),
+    "mysql": ("MySQL", [], ["sql"], ["postgresql"]),
+    "mongodb": ("MongoDB", ["mongo"], [], ["postgresql"]),
+    "redis": ("Redis", [], [], ["caching"]),
+    "caching": ("Caching", ["cache"], [], ["redis"]),
+    "elasticsearch": ("Elasticsearch", ["elastic search", "opensearch"], [], ["vector_database"]),
+    "vector_database": ("Vector Database", ["vector db", "vector store", "vector search"], [], ["pinecone", "faiss", "chromadb", "elasticsearch"]),
+    "pinecone": ("Pinecone", [], ["vector_database"], ["faiss", "chromadb"]),
+    "faiss": ("FAISS", [], ["vector_database"], ["pinecone", "chromadb"]),
+    "chromadb": ("ChromaDB", ["chroma"], ["vector_database"], ["pinecone", "faiss"]),
+
+    # Infrastructure
+    "docker": ("Docker", ["containers", "containerization"], [], ["kubernetes"]),
+    "kubernetes": ("Kubernetes", ["k8s", "kube"], [], ["docker"]),
+    "aws": ("AWS", ["amazon web services"], [], ["gcp", "azure"]),
+    "gcp": ("GCP", ["google cloud", "google cloud platform"], [], ["aws", "azure"]),
+    "azure": ("Azure", ["microsoft azure"], [], ["aws", "gcp"]),
+    "linux": ("Linux", [], [], []),
+    "git": ("Git", ["github", "gitlab"], [], []),
+    "ci_cd": ("CI/CD", ["cicd", "continuous integration"], [], ["docker", "git"]),
+    "load_balancing": ("Load Balancing", ["load balancer", "autoscaling", "auto scaling", "scalability"], [], ["kubernetes", "aws"]),
+
+    # Machine learning / LLMs
+    "machine_learning": ("Machine Learning", ["ml"], ["python"], ["deep_learning", "nlp"]),
+    "deep_learning": ("Deep Learning", ["dl"], ["machine_learning"], ["pytorch", "tensorflow"]),
+    "nlp": ("Natural Language Processing", ["nlp", "natural language processing"], ["machine_learning"], ["llm"]),
+    "pytorch": ("PyTorch", ["torch"], ["python", "deep_learning"], ["tensorflow"]),
+    "tensorflow": ("TensorFlow", ["tf", "keras"], ["python", "deep_learning"], ["pytorch"]),
+    "llm": ("Large Language Models", ["llm", "llms", "large language model"], ["nlp"], ["gpt4", "langchain"]),
+    "gpt4": ("GPT-4", ["gpt 4", "gpt", "chatgpt", "openai api", "openai"], ["llm"], ["gemini"]),
+    "gemini": ("Gemini", ["google gemini"], ["llm"], ["gpt4"]),
+    "langchain": ("LangChain", ["lang chain"], ["python", "llm"], ["llamaindex"]),
+    "llamaindex": ("LlamaIndex", ["llama index", "gpt index"], ["python", "llm"], ["langchain"]),
+    "huggingface": ("Hugging Face", ["hugging face transformers", "transformers"], ["python", "nlp"], ["pytorch"]),
+    "rag": ("Retrieval-Augmented Generation", ["rag", "retrieval augmented generation"], ["llm"], ["vector_database", "langchain"]),
+    "embeddings": ("Embeddings", ["text embeddings", "vector embeddings"], ["nlp"], ["vector_database"]),
+    "chatbot": ("Chatbot Development", ["chatbot", "chatbots", "conversational ai"], ["nlp"], ["langchain", "rag"]),
+}
+
+
+def normalize(skill):
+    # "Node.js", "NodeJS" and "node js" all become "nodejs"
+    return re.sub(r"[\s.\-_/]+", "", skill.strip().lower())
+
+
+def _build_alias_index():
+    index = {}
+    for skill_id, (name, aliases, _, _) in SKILLS.items():
+        for alias in [skill_id, name, *aliases]:
+            index[normalize(alias)] = skill_id
+    return index
+
+
+ALIASES = _build_alias_index()
+
+
+def canonical_id(skill):
+    return ALIASES.get(normalize(skill))
+
+
+def canonical_name(skill):
+    skill_id = canonical_id(skill)
+    return SKILLS[skill_id][0] if skill_id else skill.strip()
+
+
+def neighbours(skill_id):
+    _, _, parents, related = SKILLS[skill_id]
+    linked = set(parents) | set(related)
+    # Edges are usable in both directions: knowing LangChain helps with Python too
+    for other_id, (_, _, other_parents, other_related) in SKILLS.items():
+        if skill_id in other_parents or skill_id in other_related:
+            linked.add(other_id)
+    linked.discard(skill_id)
+    return linked
+
+
+NEIGHBOURS = {skill_id: neighbours(skill_id) for skill_id in SKILLS}
+
+
+def canonicalize(skills):
+    # Deduplicate a free-form skill list by canonical id, keeping first spelling order
+    seen = set()
+    result = []
+    for skill in skills:
+        key = canonical_id(skill) or normalize(skill)
+        if key not in seen:
+            seen.add(key)
+            result.append(canonical_name(skill))
+    return result
+
+
+# Plain-language phrases in client briefs and the skills they usually imply
+PHRASE_HINTS = {
+    "chatbot": ["LangChain", "GPT-4"],
+    "customer questions": ["Natural Language Processing"],
+    "manual": ["Retrieval-Augmented Generation", "Vector Database"],
+    "document": ["Retrieval-Augmented Generation", "Vector Database"],
+    "smart": ["Large Language Models"],
+    "fast": ["Redis"],
+    "at once": ["Kubernetes", "Load Balancing"],
+    "website": ["React", "HTML", "CSS"],
+    "web app": ["React", "FastAPI"],
+    "mobile app": ["Flutter"],
+    "dashboard": ["React", "PostgreSQL"],
+    "data": ["PostgreSQL"],
+    "database": ["PostgreSQL"],
+    "recommend": ["Machine Learning"],
+    "predict": ["Machine Learning"],
+    "image": ["Deep Learning", "PyTorch"],
+    "cloud": ["AWS"],
+}
+
+# Whole words only ("breakfast" is not "fast", "metadata" is not "data"),
+# allowing the usual English endings ("manuals", "recommendations")
+_HINT_PATTERNS = [
+    (re.compile(rf"\b{re.escape(phrase)}(?:s|es|er|est|ed|ing|ion|ions|ation|ations)?\b"), implied)
+    for phrase, implied in PHRASE_HINTS.items()
+]
+
+# Aliases that are also ordinary words or abbreviations. A single word only
+# counts as one of these skills when spelled exactly as listed ("Go", not "go
+# live"); an empty set means the word alone never counts.
+AMBIGUOUS_ALIASES = {
+    "go": {"Go"},
+    "rust": {"Rust"},
+    "dart": {"Dart"},
+    "java": {"Java"},
+    "flask": {"Flask"},
+    "react": {"React"},
+    "express": {"Express"},
+    "node": {"Node"},
+    "rest": {"REST"},
+    "gemini": {"Gemini"},
+    "chroma": {"Chroma"},
+    "transformers": {"Transformers"},
+    "gpt": {"GPT"},
+    "ml": {"ML"},
+    "ts": {"TS"},
+    "tf": {"TF"},
+    "dl": {"DL"},
+    "py": set(),
+    "next": set(),
+    "cache": set(),
+    "torch": set(),
+    "containers": set(),
+}
+
+# Longest alias in words ("amazon web services")
+_MAX_ALIAS_WORDS = 3
+
+
+def find_skills(text, hints=True):
+    # Skills named in free text (ontology names and aliases, up to three
+    # words, longest match first), plus the skills plain-language phrases
+    # usually imply.
+    skills = []
+    if hints:
+        lowered = text.lower()
+        for pattern, implied in _HINT_PATTERNS:
+            if pattern.search(lowered):
+                skills.extend(implied)
+    words = [w.rstrip(".") for w in re.findall(r"[A-Za-z0-9+#][A-Za-z0-9+#.]*", text)]
+    i = 0
+    while i < len(words):
+        for size in range(min(_MAX_ALIAS_WORDS, len(words) - i), 0, -1):
+            key = normalize("".join(words[i:i + size]))
+            skill_id = ALIASES.get(key)
+            if skill_id is None:
+                continue
+            if size == 1 and key in AMBIGUOUS_ALIASES and words[i] not in AMBIGUOUS_ALIASES[key]:
+                continue
+            skills.append(SKILLS[skill_id][0])
+            i += size - 1
+            break
+        i += 1
+    return canonicalize(skills)
+
+
+def compare(developer_skills, client_skills):
+    # skill_registry builds on this module, so import it when first needed
+    from skill_registry import registry
+
+    # Looked up, not interned: client skills are free-form request input
+    dev_mask, dev_others = registry.lookup(developer_skills)
+    matched, similar, missing, unknown = [], [], [], []
+    similar_to = {}
+    for skill in canonicalize(client_skills):
+        skill_id = registry.id_of(skill)
+        if skill_id is not None and skill_id < registry.known:
+            has = dev_mask >> skill_id & 1
+        else:
+            has = registry.key(skill) in dev_others
+        if has:
+            matched.append(skill)
+        elif canonical_id(skill) is None:
+            unknown.append(skill)
+        elif registry.similar(skill_id, dev_mask):
+            similar.append(skill)
+            similar_to[skill] = sorted(registry.decode(registry.similar(skill_id, dev_mask)))
+        else:
+            missing.append(skill)
+
+    return {
+        "matched_skills": matched,
+        "similar_skills": similar,
+        "missing_skills": missing,
+        "unknown_skills": unknown,
+        "similar_to": similar_to,
+    }
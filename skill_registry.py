@@ -0,0 +1,173 @@
+import threading
+
+import numpy as np
+
+import skill_ontology
+
+# === Interned skills and bitset skill sets ===
+#
+# Every canonical skill key (ontology id, or the normalized spelling of a
+# skill the ontology does not know) is interned once to a small integer.
+# Ontology skills come first, in SKILLS order, so their ids are the same in
+# every process. A skill set is then a plain int with one bit per ontology
+# skill: matching is `dev & client`, missing is `client & ~dev`, and coverage
+# is a popcount, instead of building string sets for every comparison. Skills
+# outside the ontology keep growing the id space, so they never get a bit;
+# they travel next to the mask as a short sorted tuple of ids ("extra").
+# Rosters store these in __slots__ records rather than lists of strings.
+# Only stored sets are interned (split); per-request sets use lookup(), so
+# free-form briefs and LLM answers do not grow the registry in a long-running
+# server.
+
+
+class SkillRegistry:
+    def __init__(self):
+        self._ids = {}
+        self.names = []
+        # Bitmask of each skill's ontology neighbours (0 for unknown skills)
+        self.neighbours = []
+        self._lock = threading.Lock()
+        for skill_id, (name, _, _, _) in skill_ontology.SKILLS.items():
+            self._add(skill_id, name)
+        # Ontology skills hold ids 0..known-1, the only ids masks carry
+        self.known = len(self.names)
+        for skill_id, linked in skill_ontology.NEIGHBOURS.items():
+            self.neighbours[self._ids[skill_id]] = self.mask_of_keys(linked)
+
+    def _add(self, key, name):
+        # Append first, then publish the id: intern() and id_of() read _ids
+        # without the lock, so an id must never point past names
+        skill_id = len(self.names)
+        self.names.append(name)
+        self.neighbours.append(0)
+        self._ids[key] = skill_id
+        return skill_id
+
+    @staticmethod
+    def key(skill):
+        return skill_ontology.canonical_id(skill) or skill_ontology.normalize(skill)
+
+    def intern(self, skill):
+        key = self.key(skill)
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self._ids.get(key)
+                if skill_id is None:
+                    skill_id = self._add(key, skill_ontology.canonical_name(skill))
+        return skill_id
+
+    def id_of(self, skill):
+        # Like intern(), but None for skills never seen
+        return self._ids.get(self.key(skill))
+
+    def mask_of_keys(self, keys):
+        mask = 0
+        for key in keys:
+            mask |= 1 << self._ids[key]
+        return mask
+
+    def split(self, skills):
+        # (mask of the ontology skills, sorted tuple of the other skills' ids)
+        mask, extra = 0, set()
+        for skill in skills:
+            skill_id = self.intern(skill)
+            if skill_id < self.known:
+                mask |= 1 << skill_id
+            else:
+                extra.add(skill_id)
+        return mask, tuple(sorted(extra))
+
+    def lookup(self, skills):
+        # Like split(), but never interns: (mask of the ontology skills, set of
+        # the other skills' keys)
+        mask, others = 0, set()
+        for skill in skills:
+            key = self.key(skill)
+            skill_id = self._ids.get(key)
+            if skill_id is not None and skill_id < self.known:
+                mask |= 1 << skill_id
+            else:
+                others.add(key)
+        return mask, others
+
+    def mask(self, skills):
+        # Ontology skills only; interns nothing
+        return self.lookup(skills)[0]
+
+    def ids(self, mask):
+        # Set bits, lowest first
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(low.bit_length() - 1)
+            mask ^= low
+        return result
+
+    def decode(self, mask, extra=()):
+        return [self.names[i] for i in self.ids(mask)] + [self.names[i] for i in extra]
+
+    def bools(self, mask, size=None):
+        # Dense NumPy view of a mask, for vectorized work over many profiles
+        out = np.zeros(size or len(self), dtype=bool)
+        out[self.ids(mask)] = True
+        return out
+
+    def similar(self, skill_id, mask):
+        # Skills in `mask` linked to skill_id in the ontology
+        return self.neighbours[skill_id] & mask
+
+    def __len__(self):
+        return len(self.names)
+
+
+def popcount(mask):
+    return mask.bit_count()
+
+
+def coverage(developer_mask, client_mask):
+    # Share of the client's skills the developer has
+    required = popcount(client_mask)
+    return popcount(developer_mask & client_mask) / required if required else 0.0
+
+
+registry = SkillRegistry()
+
+
+class SkillUniverse:
+    # Bits for work over one brief's skills (team.py), unknown ones included:
+    # ontology skills keep their ids and unknown[j] gets bit registry.known + j,
+    # so masks stay small however many skills have been interned.
+    def __init__(self, unknown=()):
+        self.unknown = tuple(unknown)
+        self._bits = {skill_id: registry.known + j for j, skill_id in enumerate(self.unknown)}
+
+    def mask(self, mask, extra=()):
+        for skill_id in extra:
+            bit = self._bits.get(skill_id)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def skill_id(self, bit):
+        return bit if bit < registry.known else self.unknown[bit - registry.known]
+
+    def decode(self, mask):
+        return [registry.names[self.skill_id(bit)] for bit in registry.ids(mask)]
+
+
+class SkillProfile:
+    # A developer or brief held in memory: its id, ontology skills as a
+    # bitmask and any other skills as a sorted tuple of ids
+    __slots__ = ("id", "mask", "extra")
+
+    def __init__(self, profile_id, skills):
+        self.id = profile_id
+        self.mask, self.extra = registry.split(skills)
+
+    @property
+    def skills(self):
+        return registry.decode(self.mask, self.extra)
+
+    def __repr__(self):
+        return f"SkillProfile({self.id!r}, {self.skills!r})"
@@ -0,0 +1,113 @@
+import re
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+import skill_ontology
+
+# === Skill similarity engine ===
+#
+# Every skill becomes a character 3-gram TF-IDF vector built from its name
+# plus a short "description" taken from the ontology (aliases and linked
+# skills), so "Flask" and "Django" land close together even though the names
+# share no letters. n-grams are hashed into a fixed number of buckets, which
+# keeps unknown skills embeddable without refitting anything. A hit means
+# "related", not "the same skill": shared letters make "ReactiveX" look like
+# React, so callers report hits as similar skills, never as matches.
+
+DIMENSIONS = 4096
+NGRAM = 3
+CONTEXT_WEIGHT = 0.5
+DEFAULT_THRESHOLD = 0.35
+DEFAULT_TOP_K = 3
+
+
+def _ngrams(text):
+    text = " " + re.sub(r"\s+", " ", text.lower().strip()) + " "
+    return [text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)]
+
+
+def _bucket(gram):
+    return zlib.crc32(gram.encode("utf-8")) % DIMENSIONS
+
+
+def _term_counts(texts):
+    counts = np.zeros(DIMENSIONS, dtype=np.float32)
+    for text in texts:
+        for gram in _ngrams(text):
+            counts[_bucket(gram)] += 1
+    return counts
+
+
+def _skill_texts(skill):
+    skill_id = skill_ontology.canonical_id(skill)
+    if skill_id is None:
+        return [skill], []
+    name, aliases, _, _ = skill_ontology.SKILLS[skill_id]
+    linked = [skill_ontology.SKILLS[i][0] for i in sorted(skill_ontology.NEIGHBOURS[skill_id])]
+    return [name, *aliases], linked
+
+
+def _fit_idf():
+    # Document frequency over the ontology, one document per skill
+    doc_freq = np.zeros(DIMENSIONS, dtype=np.float32)
+    for skill_id in skill_ontology.SKILLS:
+        names, linked = _skill_texts(skill_id)
+        doc_freq += _term_counts(names + linked) > 0
+    n_docs = len(skill_ontology.SKILLS)
+    return np.log((1 + n_docs) / (1 + doc_freq)).astype(np.float32) + 1
+
+
+IDF = _fit_idf()
+
+
+@lru_cache(maxsize=65536)
+def embed_skill(skill):
+    names, linked = _skill_texts(skill)
+    vector = _term_counts(names) * IDF
+    if linked:
+        context = _term_counts(linked) * IDF
+        vector += CONTEXT_WEIGHT * context * (np.linalg.norm(vector) / max(np.linalg.norm(context), 1e-9))
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    vector.setflags(write=False)
+    return vector
+
+
+def embed(skills):
+    if not skills:
+        return np.zeros((0, DIMENSIONS), dtype=np.float32)
+    return np.stack([embed_skill(s) for s in skills])
+
+
+def similarity_matrix(developer_skills, client_skills):
+    # Rows are client skills, columns developer skills: one matrix multiply
+    return embed(client_skills) @ embed(developer_skills).T
+
+
+def similar_skills(developer_skills, client_skills, threshold=DEFAULT_THRESHOLD, top_k=DEFAULT_TOP_K):
+    # Returns {client skill: [(developer skill, score), ...]} for every client
+    # skill with at least one developer skill above the threshold.
+    if not developer_skills or not client_skills:
+        return {}
+    scores = similarity_matrix(developer_skills, client_skills)
+    k = min(top_k, scores.shape[1])
+    # argpartition picks the top k per row without a full sort
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    result = {}
+    for row, client_skill in enumerate(client_skills):
+        hits = [
+            (developer_skills[col], round(float(score), 3))
+            for col, score in zip(top[row], top_scores[row])
+            if score >= threshold
+        ]
+        if hits:
+            result[client_skill] = hits
+    return result
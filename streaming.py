@@ -0,0 +1,116 @@
+import os
+import threading
+
+import ratelimit
+import tracing
+from llm_backend import count_tokens
+from runner import cache, inflight, llm_signature, make_key
+
+# === Streaming with early termination ===
+#
+# The list/dict stages only need the first balanced [...] or {...} in the
+# reply. LiteralScanner consumes streamed tokens and reports the literal the
+# moment its brackets balance; stream_literal() then closes the stream so the
+# model stops generating (and billing) any trailing chatter.
+
+ENABLED = bool(os.getenv("LLM_STREAMING"))
+
+PAIRS = {'[': ']', '{': '}'}
+
+stats = {"streams": 0, "early_stops": 0, "chunks": 0}
+_stats_lock = threading.Lock()
+
+
+class LiteralScanner:
+    def __init__(self, opener='['):
+        self.opener = opener
+        self._buffer = []
+        self._stack = []
+        self._quote = None
+        self._escape = False
+        self.result = None
+
+    def feed(self, chunk):
+        # Returns the complete literal text once the outermost bracket closes
+        for ch in chunk:
+            if self.result is not None:
+                break
+            if not self._stack:
+                if ch == self.opener:
+                    self._stack.append(PAIRS[ch])
+                    self._buffer.append(ch)
+                continue
+            self._buffer.append(ch)
+            if self._quote:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == self._quote:
+                    self._quote = None
+            elif ch in ('"', "'"):
+                self._quote = ch
+            elif ch in PAIRS:
+                self._stack.append(PAIRS[ch])
+            elif self._stack and ch == self._stack[-1]:
+                self._stack.pop()
+                if not self._stack:
+                    self.result = ''.join(self._buffer)
+        return self.result
+
+
+def _count(name, amount=1):
+    with _stats_lock:
+        stats[name] += amount
+
+
+def stream_literal(llm, prompt, opener='[', stage="llm"):
+    # Returns the first balanced literal in the reply, or the whole reply if
+    # the stream ends before one closes (the callers' parsers handle that).
+    with tracing.span("llm.stream", stage=stage, model=llm_signature(llm)[0]) as s:
+        key = make_key("stream", *llm_signature(llm), opener, prompt)
+        if cache is not None:
+            cached = cache.get(key)
+            s.set(cache_hit=cached is not None)
+            if cached is not None:
+                return cached
+
+        (output, complete), shared = inflight.do(key, lambda: _stream(llm, prompt, opener, s))
+        s.set(coalesced=shared)
+        if cache is not None and complete and not shared:
+            cache.set(key, output)
+        return output
+
+
+def _stream(llm, prompt, opener, s):
+    return ratelimit.call(
+        llm_signature(llm)[0], prompt,
+        lambda: _read_stream(llm, prompt, opener, s),
+        lambda result: count_tokens(result[0]),
+    )
+
+
+def _read_stream(llm, prompt, opener, s):
+    _count("streams")
+    scanner = LiteralScanner(opener)
+    received = []
+    stream = llm.stream(prompt)
+    try:
+        for chunk in stream:
+            text = chunk.content if hasattr(chunk, 'content') else str(chunk)
+            received.append(text)
+            _count("chunks")
+            if scanner.feed(text) is not None:
+                _count("early_stops")
+                break
+    finally:
+        # Closing the generator drops the HTTP stream, which cancels generation
+        close = getattr(stream, 'close', None)
+        if close:
+            close()
+    s.set(chunks=len(received), early_stop=scanner.result is not None,
+          prompt_tokens=count_tokens(prompt), completion_tokens=count_tokens(''.join(received)))
+
+    if scanner.result is None:
+        return ''.join(received), False
+    return scanner.result, True
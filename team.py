@@ -0,0 +1,232 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+import scoring
+import tracing
+from roster_index import RosterIndex
+from skill_registry import SkillUniverse, popcount, registry
+
+# === Team assembly: the cheapest set of developers covering a brief ===
+#
+# Weighted set cover over skill bitmasks. The universe is the brief's
+# required skills (minus what a lead developer already brings), numbered by a
+# SkillUniverse so skills outside the ontology get bits too; each roster
+# developer covers `profile mask & required` at their roster cost (1 by
+# default, so the cheapest team is the smallest). Only developers on the
+# posting lists of a required skill are considered, one per coverage pattern
+# (the cheapest), minus patterns another no-dearer pattern contains. Small
+# pools are solved exactly by branch and bound; large ones greedily, seeded
+# from several starting developers, with a lower bound on the optimum
+# reported alongside. Teams are scored locally: skills nobody has exactly
+# count as easy when a member knows a linked skill (ontology similarity).
+
+EXACT_MAX_CANDIDATES = 40
+# Dominance pruning is quadratic in the number of coverage patterns
+DOMINANCE_MAX_PATTERNS = 2000
+GREEDY_SEEDS = 8
+
+
+def candidate_pool(index, required, universe):
+    # [(pattern, roster position, cost)] for developers covering any required skill
+    lists = [index.postings(universe.skill_id(bit)) for bit in registry.ids(required)]
+    if not lists:
+        return []
+    cheapest = {}
+    for position in np.unique(np.concatenate(lists)).tolist():
+        profile = index.profiles[position]
+        pattern = universe.mask(profile.mask, profile.extra) & required
+        current = cheapest.get(pattern)
+        if current is None or index.costs[position] < index.costs[current]:
+            cheapest[pattern] = position
+    pool = sorted(
+        ((pattern, position, index.costs[position]) for pattern, position in cheapest.items()),
+        key=lambda c: (-popcount(c[0]), c[2]),
+    )
+    if len(pool) > DOMINANCE_MAX_PATTERNS:
+        return pool
+    kept = []
+    for pattern, position, cost in pool:
+        if not any(pattern & ~other == 0 and other_cost <= cost for other, _, other_cost in kept):
+            kept.append((pattern, position, cost))
+    return kept
+
+
+def lower_bound(pool, target):
+    # No cover is cheaper than the dearest "cheapest way to cover one skill",
+    # nor than the fewest developers the largest pattern allows at the lowest cost
+    if not target:
+        return 0.0
+    per_skill = max(
+        min(cost for pattern, _, cost in pool if pattern >> bit & 1)
+        for bit in registry.ids(target)
+    )
+    widest = max(popcount(pattern & target) for pattern, _, _ in pool)
+    by_size = math.ceil(popcount(target) / widest) * min(cost for _, _, cost in pool)
+    return max(per_skill, by_size)
+
+
+def _prune(team, target):
+    # Drop members whose skills the rest of the team already covers, dearest first
+    team = sorted(team, key=lambda c: -c[2])
+    for member in list(team):
+        rest = 0
+        for other in team:
+            if other is not member:
+                rest |= other[0]
+        if target & ~rest == 0:
+            team.remove(member)
+    return team
+
+
+def greedy(pool, target, first=None):
+    team, uncovered = [], target
+    if first is not None:
+        team.append(first)
+        uncovered &= ~first[0]
+    while uncovered:
+        best = max(pool, key=lambda c: popcount(c[0] & uncovered) / max(c[2], 1e-9))
+        if not best[0] & uncovered:
+            break
+        team.append(best)
+        uncovered &= ~best[0]
+    return _prune(team, target)
+
+
+def exact(pool, target, incumbent):
+    # Branch and bound: branch on the uncovered skill with the fewest
+    # candidates, prune on cost + the dearest uncovered skill's cheapest cover
+    by_skill = {
+        bit: sorted((c for c in pool if c[0] >> bit & 1), key=lambda c: c[2])
+        for bit in registry.ids(target)
+    }
+    cheapest = {bit: candidates[0][2] for bit, candidates in by_skill.items()}
+    best = [sum(c[2] for c in incumbent), incumbent]
+
+    def search(uncovered, team, cost):
+        if not uncovered:
+            if cost < best[0]:
+                best[0], best[1] = cost, list(team)
+            return
+        bits = registry.ids(uncovered)
+        if cost + max(cheapest[bit] for bit in bits) >= best[0]:
+            return
+        bit = min(bits, key=lambda b: len(by_skill[b]))
+        for candidate in by_skill[bit]:
+            team.append(candidate)
+            search(uncovered & ~candidate[0], team, cost + candidate[2])
+            team.pop()
+
+    search(target, [], 0.0)
+    return best[1]
+
+
+def assemble(client_skills, index, lead_skills=(), k=5):
+    # Ranked teams covering client_skills; lead_skills (if any) are already on the team
+    started = time.perf_counter()
+    with tracing.span("team.assemble", stage="team") as s:
+        required, unknown = registry.split(client_skills)
+        universe = SkillUniverse(unknown)
+        required = universe.mask(required, unknown)
+        lead = universe.mask(*registry.split(lead_skills))
+        pool = candidate_pool(index, required & ~lead, universe)
+        coverable = 0
+        for pattern, _, _ in pool:
+            coverable |= pattern
+        target = required & ~lead & coverable
+
+        teams = [greedy(pool, target)] if target else [[]]
+        ranked_seeds = sorted(pool, key=lambda c: -popcount(c[0] & target) / max(c[2], 1e-9))
+        teams += [greedy(pool, target, first=seed) for seed in ranked_seeds[:GREEDY_SEEDS]] if target else []
+        method = "greedy"
+        if target and len(pool) <= EXACT_MAX_CANDIDATES:
+            incumbent = min(teams, key=lambda t: sum(c[2] for c in t))
+            teams.append(exact(pool, target, incumbent))
+            method = "exact"
+        bound = lower_bound(pool, target)
+
+        unique = {}
+        for team in teams:
+            unique.setdefault(frozenset(c[1] for c in team), team)
+        results = [_describe(team, index, universe, required, lead) for team in unique.values()]
+        scores = scoring.default_scorer.score_batch(
+            (r["matched_skills"], r["missing_skills"], r["mapping"]) for r in results
+        )
+        for result, score in zip(results, scores):
+            result["confidence_score"] = int(score)
+            result["optimal"] = method == "exact" or result["cost"] <= bound
+        results.sort(key=lambda r: (r["cost"], r["size"], -r["confidence_score"]))
+        best_cost = results[0]["cost"] if results else 0.0
+        for result in results:
+            # The exact search proves the optimum; equal-cost alternatives are optimal too
+            result["optimal"] = result["optimal"] and result["cost"] <= best_cost
+        s.set(candidates=len(pool), method=method, teams=len(results))
+
+    return {
+        "required_skills": universe.decode(required),
+        "lead_covers": universe.decode(required & lead),
+        "uncoverable_skills": universe.decode(required & ~lead & ~coverable),
+        "method": method,
+        "candidates": len(pool),
+        "lower_bound": bound,
+        "teams": results[:k],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def _describe(team, index, universe, required, lead):
+    team_mask = lead
+    members = []
+    for pattern, position, cost in sorted(team, key=lambda c: -popcount(c[0])):
+        profile = index.profiles[position]
+        team_mask |= universe.mask(profile.mask, profile.extra)
+        members.append({"id": profile.id, "cost": cost, "covers": universe.decode(pattern & ~lead)})
+    matched = required & team_mask
+    missing = required & ~team_mask
+    # Missing ontology skills a member can pick up from a linked skill they know
+    easy = [i for i in registry.ids(missing) if i < registry.known and registry.similar(i, team_mask)]
+    return {
+        "members": members,
+        "size": len(members),
+        "cost": sum(m["cost"] for m in members),
+        "matched_skills": universe.decode(matched),
+        "missing_skills": universe.decode(missing),
+        "mapping": {registry.names[i]: "Easy" for i in easy},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find the cheapest teams from a roster that cover a brief.")
+    parser.add_argument("roster", help="JSONL file with one developer profile per line (optional \"cost\")")
+    parser.add_argument("brief", help="Non-technical client description")
+    parser.add_argument("-k", type=int, default=5, help="Number of teams to list")
+    parser.add_argument("--lead", nargs="+", help="Skills of a developer already on the team")
+    parser.add_argument("--skills", nargs="+", help="Required skills, instead of extracting them from the brief")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the per-stage banners")
+    args = parser.parse_args(argv)
+
+    index = RosterIndex.from_jsonl(args.roster)
+    client_skills = args.skills
+    if client_skills is None:
+        import app
+        app.VERBOSE = args.verbose
+        client_skills = app.extract_skills(args.brief)
+
+    result = assemble(client_skills, index, lead_skills=args.lead or (), k=args.k)
+    print("✅ Required Skills:", result["required_skills"])
+    if result["lead_covers"]:
+        print("🧑‍💻 Lead covers:", result["lead_covers"])
+    if result["uncoverable_skills"]:
+        print("⚠️ Nobody on the roster has:", result["uncoverable_skills"])
+    print(f"🔎 {result['candidates']} candidates, {result['method']} search, "
+          f"lower bound {result['lower_bound']:g} ({result['elapsed_ms']} ms)")
+    for rank, team in enumerate(result["teams"], 1):
+        names = ", ".join(f"{m['id']} ({', '.join(m['covers'])})" for m in team["members"])
+        flag = " ✓ optimal" if team["optimal"] else ""
+        print(f"{rank}. cost {team['cost']:g}, {team['confidence_score']}%{flag}: {names}")
+
+
+if __name__ == "__main__":
+    main()
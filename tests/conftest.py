@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The modules live at the repo root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep tests off the network and out of the on-disk response cache
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("LLM_CACHE_DISABLED", "1")
@@ -0,0 +1,72 @@
+import io
+import json
+
+import pytest
+
+pytest.importorskip("crewai")
+import app  # noqa: E402
+import batch  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _local_assess(monkeypatch):
+    def assess(description, developer_skills, mode="crew"):
+        if description == "boom":
+            raise ValueError("model said no")
+        return {"mode": mode, "confidence_score": len(developer_skills)}
+    monkeypatch.setattr(app, "assess", assess)
+
+
+def _run(lines, tmp_path, **kwargs):
+    path = tmp_path / "in.jsonl"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    out = io.StringIO()
+    count = batch.run_batch(batch.read_requests(path), out, workers=2, **kwargs)
+    results = {r["id"]: r for r in map(json.loads, out.getvalue().splitlines())}
+    assert count == len(results)
+    return results
+
+
+def test_every_line_gets_a_result(tmp_path):
+    results = _run([
+        json.dumps({"id": "a", "description": "A website", "developer_skills": ["Python"]}),
+        json.dumps({"description": "A mobile app", "developer_skills": ["Dart", "Flutter"], "mode": "fused"}),
+        "{not json",
+        "",
+        "[1, 2]",
+        json.dumps({"id": "b", "description": "boom", "developer_skills": []}),
+        json.dumps({"id": "c", "developer_skills": []}),
+        json.dumps({"id": "d", "description": "Last one", "developer_skills": ["Go"]}),
+    ], tmp_path)
+    assert results["a"] == {"id": "a", "mode": "crew", "confidence_score": 1}
+    assert results[2] == {"id": 2, "mode": "fused", "confidence_score": 2}
+    assert results[3]["error"].startswith("JSONDecodeError")
+    assert results[5]["error"] == "Expected a JSON object, got list"
+    assert results["b"]["error"] == "ValueError: model said no"
+    assert results["c"]["error"].startswith("KeyError")
+    assert results["d"]["confidence_score"] == 1
+
+
+def test_finished_results_are_written_when_reading_fails():
+    def records():
+        for i in range(5):
+            yield {"id": i, "description": "A website", "developer_skills": ["Python"]}
+        raise OSError("disk went away")
+
+    out = io.StringIO()
+    with pytest.raises(OSError):
+        batch.run_batch(records(), out, workers=2)
+    assert sorted(json.loads(line)["id"] for line in out.getvalue().splitlines()) == list(range(5))
+
+
+def test_cascade_reports_unusable_lines(tmp_path):
+    import cascade
+
+    path = tmp_path / "in.jsonl"
+    path.write_text("{not json\n" + json.dumps({"id": "a", "description": "A Flask and Django site"}) + "\n",
+                    encoding="utf-8")
+    output = tmp_path / "out.jsonl"
+    cascade.main([str(path), "-s", "Python", "Flask", "Django", "-o", str(output)])
+    results = {r["id"]: r for r in map(json.loads, output.read_text(encoding="utf-8").splitlines())}
+    assert results[1]["error"].startswith("JSONDecodeError")
+    assert results["a"]["decision"] == "accept"
@@ -0,0 +1,26 @@
+import bench
+
+
+def test_percentile_is_nearest_rank():
+    assert bench.percentile([5, 1, 3, 2, 4], 50) == 3
+    assert bench.percentile([5, 1, 3, 2, 4], 99) == 5
+    assert bench.percentile([], 95) == 0.0
+
+
+def test_input_problems():
+    varied = {("b1", "p1"): 1, ("b1", "p2"): 2, ("b2", "p1"): 3, ("b2", "p2"): 3}
+    assert bench.input_problems(varied) == []
+    assert bench.input_problems({key: 7 for key in varied}) == [
+        "output does not depend on the brief",
+        "output does not depend on the developer profile",
+    ]
+    profile_blind = {("b1", "p1"): 1, ("b1", "p2"): 1, ("b2", "p1"): 2, ("b2", "p2"): 2}
+    assert bench.input_problems(profile_blind) == ["output does not depend on the developer profile"]
+
+
+def test_regressions_against_a_baseline():
+    result = {"latency_ms": {"p95": 100}, "llm_calls_per_run": 3, "prompt_tokens_per_run": 300,
+              "completion_tokens_per_run": 20, "parse_failure_rate": 0.0}
+    slower = {**result, "latency_ms": {"p95": 120}}
+    assert bench.compare_to_baseline({"app": result}, {"variants": {"app": result}}) == []
+    assert bench.compare_to_baseline({"app": slower}, {"variants": {"app": result}}) == ["app: latency p95 100 → 120"]
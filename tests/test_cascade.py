@@ -0,0 +1,76 @@
+import json
+
+import cascade
+
+BRIEF = "A Flask API on AWS with a PostgreSQL database"
+THRESHOLDS = {"reject_below": 20, "accept_above": 85}
+
+
+def _full(score):
+    calls = []
+
+    def full(description, developer_skills):
+        calls.append(description)
+        return {"confidence_score": score}
+    return full, calls
+
+
+def test_local_estimate_counts_similar_skills_as_easy():
+    assert cascade.local_estimate(BRIEF, ["Python", "Flask", "PostgreSQL", "AWS"]) == (100, ["PostgreSQL", "Flask", "AWS"])
+    assert cascade.local_estimate(BRIEF, ["Rust"])[0] == 0
+    # Django is similar to Flask: nothing matched, one of three easy to learn
+    assert cascade.local_estimate(BRIEF, ["Django"])[0] == 33
+
+
+def test_short_aliases_count_as_named_skills():
+    assert cascade.local_estimate("A backend in C# with SQL on GCP", ["C#", "SQL", "GCP"]) == (100, ["C#", "SQL", "GCP"])
+
+
+def test_local_estimate_needs_enough_skills():
+    assert cascade.local_estimate("Something nice for my shop", ["Rust"]) == (None, [])
+
+
+def test_clear_cases_are_decided_locally():
+    full, calls = _full(0)
+    triage = cascade.Cascade(full=full, thresholds=THRESHOLDS)
+    assert triage.assess(BRIEF, ["Flask", "PostgreSQL", "AWS"])["decision"] == "accept"
+    assert triage.assess(BRIEF, ["Rust"])["decision"] == "reject"
+    assert calls == []
+    assert triage.stats["accepted"] == 1 and triage.stats["rejected"] == 1
+
+
+def test_ambiguous_and_unclear_briefs_escalate():
+    full, calls = _full(70)
+    triage = cascade.Cascade(full=full, thresholds=THRESHOLDS)
+    result = triage.assess(BRIEF, ["Django"])
+    assert result["tier"] == 2 and result["decision"] == "accept" and result["confidence_score"] == 70
+    assert triage.assess("Something nice for my shop", ["Rust"])["tier"] == 2
+    assert len(calls) == 2 and triage.stats["escalated"] == 2
+
+
+def test_audits_measure_agreement():
+    full, calls = _full(10)
+    triage = cascade.Cascade(full=full, thresholds=THRESHOLDS, audit_rate=1.0)
+    result = triage.assess(BRIEF, ["Flask", "PostgreSQL", "AWS"])
+    # The tier-1 decision stands; the audit only records the full score
+    assert result["decision"] == "accept" and result["audit_confidence_score"] == 10
+    triage.assess(BRIEF, ["Rust"])
+    report = triage.report()
+    assert report["audited"] == 2 and report["agreement_rate"] == 0.5
+    assert report["tier1_rate"] == 1.0
+
+
+def test_calibrate_widens_thresholds_only_where_tiers_agree():
+    pairs = [(0, 10)] * 10 + [(30, 20)] * 10 + [(60, 40), (60, 60)] * 5 + [(100, 90)] * 10 + [(None, 50)]
+    thresholds = cascade.calibrate(pairs)
+    # Only the mixed briefs scored 60 locally still go to the full pipeline
+    assert thresholds == {"reject_below": 60, "accept_above": 60}
+    # Too few pairs to trust: nothing is decided locally
+    assert cascade.calibrate([(0, 10)]) == {"reject_below": 0, "accept_above": 101}
+
+
+def test_load_thresholds_fills_in_defaults(tmp_path):
+    path = tmp_path / "thresholds.json"
+    path.write_text(json.dumps({"reject_below": 30}), encoding="utf-8")
+    assert cascade.load_thresholds(str(path)) == {"reject_below": 30, "accept_above": 85}
+    assert cascade.load_thresholds(str(tmp_path / "missing.json")) == cascade.DEFAULT_THRESHOLDS
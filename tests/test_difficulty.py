@@ -0,0 +1,71 @@
+import types
+
+import pytest
+
+import difficulty
+
+
+class _Client:
+    # A live-style client: LangChain-like invoke() returning an object with .content
+    def __init__(self, answer):
+        self.model_name = "groq/llama3-8b-8192"
+        self.temperature = 0.3
+        self.answer = answer
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return types.SimpleNamespace(content=self.answer)
+
+
+# What crewai leaves on a live agent: a model with call() and no invoke()
+_CREWAI_LLM = types.SimpleNamespace(model="groq/llama3-8b-8192", call=lambda messages: "Easy")
+_AGENT = types.SimpleNamespace(backstory="You know how developers learn.", llm=_CREWAI_LLM)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memo():
+    difficulty.memo.clear()
+    yield
+    difficulty.memo.clear()
+
+
+@pytest.mark.parametrize("output, level", [
+    ("Easy", "Easy"),
+    ("I'd say this is MODERATE for them.", "Moderate"),
+    ("difficult.", "Difficult"),
+    ("Uneasy call", None),
+    ("", None),
+])
+def test_parse_level(output, level):
+    assert difficulty.parse_level(output) == level
+
+
+def test_asks_the_callers_client_not_the_agent_model():
+    client = _Client("Moderate")
+    assert difficulty.assess_difficulty(client, _AGENT, ["Rust", "Go"], ["Python"]) == {"Rust": "Moderate", "Go": "Moderate"}
+    assert len(client.prompts) == 2
+    assert _AGENT.backstory in client.prompts[0]
+
+
+def test_answers_are_memoized_per_profile():
+    client = _Client("Easy")
+    difficulty.assess_skill(client, _AGENT, "Rust", ["Python", "Flask"])
+    difficulty.assess_skill(client, _AGENT, "rust", ["flask", "python"])
+    assert len(client.prompts) == 1
+    difficulty.assess_skill(client, _AGENT, "Rust", ["Go"])
+    assert len(client.prompts) == 2
+
+
+def test_unparseable_answers_are_left_out():
+    client = _Client("no idea")
+    assert difficulty.assess_difficulty(client, _AGENT, ["Rust"], ["Python"]) == {}
+    assert len(client.prompts) == difficulty.MAX_ATTEMPTS
+
+
+def test_similar_named_skills_reach_the_prompt_and_the_memo_key():
+    client = _Client("Easy")
+    difficulty.assess_difficulty(client, _AGENT, ["ReactiveX"], ["React"], related={"ReactiveX": ["React"]})
+    assert "similar name (may be unrelated): React" in client.prompts[0]
+    difficulty.assess_difficulty(client, _AGENT, ["ReactiveX"], ["React"])
+    assert "similar name" not in client.prompts[1]
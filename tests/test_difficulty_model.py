@@ -0,0 +1,137 @@
+import json
+import types
+
+import numpy as np
+import pytest
+
+import difficulty
+import difficulty_model
+import llm_cache
+import prompts
+import runner
+from difficulty_model import DifficultyModel, features, ontology_mask
+from skill_registry import registry
+
+
+def _judgments():
+    # Easy when a linked skill is known, Difficult otherwise
+    return [
+        (["Python"], "Flask", "Easy"),
+        (["Python"], "Django", "Easy"),
+        (["JavaScript"], "React", "Easy"),
+        (["JavaScript"], "Node.js", "Easy"),
+        (["Python"], "Kubernetes", "Difficult"),
+        (["JavaScript"], "PyTorch", "Difficult"),
+        (["Go"], "React", "Difficult"),
+        (["Go"], "Django", "Difficult"),
+    ] * 3
+
+
+def test_features_see_linked_skills_and_share_a_slot_for_unknown_ones():
+    with_python = features(ontology_mask(["Python"]), "Flask")
+    without = features(ontology_mask(["Go"]), "Flask")
+    assert with_python[1] == 1 and with_python[5] > without[5] == 0
+    outside = features(ontology_mask(["Python"]), "Basket Weaving")
+    assert outside[1] == 0 and outside[difficulty_model.DENSE + difficulty_model.N] == 1
+    assert len(with_python) == difficulty_model.FEATURES
+
+
+def test_ontology_mask_does_not_intern():
+    before = len(registry)
+    assert ontology_mask(["Python", "A Skill Nobody Lists"]) == 1 << registry.id_of("Python")
+    assert len(registry) == before
+
+
+def test_fit_learns_the_judgments():
+    X, y, _ = difficulty_model.matrix(_judgments())
+    model = DifficultyModel.fit(X, y)
+    assert model.predict(["Python"], "Flask")[0] == "Easy"
+    assert model.predict(["Python"], "Kubernetes")[0] == "Difficult"
+    result = difficulty_model.report(model, X, y, min_confidence=0.5)
+    assert result["accuracy"] == 1.0 and result["examples"] == len(y)
+
+
+def test_save_and_load(tmp_path):
+    X, y, _ = difficulty_model.matrix(_judgments())
+    model = DifficultyModel.fit(X, y, epochs=50)
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    assert np.array_equal(DifficultyModel.load(path).weights, model.weights)
+    np.savez(path, weights=model.weights, ontology=np.array(["Python"]))
+    with pytest.raises(ValueError, match="different skill ontology"):
+        DifficultyModel.load(path)
+
+
+def test_holdout_keeps_repeated_questions_together():
+    _, _, keys = difficulty_model.matrix(_judgments())
+    test = difficulty_model.holdout(keys, 0.5)
+    for key, held in zip(keys, test):
+        assert all(h == held for k, h in zip(keys, test) if k == key)
+
+
+def test_read_judgments_and_recordings(tmp_path):
+    judgments = tmp_path / "judgments.jsonl"
+    judgments.write_text("\n".join([
+        json.dumps({"developer_skills": ["Python"], "skill": "Flask", "level": "Easy"}),
+        json.dumps({"developer_skills": ["Python"], "skill": "Rust", "level": "Unsure"}),
+    ]), encoding="utf-8")
+    assert list(difficulty_model.read_judgments(judgments)) == [(["Python"], "Flask", "Easy")]
+
+    prompt = difficulty.DIFFICULTY_PROMPT.format(backstory="...") + difficulty.DIFFICULTY_INPUT.format(
+        developer_skills=prompts.encode_skills(["Python", "Django"]), skill="Ruby on Rails")
+    recordings = tmp_path / "recordings.jsonl"
+    recordings.write_text("\n".join([
+        json.dumps({"prompt": prompt, "response": "Probably moderate."}),
+        json.dumps({"prompt": "Extract the skills", "response": "Easy"}),
+    ]), encoding="utf-8")
+    ((developer_skills, skill, level),) = difficulty_model.read_recordings(recordings)
+    assert skill == "Ruby on Rails" and level == "Moderate"
+    assert ontology_mask(developer_skills) == ontology_mask(["Python", "Django"])
+
+
+class _Client:
+    def __init__(self, answer):
+        self.model_name = "groq/llama3-8b-8192"
+        self.temperature = 0.3
+        self.answer = answer
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return types.SimpleNamespace(content=self.answer)
+
+
+_AGENT = types.SimpleNamespace(backstory="You know how developers learn.")
+
+
+@pytest.fixture
+def trained(monkeypatch):
+    X, y, _ = difficulty_model.matrix(_judgments())
+    monkeypatch.setattr(difficulty_model, "_default", DifficultyModel.fit(X, y))
+    monkeypatch.setattr(difficulty_model, "MIN_CONFIDENCE", 0.6)
+    difficulty.memo.clear()
+    yield
+    difficulty.memo.clear()
+
+
+def test_confident_questions_are_answered_locally(trained):
+    client = _Client("Moderate")
+    assert difficulty.assess_skill(client, _AGENT, "Flask", ["Python"]) == "Easy"
+    assert client.prompts == []
+    # Hints about similar names always go to the LLM
+    assert difficulty.assess_skill(client, _AGENT, "Flask", ["Python"], related=["Flask-Login"]) == "Moderate"
+    assert len(client.prompts) == 1
+
+
+def test_only_fresh_answers_are_logged(tmp_path, monkeypatch):
+    log = tmp_path / "judgments.jsonl"
+    monkeypatch.setattr(difficulty, "JUDGMENT_PATH", str(log))
+    monkeypatch.setattr(difficulty_model, "_default", False)
+    monkeypatch.setattr(runner, "cache", llm_cache.ResponseCache())
+    client = _Client("Easy")
+    for _ in range(2):
+        difficulty.memo.clear()
+        assert difficulty.assess_skill(client, _AGENT, "Rust", ["Python"]) == "Easy"
+    difficulty.memo.clear()
+    assert len(client.prompts) == 1
+    assert list(difficulty_model.read_judgments(log)) == [(["Python"], "Rust", "Easy")]
@@ -0,0 +1,56 @@
+import pytest
+
+import fused
+from llm_backend import FakeLLM
+
+
+def test_parse_response():
+    parsed = fused.parse_response(
+        'Here it is: {"client_skills": ["Python", "Go"], "matched_skills": ["Python"], '
+        '"missing_skills": ["Go"], "difficulty": {"Go": "Easy", "Python": "Easy", "Rust": "Hard"}} done'
+    )
+    assert parsed == {
+        "client_skills": ["Python", "Go"],
+        "matched_skills": ["Python"],
+        "missing_skills": ["Go"],
+        "mapping": {"Go": "Easy"},
+    }
+
+
+@pytest.mark.parametrize("output", [
+    "no json here",
+    "{not json}",
+    '{"client_skills": "Python"}',
+    '{"client_skills": [], "difficulty": []}',
+])
+def test_parse_response_rejects(output):
+    with pytest.raises(fused.FusedParseError):
+        fused.parse_response(output)
+
+
+def test_parse_report():
+    output = "Final: {'matched_skills': ['Python'], 'missing_skills': ['Go'], 'difficulty': {'Go': 'Easy'}}"
+    assert fused.parse_report(output) == (["Python"], ["Go"], {"Go": "Easy"})
+    assert fused.parse_report("no dict") is None
+    assert fused.parse_report("{'matched_skills': 'Python', 'missing_skills': [], 'difficulty': {}}") is None
+
+
+def test_assess_crew_scores_the_crew_report_locally(monkeypatch):
+    report = "{'matched_skills': ['Python'], 'missing_skills': ['Go'], 'difficulty': {'Go': 'Easy'}}"
+    monkeypatch.setattr(fused, "kickoff", lambda crew, validate: report)
+    result = fused.assess_crew(None, lambda description, skills: None, "A website", ["Python"])
+    assert result == {"mode": "crew", "confidence_score": 100, "raw_output": report}
+
+
+def test_assess_crew_fused_mode():
+    llm = FakeLLM(first_token_ms=0, per_token_ms=0, jitter=0)
+    result = fused.assess_crew(llm, None, "We need a website with a dashboard", ["React", "HTML"], mode="fused")
+    assert result["mode"] == "fused"
+    assert 0 <= result["confidence_score"] <= 100
+
+
+def test_assess_crew_falls_back_when_the_prompt_does_not_fit(monkeypatch):
+    monkeypatch.setattr(fused, "kickoff", lambda crew, validate: "unparseable")
+    skills = [f"Skill number {i}" for i in range(300)]
+    result = fused.assess_crew(FakeLLM(), lambda description, skills: None, "A website " * 50, skills, mode="fused")
+    assert result == {"mode": "crew", "confidence_score": None, "raw_output": "unparseable"}
@@ -0,0 +1,92 @@
+import sys
+
+import pytest
+
+import incremental
+
+
+class _App:
+    # Stands in for app's LLM stages and records what each one was asked
+    def __init__(self, extracted, unknown_matches=()):
+        self.extracted = extracted
+        self.unknown_matches = set(unknown_matches)
+        self.calls = {"extract_skills": 0, "compare_unknown_skills": [], "map_relations": []}
+
+    def extract_skills(self, description):
+        self.calls["extract_skills"] += 1
+        return list(self.extracted)
+
+    def compare_unknown_skills(self, skills, developer_skills, fallback=True):
+        self.calls["compare_unknown_skills"].append((list(skills), list(developer_skills)))
+        matched = [s for s in skills if any((s, d) in self.unknown_matches for d in developer_skills)]
+        return matched, [s for s in skills if s not in matched]
+
+    def map_relations(self, missing_skills, developer_skills):
+        self.calls["map_relations"].append(list(missing_skills))
+        return {skill: "Moderate" for skill in missing_skills}
+
+    def log(self, *args):
+        pass
+
+
+@pytest.fixture
+def app(monkeypatch):
+    fake = _App(["Flask", "Rust"])
+    monkeypatch.setitem(sys.modules, "app", fake)
+    return fake
+
+
+BRIEF = "A booking site with a Flask backend and a Rust worker"
+
+
+def test_repeat_assessment_recomputes_nothing_but_the_score(app):
+    assessor = incremental.IncrementalAssessor()
+    first = assessor.assess(BRIEF, ["JavaScript"])
+    assert first["missing_skills"] == ["Flask", "Rust"]
+    assert first["recomputed"]["extract_skills"]
+    second = assessor.assess("  a booking site with a flask backend and a rust WORKER ", ["JavaScript"])
+    assert second["recomputed"] == {"extract_skills": False, "compare_skills": [], "map_relations": []}
+    assert second["mapping"] == first["mapping"]
+    assert app.calls["extract_skills"] == 1
+
+
+def test_edited_brief_is_extracted_again(app):
+    assessor = incremental.IncrementalAssessor()
+    assessor.assess(BRIEF, ["JavaScript"])
+    assessor.assess(BRIEF + " and email reminders", ["JavaScript"])
+    assert app.calls["extract_skills"] == 2
+
+
+def test_only_skills_whose_linked_skills_changed_are_reassessed(app):
+    assessor = incremental.IncrementalAssessor()
+    assessor.assess(BRIEF, ["JavaScript"])
+    # Django is linked to Flask, not to Rust
+    result = assessor.assess(BRIEF, ["JavaScript", "Django"])
+    assert result["recomputed"]["map_relations"] == ["Flask"]
+    # An unrelated addition changes nothing
+    result = assessor.assess(BRIEF, ["JavaScript", "Django", "Docker"])
+    assert result["recomputed"]["map_relations"] == []
+
+
+def test_skills_no_longer_missing_are_dropped(app):
+    assessor = incremental.IncrementalAssessor()
+    assessor.assess(BRIEF, ["JavaScript"])
+    result = assessor.assess(BRIEF, ["JavaScript", "Rust"])
+    assert result["matched_skills"] == ["Rust"]
+    assert result["mapping"] == {"Flask": "Moderate"}
+
+
+def test_unknown_skill_verdicts_survive_compatible_edits(monkeypatch):
+    fake = _App(["Basket Weaving"], unknown_matches={("Basket Weaving", "Wicker Work")})
+    monkeypatch.setitem(sys.modules, "app", fake)
+    assessor = incremental.IncrementalAssessor()
+    assert assessor.assess(BRIEF, ["Python", "Go"])["missing_skills"] == ["Basket Weaving"]
+    # A miss survives removing skills
+    assert assessor.assess(BRIEF, ["Python"])["recomputed"]["compare_skills"] == []
+    # After an addition, only the added skill is checked
+    result = assessor.assess(BRIEF, ["Python", "Wicker Work"])
+    assert result["recomputed"]["compare_skills"] == ["Basket Weaving"]
+    assert fake.calls["compare_unknown_skills"][-1] == (["Basket Weaving"], ["Wicker Work"])
+    assert result["matched_skills"] == ["Basket Weaving"]
+    # A match survives adding skills
+    assert assessor.assess(BRIEF, ["Python", "Wicker Work", "Go"])["recomputed"]["compare_skills"] == []
@@ -0,0 +1,37 @@
+import ingest
+
+
+def test_chunks_cut_at_breaks_and_keep_all_text():
+    text = "\n\n".join(f"Paragraph {i} " + "word " * 60 for i in range(20))
+    chunks = list(ingest.text_chunks(text, chunk_tokens=100))
+    assert len(chunks) > 1
+    assert all(len(c.encode("utf-8")) <= 400 for c in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_hard_cuts_never_split_a_character():
+    text = "é" * 1000
+    chunks = list(ingest.text_chunks(text, chunk_tokens=25))
+    assert "".join(chunks) == text
+
+
+def test_file_chunks_match_text_chunks_with_and_without_mmap(tmp_path, monkeypatch):
+    text = "\n".join(f"Requirement {i}: the service must " + "scale " * 30 for i in range(50))
+    path = tmp_path / "rfp.txt"
+    path.write_text(text, encoding="utf-8")
+    expected = list(ingest.text_chunks(text, chunk_tokens=100))
+    assert list(ingest.file_chunks(path, chunk_tokens=100)) == expected
+    monkeypatch.setattr(ingest, "MMAP_MIN_BYTES", 1)
+    assert list(ingest.file_chunks(path, chunk_tokens=100)) == expected
+
+
+def test_empty_file_has_no_chunks(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(ingest.file_chunks(path)) == []
+
+
+def test_extract_chunked_merges_in_chunk_order():
+    answers = {"a": ["Python", "Go"], "b": ["go", "Rust"], "c": None}
+    assert ingest.extract_chunked(["a", "b", "c"], answers.get) == ["Go", "Python", "Rust"]
+    assert ingest.extract_chunked(["c"], answers.get) is None
@@ -0,0 +1,60 @@
+import types
+
+import pytest
+
+import llm_backend
+import runner
+from llm_backend import FakeLLM, agent_llm, client_of, is_local
+
+
+def _fast(model="fake/groq/llama3-8b-8192"):
+    return FakeLLM(model=model, first_token_ms=0, per_token_ms=0, jitter=0)
+
+
+@pytest.fixture
+def plain_models(monkeypatch):
+    # Stand-in for the crewai/LangChain wrapper: only its name and temperature matter here
+    monkeypatch.setattr(llm_backend, "_agent_model",
+                        lambda model, temperature: types.SimpleNamespace(model_name=model, temperature=temperature))
+
+
+def test_fake_llm_answers_and_counts():
+    llm = _fast()
+    assert llm.invoke("hello").content
+    assert llm.stats["calls"] == 1
+    assert is_local(llm)
+
+
+def test_clients_with_the_same_model_name_stay_apart(plain_models):
+    first, second = _fast(), _fast()
+    first_model, second_model = agent_llm(first), agent_llm(second)
+    assert client_of(first_model) is first
+    assert client_of(second_model) is second
+    runner.invoke(first_model, "Extract skills: a website")
+    assert (first.stats["calls"], second.stats["calls"]) == (1, 0)
+
+
+def test_client_survives_a_rebuild_from_the_model_name(plain_models):
+    llm = _fast()
+    # crewai 0.86 replaces the model with LLM(model=<name>)
+    rebuilt = types.SimpleNamespace(model=agent_llm(llm).model_name)
+    assert client_of(rebuilt) is llm
+    assert is_local(rebuilt)
+
+
+def test_wrappers_share_their_client_signature(plain_models):
+    llm = _fast()
+    assert runner.llm_signature(agent_llm(llm)) == runner.llm_signature(llm) == ("fake/groq/llama3-8b-8192", 0.3)
+
+
+def test_other_models_pass_through():
+    other = types.SimpleNamespace(model_name="groq/llama3-8b-8192", temperature=0.3)
+    assert agent_llm(other) is other
+    assert client_of(other) is None
+
+
+def test_crewai_accepts_the_agent_model():
+    crewai = pytest.importorskip("crewai")
+    llm = _fast()
+    agent = crewai.Agent(role="r", goal="g", backstory="b", llm=agent_llm(llm))
+    assert client_of(agent.llm) is llm
@@ -0,0 +1,78 @@
+import types
+
+import llm_cache
+import runner
+
+
+def test_make_key_is_stable_and_order_sensitive():
+    assert llm_cache.make_key("invoke", "m", 0.3, "p") == llm_cache.make_key("invoke", "m", 0.3, "p")
+    assert llm_cache.make_key("invoke", "m", 0.3, "p") != llm_cache.make_key("invoke", "m", 0.7, "p")
+    assert llm_cache.make_key({"a": 1, "b": 2}) == llm_cache.make_key({"b": 2, "a": 1})
+
+
+def test_lru_evicts_the_least_recently_used():
+    cache = llm_cache.LRUCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+    assert len(cache) == 2
+
+
+def test_disk_cache_persists_and_expires(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite")
+    llm_cache.DiskCache(path).set("k", "v")
+    assert llm_cache.DiskCache(path).get("k") == "v"
+    cache = llm_cache.DiskCache(path, ttl=60)
+    now = llm_cache.time.time()
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now + 120)
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_disk_cache_keeps_at_most_max_entries(tmp_path):
+    cache = llm_cache.DiskCache(str(tmp_path / "cache.sqlite"), max_entries=3)
+    for i in range(5):
+        cache.set(str(i), str(i))
+    assert len(cache) == 3
+    assert cache.get("4") == "4"
+
+
+def test_response_cache_promotes_disk_hits(tmp_path):
+    disk = llm_cache.DiskCache(str(tmp_path / "cache.sqlite"))
+    disk.set("k", "v")
+    cache = llm_cache.ResponseCache(disk=disk)
+    assert cache.get("k") == "v"
+    assert cache.get("k") == "v"
+    assert cache.get("missing") is None
+    assert cache.stats == {"memory_hits": 1, "disk_hits": 1, "misses": 1}
+    assert cache.hit_rate() == 2 / 3
+
+
+def test_disabled_by_env(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_DISABLED", "1")
+    assert llm_cache.default_cache() is None
+
+
+class _Client:
+    def __init__(self, answers):
+        self.model_name = "fake/llama3-8b-8192"
+        self.temperature = 0.3
+        self.answers = iter(answers)
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return types.SimpleNamespace(content=next(self.answers))
+
+
+def test_invoke_caches_only_outputs_that_validate(monkeypatch):
+    monkeypatch.setattr(runner, "cache", llm_cache.ResponseCache())
+    client = _Client(["not a list", "['Python']", "unused"])
+    validate = lambda output: output.startswith("[")
+    assert runner.invoke(client, "extract", validate=validate) == "not a list"
+    assert runner.invoke(client, "extract", validate=validate) == "['Python']"
+    assert runner.invoke(client, "extract", validate=validate) == "['Python']"
+    assert client.calls == 2
@@ -0,0 +1,56 @@
+from near_duplicate import BriefIndex, MinHasher, jaccard_estimate, lsh_bands, shingles, skill_guard
+
+BRIEF = ("We need a website where customers can book appointments and see a dashboard "
+         "of their past visits, with reminders sent by email the day before.")
+
+
+def test_shingles():
+    assert shingles("Book an appointment") == {"book an", "an appointment"}
+    assert shingles("Hello") == {"hello"}
+    assert shingles("  ...  ") == set()
+
+
+def test_signature_is_deterministic_and_empty_text_has_none():
+    a, b = MinHasher(), MinHasher()
+    assert (a.signature(BRIEF) == b.signature(BRIEF)).all()
+    assert a.signature("!!!") is None
+
+
+def test_estimate_tracks_jaccard():
+    hasher = MinHasher(num_perm=256)
+    other = BRIEF.replace("email", "text message")
+    exact = len(shingles(BRIEF) & shingles(other)) / len(shingles(BRIEF) | shingles(other))
+    estimate = jaccard_estimate(hasher.signature(BRIEF), hasher.signature(other))
+    assert abs(estimate - exact) < 0.1
+    assert jaccard_estimate(hasher.signature(BRIEF), hasher.signature(BRIEF)) == 1.0
+    assert jaccard_estimate(hasher.signature(BRIEF), hasher.signature("Train a model on fridge photos")) < 0.2
+
+
+def test_lsh_bands_midpoint_is_below_the_threshold():
+    bands, rows = lsh_bands(0.8)
+    assert bands * rows == 128
+    assert (1 / bands) ** (1 / rows) <= 0.8
+
+
+def test_skill_guard_sees_named_skills():
+    assert skill_guard("A website in React") != skill_guard("A website in Vue")
+    assert "Go" in skill_guard("Backend in Go")
+    # Short or ambiguous skill words count too
+    assert skill_guard("Host it on GCP") != skill_guard("Host it on AWS")
+    assert skill_guard("A service in go") != skill_guard("A service in rust")
+
+
+def test_index_reuses_near_duplicates_only():
+    index = BriefIndex(threshold=0.7)
+    index.add(BRIEF, ["React"])
+    assert index.lookup(BRIEF.replace("the day before", "a day before")) == ["React"]
+    # Same wording, different skill: never reused
+    assert index.lookup(BRIEF.replace("website", "Vue website")) is None
+    assert index.lookup("Build a mobile app that recommends recipes.") is None
+
+
+def test_index_evicts_the_oldest_entries():
+    index = BriefIndex(max_entries=1)
+    index.add(BRIEF, 1)
+    index.add("Build a mobile app that recommends recipes from the fridge.", 2)
+    assert index.lookup(BRIEF) is None
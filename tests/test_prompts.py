@@ -0,0 +1,43 @@
+import pytest
+
+import prompts
+
+BRIEF = "We want a chatbot that answers customer questions from our product manuals. " * 40
+
+
+def test_encode_skills_is_compact_and_canonical():
+    assert prompts.encode_skills(["React", "node.js", "Python", "python"]) == '["nodejs","python","react"]'
+    assert prompts.encode_skills(["react", "Node.js"], ids=False) == '["Node.js","React"]'
+
+
+def test_short_prompts_are_left_alone():
+    text = prompts.render("extract_skills", description="A website with a booking form")
+    assert text.endswith('"A website with a booking form"')
+
+
+def test_long_brief_is_trimmed_to_the_budget():
+    text = prompts.render("extract_skills", description=BRIEF)
+    assert prompts.count_tokens(text) <= prompts.BUDGETS["extract_skills"]
+    assert '..."' in text
+
+
+def test_brief_keeps_its_reserve_next_to_a_large_profile():
+    skills = [f"Skill number {i}" for i in range(40)]
+    text = prompts.fit("fused", "Static part.\n", "{developer_skills}\n{description}",
+                       {"developer_skills": prompts.encode_skills(skills), "description": BRIEF})
+    brief = text.rsplit("\n", 1)[1]
+    assert len(brief) >= prompts.BUDGETS["fused"] * prompts.MIN_TRIM_SHARE * 4
+
+
+def test_profile_that_crowds_out_the_brief_fails_loudly():
+    skills = [f"Skill number {i}" for i in range(200)]
+    with pytest.raises(prompts.PromptBudgetError):
+        prompts.fit("fused", "Static part.\n", "{developer_skills}\n{description}",
+                    {"developer_skills": prompts.encode_skills(skills), "description": BRIEF})
+
+
+def test_short_brief_is_never_cut():
+    skills = [f"Skill number {i}" for i in range(200)]
+    with pytest.raises(prompts.PromptBudgetError):
+        prompts.fit("fused", "", "{developer_skills}\n{description}",
+                    {"developer_skills": prompts.encode_skills(skills), "description": "A small website"})
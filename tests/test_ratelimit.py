@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+
+import ratelimit
+
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class RateLimitError(Exception):
+    pass
+
+
+def _rate_limit_error():
+    error = Exception("429")
+    error.response = _Response(429)
+    return error
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(ratelimit, "RETRY_BASE_S", 0)
+
+
+def test_rate_limited_reads_status_name_and_causes():
+    error = Exception()
+    error.response = _Response(429, {"retry-after": "2"})
+    assert ratelimit._rate_limited(error) == 2.0
+    assert ratelimit._rate_limited(RateLimitError()) == 0
+    try:
+        try:
+            raise RateLimitError()
+        except RateLimitError as e:
+            raise RuntimeError("agent failed") from e
+    except RuntimeError as wrapped:
+        assert ratelimit._rate_limited(wrapped) == 0
+    assert ratelimit._rate_limited(ValueError("bad input")) is None
+
+
+def test_limit_halves_on_429_and_the_call_is_retried():
+    limiter = ratelimit.Limiter(rpm=1000, tpm=1_000_000, max_concurrency=8)
+    assert limiter.limit == 4
+    answers = iter([_rate_limit_error(), "ok"])
+
+    def fn():
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    assert limiter.call(fn, prompt_tokens=10) == "ok"
+    assert limiter.stats["rate_limited"] == 1 and limiter.stats["retries"] == 1
+    # Halved to 2, then one additive step for the successful retry
+    assert limiter.limit == 2.5
+
+
+def test_limit_grows_additively_up_to_the_maximum():
+    limiter = ratelimit.Limiter(rpm=1000, max_concurrency=5)
+    for _ in range(50):
+        limiter.call(lambda: "ok", prompt_tokens=10)
+    assert limiter.limit == 5
+    assert limiter.in_flight == 0
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(ratelimit, "MAX_RETRIES", 2)
+    limiter = ratelimit.Limiter(max_concurrency=16)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise _rate_limit_error()
+
+    with pytest.raises(Exception, match="429"):
+        limiter.call(fn, prompt_tokens=10)
+    assert len(calls) == 3
+    # No quota: starts at MAX_CONCURRENCY (16) and halves once per 429
+    assert limiter.limit == 2
+
+
+def test_other_errors_are_not_retried():
+    limiter = ratelimit.Limiter()
+    with pytest.raises(ValueError):
+        limiter.call(lambda: (_ for _ in ()).throw(ValueError("bad")), prompt_tokens=10)
+    assert limiter.stats["retries"] == 0
+
+
+def test_crew_calls_reserve_one_request_per_task():
+    limiter = ratelimit.Limiter(rpm=60)
+    limiter.call(lambda: "ok", prompt_tokens=10, requests=5)
+    assert limiter.requests.level == pytest.approx(55, abs=0.1)
+
+
+def test_completion_tokens_are_settled_against_the_reservation():
+    limiter = ratelimit.Limiter(tpm=10_000)
+    limiter.call(lambda: "ok", prompt_tokens=100, measure=lambda result: 20)
+    # Reserved 100 + EXPECTED_COMPLETION_TOKENS, used 120
+    assert limiter.tokens.level == pytest.approx(10_000 - 120, abs=1)
+
+
+def test_interactive_calls_go_ahead_of_batch_calls():
+    limiter = ratelimit.Limiter(max_concurrency=1)
+    release = threading.Event()
+    order = []
+
+    def queued(level, name):
+        with ratelimit.priority(level):
+            limiter.call(lambda: order.append(name), prompt_tokens=10)
+
+    holder = threading.Thread(target=limiter.call, args=(release.wait, 10))
+    holder.start()
+    while limiter.in_flight == 0:
+        time.sleep(0.001)
+    threads = [threading.Thread(target=queued, args=(ratelimit.BATCH, "batch"))]
+    threads[0].start()
+    while len(limiter._waiters) < 1:
+        time.sleep(0.001)
+    threads.append(threading.Thread(target=queued, args=(ratelimit.INTERACTIVE, "interactive")))
+    threads[1].start()
+    while len(limiter._waiters) < 2:
+        time.sleep(0.001)
+    release.set()
+    for thread in [holder, *threads]:
+        thread.join(timeout=5)
+    assert order == ["interactive", "batch"]
+
+
+def test_limiter_for_uses_known_quotas(monkeypatch):
+    monkeypatch.delenv("LLM_RPM", raising=False)
+    monkeypatch.delenv("LLM_TPM", raising=False)
+    monkeypatch.setattr(ratelimit, "_limiters", {})
+    groq = ratelimit.limiter_for("groq/llama3-8b-8192")
+    assert groq.requests.capacity == 30 and groq.tokens.capacity == 30_000
+    assert ratelimit.limiter_for("groq/llama3-8b-8192") is groq
+    fake = ratelimit.limiter_for("fake/llama3-8b-8192")
+    assert fake.requests is None and fake.tokens is None
@@ -0,0 +1,44 @@
+import json
+
+from roster_index import RosterIndex
+from skill_registry import registry
+
+
+def test_top_k_ranks_by_match_ratio_and_skips_non_matches():
+    index = RosterIndex()
+    index.add("a", ["Python"])
+    index.add("b", ["Python", "React", "Rare Skill"])
+    index.add("c", ["Rust"])
+    ranked = index.top_k(["Python", "React", "Rare Skill"], k=5)
+    assert [(developer_id, round(ratio, 2)) for developer_id, ratio, _ in ranked] == [("b", 1.0), ("a", 0.33)]
+    assert index.top_k(["Haskell"]) == []
+    assert RosterIndex().top_k(["Python"]) == []
+
+
+def test_top_k_truncates_and_counts_skills_nobody_has():
+    index = RosterIndex()
+    for i in range(5):
+        index.add(f"dev-{i}", ["Python", "React"][: 1 + i % 2])
+    ranked = index.top_k(["Python", "React", "Some Skill Nobody Has"], k=2)
+    assert [developer_id for developer_id, _, _ in ranked] == ["dev-1", "dev-3"]
+    assert ranked[0][1] == 2 / 3
+
+
+def test_top_k_does_not_grow_the_registry():
+    index = RosterIndex()
+    index.add("a", ["Python"])
+    before = len(registry)
+    index.top_k(["Python", "A Skill Only This Brief Asks For"])
+    assert len(registry) == before
+
+
+def test_from_jsonl(tmp_path):
+    path = tmp_path / "roster.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"id": "alice", "developer_skills": ["Python"], "cost": 2.0}),
+        "",
+        json.dumps({"developer_skills": ["React"]}),
+    ]), encoding="utf-8")
+    index = RosterIndex.from_jsonl(path)
+    assert [p.id for p in index.profiles] == ["alice", 3]
+    assert index.costs == [2.0, 1.0]
@@ -0,0 +1,81 @@
+import itertools
+import threading
+import time
+import types
+
+import pytest
+
+import ratelimit
+import runner
+import tracing
+from router import Router
+
+_names = itertools.count()
+
+
+class _Client:
+    def __init__(self, answer="['Python']", delay=0.0, fail=False):
+        self.answer, self.delay, self.fail = answer, delay, fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return types.SimpleNamespace(content=self.answer)
+
+
+def _router(*clients, hedge_stages=()):
+    # Fresh names so each test gets its own limiters
+    return Router([(f"test-backend-{next(_names)}", c) for c in clients], hedge_stages)
+
+
+def test_fails_over_to_the_next_backend():
+    down, up = _Client(fail=True), _Client()
+    router = _router(down, up)
+    assert router.invoke("prompt").content == "['Python']"
+    assert (down.calls, up.calls, router.stats["failovers"]) == (1, 1, 1)
+
+
+def test_raises_when_every_backend_fails():
+    router = _router(_Client(fail=True), _Client(fail=True))
+    with pytest.raises(RuntimeError):
+        router.invoke("prompt")
+
+
+def test_repeated_failures_take_a_backend_out_of_rotation():
+    down, up = _Client(fail=True), _Client()
+    router = _router(down, up)
+    for _ in range(3):
+        router.invoke("prompt")
+    assert not router.backends[0].stats.healthy()
+    router.invoke("prompt")
+    assert down.calls == 3 and up.calls == 4
+
+
+def test_hedges_a_slow_backend_and_takes_the_first_valid_answer(monkeypatch):
+    monkeypatch.setattr("router.DEFAULT_HEDGE_DELAY_S", 0.05)
+    slow, fast = _Client("['Slow']", delay=0.5), _Client("['Fast']")
+    router = _router(slow, fast, hedge_stages={"extract_skills"})
+    with tracing.span("stage", stage="extract_skills"):
+        response = router.invoke("prompt")
+    assert response.content == "['Fast']"
+    assert router.stats["hedges"] == 1 and router.stats["hedge_wins"] == 1
+
+
+def test_invalid_hedged_answers_lose_to_valid_ones(monkeypatch):
+    monkeypatch.setattr("router.DEFAULT_HEDGE_DELAY_S", 0.05)
+    router = _router(_Client("garbage", delay=0.1), _Client("['Go']", delay=0.2), hedge_stages={"fused"})
+    with tracing.span("stage", stage="fused"):
+        assert router.invoke("prompt", validate=lambda out: out.startswith("[")).content == "['Go']"
+
+
+def test_router_calls_take_one_limiter_slot():
+    router = _router(_Client())
+    runner.invoke(router, "Extract skills: a website with a booking form")
+    backend = router.backends[0].name
+    assert ratelimit.limiter_for(backend).stats["calls"] == 1
+    assert ratelimit.limiter_for(router.model_name).stats["calls"] == 0
@@ -0,0 +1,51 @@
+import threading
+import time
+
+import pytest
+
+from scheduler import Stage, run_stages
+
+
+def test_independent_stages_run_side_by_side():
+    # Each stage waits for the other, so this only finishes if they overlap
+    barrier = threading.Barrier(2, timeout=5)
+    stages = [
+        Stage("left", lambda x: (barrier.wait(), x + 1)[1], inputs=["x"]),
+        Stage("right", lambda x: (barrier.wait(), x * 2)[1], inputs=["x"]),
+        Stage("total", lambda a, b: a + b, inputs=["left", "right"]),
+    ]
+    values, _ = run_stages(stages, {"x": 3})
+    assert values["total"] == 10
+
+
+def test_multiple_outputs_and_inputs_are_passed_by_name():
+    stages = [
+        Stage("split", lambda s: (s[:2], s[2:]), inputs=["text"], outputs=["head", "tail"]),
+        Stage("joined", lambda tail, head: tail + head, inputs=["tail", "head"]),
+    ]
+    values, _ = run_stages(stages, {"text": "abcd"})
+    assert values["head"] == "ab" and values["joined"] == "cdab"
+
+
+def test_report_names_the_critical_path():
+    stages = [
+        Stage("fast", lambda: time.sleep(0.001) or 1),
+        Stage("slow", lambda: time.sleep(0.05) or 2),
+        Stage("after_fast", lambda a: a, inputs=["fast"]),
+        Stage("join", lambda a, b: a + b, inputs=["after_fast", "slow"]),
+    ]
+    values, report = run_stages(stages, {})
+    assert values["join"] == 3
+    assert report["critical_path"] == ["slow", "join"]
+    assert report["critical_path_ms"] >= 50
+    assert set(report["stages"]) == {"fast", "slow", "after_fast", "join"}
+
+
+def test_unsatisfiable_inputs_raise():
+    with pytest.raises(ValueError, match="missing"):
+        run_stages([Stage("missing", lambda x: x, inputs=["never_produced"])], {})
+
+
+def test_stage_errors_propagate():
+    with pytest.raises(ZeroDivisionError):
+        run_stages([Stage("boom", lambda: 1 / 0)], {})
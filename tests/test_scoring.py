@@ -0,0 +1,57 @@
+import numpy as np
+
+import scoring
+
+
+def test_matched_plus_easy_minus_difficult():
+    # 2 of 4 matched, one Easy, one Difficult: 50 + 25 - 25
+    assert scoring.confidence(["Python", "React"], ["Go", "Rust"], {"Go": "Easy", "Rust": "Difficult"}) == 50
+
+
+def test_moderate_counts_for_nothing():
+    assert scoring.confidence(["Python"], ["Go"], {"Go": "Moderate"}) == 50
+
+
+def test_truncates_and_clamps():
+    assert scoring.confidence(["Python"], ["Go", "Rust"], {}) == 33
+    assert scoring.confidence([], ["Go", "Rust"], {"Go": "Difficult", "Rust": "Difficult"}) == 0
+    assert scoring.confidence(["Python"], ["Go"], {"Go": "Easy"}) == 100
+
+
+def test_no_required_skills_scores_zero():
+    assert scoring.confidence([], [], {}) == 0
+
+
+def test_unknown_levels_are_ignored():
+    assert scoring.confidence(["Python"], ["Go"], {"Go": "Trivial"}) == 50
+
+
+def test_whole_number_weights_give_exact_percentages():
+    # 7/10 computed as 0.7 * 100 would truncate to 69
+    matched = [f"s{i}" for i in range(7)]
+    missing = [f"m{i}" for i in range(3)]
+    assert scoring.confidence(matched, missing, {}) == 70
+
+
+def test_custom_weights():
+    scorer = scoring.Scorer({"Moderate": 0.5})
+    assert scorer.score(["Python"], ["Go", "Rust"], {"Go": "Moderate", "Rust": "Moderate"}) == 66
+
+
+def test_batch_matches_single_scores_and_ranks_stably():
+    candidates = [
+        (["Python"], ["Go"], {}),
+        (["Python", "Go"], [], {}),
+        (["Python"], ["Go"], {"Go": "Easy"}),
+        ([], ["Go"], {}),
+    ]
+    scores = scoring.default_scorer.score_batch(candidates)
+    assert scores.tolist() == [scoring.confidence(*c) for c in candidates] == [50, 100, 100, 0]
+    order, _ = scoring.default_scorer.rank(candidates)
+    assert order.tolist() == [1, 2, 0, 3]
+
+
+def test_counts_matrix():
+    counts, totals = scoring.counts_matrix([(["a"], ["b", "c"], {"b": "Easy", "c": "Difficult"})])
+    assert counts.tolist() == [[1, 1, 0, 1]]
+    assert np.array_equal(totals, [3])
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("crewai")
+import app  # noqa: E402
+import server  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _local_assess(monkeypatch):
+    monkeypatch.setattr(app, "assess", lambda description, skills, mode="crew": {"mode": mode, "skills": skills})
+
+
+def _assess(body):
+    return asyncio.run(server.AssessmentServer(workers=1).assess(json.dumps(body).encode("utf-8")))
+
+
+def test_assesses_a_valid_request():
+    assert _assess({"description": "A website", "developer_skills": ["Python"], "mode": "fused"}) == {
+        "mode": "fused", "skills": ["Python"],
+    }
+
+
+@pytest.mark.parametrize("body", [
+    [],
+    {},
+    {"description": 5},
+    {"description": "   "},
+    {"description": "A website", "mode": "fast"},
+    {"description": "A website", "developer_skills": "Python"},
+    {"description": "A website", "session": ["a"]},
+    {"description": "A website", "session": True},
+    {"description": "A website", "session": "s1", "mode": "fused"},
+])
+def test_rejects_bad_requests_with_400(body):
+    with pytest.raises(server.HTTPError) as error:
+        _assess(body)
+    assert error.value.status == 400
+
+
+def _http(raw):
+    async def exchange():
+        listener = await asyncio.start_server(server.AssessmentServer(workers=1).handle_connection, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+    return asyncio.run(exchange())
+
+
+def test_http_round_trip():
+    body = json.dumps({"description": 5}).encode("utf-8")
+    response = _http(b"POST /assess HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+    assert response.startswith(b"HTTP/1.1 400 Bad Request")
+    response = _http(b"GET /healthz HTTP/1.1\r\nConnection: close\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 200 OK") and b'"status": "ok"' in response
+    response = _http(b"POST /assess HTTP/1.1\r\nContent-Length: nope\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 400")
@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def _burst(flight, key, fn, n):
+    results = []
+    errors = []
+
+    def worker():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def _wait_for_followers(flight, key, n):
+    while flight._calls.get(key) is None or flight._calls[key].followers < n:
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_run():
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        release.wait(timeout=5)
+        return "answer"
+
+    threads, results, _ = _burst(flight, "k", work, 5)
+    _wait_for_followers(flight, "k", 4)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert len(runs) == 1
+    assert sorted(results) == [("answer", False)] + [("answer", True)] * 4
+    assert flight.stats == {"leaders": 1, "coalesced": 4}
+    assert flight.in_flight() == 0
+
+
+def test_followers_receive_the_leaders_error():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def work():
+        release.wait(timeout=5)
+        raise ValueError("provider down")
+
+    threads, results, errors = _burst(flight, "k", work, 3)
+    _wait_for_followers(flight, "k", 2)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert results == []
+    assert len(errors) == 3 and all(isinstance(e, ValueError) for e in errors)
+
+
+def test_nothing_is_remembered_after_the_call():
+    flight = SingleFlight()
+    answers = iter(["first", "second"])
+    assert flight.do("k", lambda: next(answers)) == ("first", False)
+    assert flight.do("k", lambda: next(answers)) == ("second", False)
+    with pytest.raises(KeyError):
+        flight.do("k", lambda: {}["missing"])
+    assert flight.in_flight() == 0
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = SingleFlight()
+    release = threading.Event()
+    threads, _, _ = _burst(flight, "slow", lambda: release.wait(timeout=5), 1)
+    while flight.in_flight() == 0:
+        time.sleep(0.001)
+    assert flight.do("fast", lambda: "done") == ("done", False)
+    release.set()
+    threads[0].join(timeout=5)
@@ -0,0 +1,54 @@
+import contextlib
+import io
+
+import pytest
+
+import skill_ontology
+
+
+def test_spellings_share_a_canonical_skill():
+    assert skill_ontology.canonical_id("NodeJS") == skill_ontology.canonical_id("node js") == "nodejs"
+    assert skill_ontology.canonical_name("reactjs") == "React"
+    assert skill_ontology.canonical_name("  Some Tool ") == "Some Tool"
+    assert skill_ontology.canonicalize(["react", "React.js", "Go", "golang", "Rust"]) == ["React", "Go", "Rust"]
+
+
+def test_find_skills_names_aliases_and_hints():
+    found = skill_ontology.find_skills("A chatbot in Node.js and react native, on amazon web services")
+    assert "Node.js" in found and "React Native" in found
+    assert "React" not in found
+    assert "LangChain" in found  # implied by "chatbot"
+
+
+def test_find_skills_ambiguous_words_need_the_exact_spelling():
+    assert skill_ontology.find_skills("We go live next week", hints=False) == []
+    assert skill_ontology.find_skills("Services written in Go", hints=False) == ["Go"]
+
+
+def test_hints_match_whole_words_only():
+    assert "Redis" not in skill_ontology.find_skills("breakfast menu")
+    assert "Redis" in skill_ontology.find_skills("it must be fast")
+
+
+def test_compare_splits_matched_similar_missing_unknown():
+    result = skill_ontology.compare(["Python", "Flask", "My Tool"], ["python", "Django", "Rust", "my tool", "Basket Weaving"])
+    assert result["matched_skills"] == ["Python", "my tool"]
+    assert result["similar_skills"] == ["Django"]
+    assert result["similar_to"] == {"Django": ["Flask", "Python"]}
+    assert result["missing_skills"] == ["Rust"]
+    assert result["unknown_skills"] == ["Basket Weaving"]
+
+
+def test_app_and_app2_split_skills_the_same_way():
+    pytest.importorskip("crewai")
+    import app
+    import app2
+
+    app.VERBOSE = False
+    brief = "We need a website where customers can book appointments and see a dashboard of their visits."
+    for skills in (["Python", "Flask"], ["JavaScript", "Vue", "MySQL"]):
+        staged = app.assess(brief, skills)
+        with contextlib.redirect_stdout(io.StringIO()):
+            inline = app2.run(brief, skills)
+        assert sorted(staged["matched_skills"]) == sorted(inline["matched_skills"])
+        assert sorted(staged["missing_skills"]) == sorted(inline["missing_skills"])
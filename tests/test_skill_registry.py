@@ -0,0 +1,89 @@
+import skill_ontology
+from skill_registry import SkillProfile, SkillUniverse, coverage, popcount, registry
+
+
+def test_ontology_skills_hold_the_first_ids():
+    assert registry.known == len(skill_ontology.SKILLS)
+    assert registry.names[:registry.known] == [name for name, _, _, _ in skill_ontology.SKILLS.values()]
+
+
+def test_aliases_share_an_id():
+    assert registry.intern("Node.js") == registry.intern("nodejs") == registry.intern("node js")
+
+
+def test_split_keeps_unknown_skills_out_of_the_mask():
+    mask, extra = registry.split(["Python", "Cobol Wizardry", "React", "cobol wizardry"])
+    assert registry.decode(mask) == ["Python", "React"]
+    assert len(extra) == 1 and extra[0] >= registry.known
+    assert registry.decode(mask, extra) == ["Python", "React", "Cobol Wizardry"]
+    assert registry.mask(["Python", "Cobol Wizardry"]) == registry.mask(["Python"])
+
+
+def test_mask_stays_small_however_many_skills_are_interned():
+    for i in range(50):
+        registry.intern(f"made-up skill {i}")
+    mask, _ = registry.split(["Python", "made-up skill 49"])
+    assert mask.bit_length() <= registry.known
+
+
+def test_id_of_does_not_intern():
+    size = len(registry)
+    assert registry.id_of("never seen before skill") is None
+    assert len(registry) == size
+
+
+def test_ids_bools_and_coverage():
+    mask = registry.mask(["Python", "Flask", "Docker"])
+    assert registry.ids(mask) == sorted(registry.ids(mask))
+    assert popcount(mask) == len(registry.ids(mask))
+    assert registry.bools(mask).sum() == popcount(mask)
+    assert coverage(registry.mask(["Python"]), registry.mask(["Python", "Flask"])) == 0.5
+    assert coverage(mask, 0) == 0.0
+
+
+def test_similar_follows_ontology_edges_both_ways():
+    flask = registry.id_of("Flask")
+    python = registry.id_of("Python")
+    assert registry.similar(flask, registry.mask(["Django"]))
+    assert registry.similar(python, registry.mask(["Flask"]))
+    assert not registry.similar(flask, registry.mask(["Rust"]))
+
+
+def test_universe_gives_unknown_skills_local_bits():
+    mask, unknown = registry.split(["Python", "Quantum Basketweaving", "Underwater Welding"])
+    universe = SkillUniverse(unknown)
+    full = universe.mask(mask, unknown)
+    assert popcount(full) == 3
+    assert full.bit_length() <= registry.known + len(unknown)
+    assert sorted(universe.decode(full)) == ["Python", "Quantum Basketweaving", "Underwater Welding"]
+    # Unknown skills outside the universe are dropped
+    _, other = registry.split(["Competitive Yodelling"])
+    assert universe.mask(0, other) == 0
+
+
+def test_profile_round_trip():
+    profile = SkillProfile("dev-1", ["python", "Rare Skill"])
+    assert profile.skills == ["Python", "Rare Skill"]
+    assert repr(profile) == "SkillProfile('dev-1', ['Python', 'Rare Skill'])"
+
+
+def test_lookup_matches_split_without_interning():
+    size = len(registry)
+    mask, others = registry.lookup(["Python", "node js", "Brand New Thing", "brand-new thing"])
+    assert registry.decode(mask) == ["Python", "Node.js"]
+    assert others == {"brandnewthing"}
+    assert registry.mask(["Python", "Another New Thing"]) == registry.mask(["Python"])
+    assert len(registry) == size
+
+
+def test_per_request_comparisons_do_not_grow_the_registry():
+    from roster_index import RosterIndex
+
+    index = RosterIndex()
+    index.add("dev", ["Python", "Known Extra"])
+    size = len(registry)
+    for i in range(20):
+        skill_ontology.compare(["Python", f"Dev Thing {i}"], ["python", f"Invented Skill {i}", "Known Extra"])
+        index.top_k(["Python", f"Invented Skill {i}"])
+    assert len(registry) == size
+    assert index.top_k(["Known Extra", "Never Seen"])[0][:2] == ("dev", 0.5)
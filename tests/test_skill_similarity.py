@@ -0,0 +1,22 @@
+import numpy as np
+
+import skill_similarity
+
+
+def test_embeddings_are_unit_vectors():
+    vectors = skill_similarity.embed(["Flask", "Some Unknown Tool"])
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert skill_similarity.embed([]).shape == (0, skill_similarity.DIMENSIONS)
+
+
+def test_linked_ontology_skills_land_close():
+    scores = skill_similarity.similarity_matrix(["Django", "Rust"], ["Flask"])
+    assert scores[0, 0] > scores[0, 1]
+
+
+def test_similar_skills_returns_ranked_hits_above_the_threshold():
+    hits = skill_similarity.similar_skills(["React", "Python", "Docker"], ["ReactiveX", "Cobol"])
+    assert hits["ReactiveX"][0][0] == "React"
+    assert all(score >= skill_similarity.DEFAULT_THRESHOLD for _, score in hits["ReactiveX"])
+    assert "Cobol" not in hits
+    assert skill_similarity.similar_skills([], ["ReactiveX"]) == {}
@@ -0,0 +1,37 @@
+from streaming import LiteralScanner
+
+
+def _scan(chunks, opener="["):
+    scanner = LiteralScanner(opener)
+    for chunk in chunks:
+        result = scanner.feed(chunk)
+        if result is not None:
+            return result
+    return None
+
+
+def test_reports_the_literal_once_it_closes():
+    scanner = LiteralScanner()
+    assert scanner.feed("Sure! Here you go: ['Pyt") is None
+    assert scanner.feed("hon', 'React']") == "['Python', 'React']"
+
+
+def test_ignores_trailing_chatter():
+    assert _scan(["[1, 2]", " and more [3]"]) == "[1, 2]"
+
+
+def test_nested_brackets():
+    assert _scan(["{'a': [1, {'b': 2}], ", "'c': 3} trailing"], opener="{") == "{'a': [1, {'b': 2}], 'c': 3}"
+
+
+def test_brackets_and_quotes_inside_strings():
+    text = """["a ] b", 'it\\'s [x', "{"] tail"""
+    assert _scan([text[i:i + 3] for i in range(0, len(text), 3)]) == text[:-len(" tail")]
+
+
+def test_text_before_the_opener_is_skipped():
+    assert _scan(["{ignored} [1]"]) == "[1]"
+
+
+def test_unclosed_literal_returns_none():
+    assert _scan(["['Python', 'Rea"]) is None
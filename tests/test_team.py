@@ -0,0 +1,97 @@
+import itertools
+
+import team
+from roster_index import RosterIndex
+from skill_registry import SkillUniverse, popcount, registry
+
+ROSTER = [
+    ("alice", ["Python", "FastAPI", "PostgreSQL"], 1.0),
+    ("bob", ["React", "TypeScript"], 1.0),
+    ("carol", ["Python", "React", "PostgreSQL"], 1.0),
+    ("dave", ["Kubernetes", "AWS", "Docker"], 1.0),
+    ("erin", ["Docker"], 0.2),
+    ("frank", ["Python", "Kubernetes", "Rare Skill"], 3.0),
+]
+
+
+def _index(roster=ROSTER):
+    index = RosterIndex()
+    for developer_id, skills, cost in roster:
+        index.add(developer_id, skills, cost)
+    return index
+
+
+def _brute_force(pool, target):
+    for size in range(1, len(pool) + 1):
+        costs = [
+            sum(c[2] for c in combo) for combo in itertools.combinations(pool, size)
+            if target & ~_union(combo) == 0
+        ]
+        if costs:
+            yield min(costs)
+
+
+def _union(team_):
+    mask = 0
+    for pattern, _, _ in team_:
+        mask |= pattern
+    return mask
+
+
+def _pool(skills, index):
+    required, unknown = registry.split(skills)
+    universe = SkillUniverse(unknown)
+    required = universe.mask(required, unknown)
+    return team.candidate_pool(index, required, universe), required
+
+
+def test_exact_finds_the_cheapest_cover():
+    pool, target = _pool(["Python", "React", "Kubernetes", "Docker", "PostgreSQL"], _index())
+    best = team.exact(pool, target, team.greedy(pool, target))
+    assert target & ~_union(best) == 0
+    assert sum(c[2] for c in best) == min(_brute_force(pool, target))
+
+
+def test_greedy_covers_and_prunes_redundant_members():
+    pool, target = _pool(["Python", "React", "PostgreSQL"], _index())
+    chosen = team.greedy(pool, target)
+    assert target & ~_union(chosen) == 0
+    for member in chosen:
+        rest = _union([c for c in chosen if c is not member])
+        assert target & ~rest
+
+
+def test_lower_bound_never_exceeds_the_optimum():
+    pool, target = _pool(["Python", "React", "Kubernetes", "Docker"], _index())
+    best = team.exact(pool, target, team.greedy(pool, target))
+    assert team.lower_bound(pool, target) <= sum(c[2] for c in best)
+
+
+def test_candidate_pool_drops_dominated_patterns():
+    pool, _ = _pool(["Python", "PostgreSQL"], _index())
+    # alice and carol both cover Python + PostgreSQL; frank (Python only, dearer) is dominated
+    assert len(pool) == 1
+    assert popcount(pool[0][0]) == 2
+
+
+def test_assemble_covers_unknown_skills_and_reports_the_gaps():
+    result = team.assemble(["Python", "Rare Skill", "Docker", "Haskell"], _index(), k=3)
+    best = result["teams"][0]
+    assert best["optimal"]
+    assert "Rare Skill" in best["matched_skills"]
+    assert [m["id"] for m in best["members"]] == ["frank", "erin"]
+    assert best["cost"] == 3.2
+    assert result["uncoverable_skills"] == ["Haskell"]
+    assert best["missing_skills"] == ["Haskell"]
+
+
+def test_assemble_counts_what_the_lead_brings():
+    result = team.assemble(["Python", "React"], _index(), lead_skills=["Python"])
+    assert result["lead_covers"] == ["Python"]
+    assert all(m["covers"] == ["React"] for m in result["teams"][0]["members"])
+
+
+def test_assemble_with_nothing_coverable():
+    result = team.assemble(["Haskell"], _index())
+    assert result["uncoverable_skills"] == ["Haskell"]
+    assert result["teams"][0]["members"] == []
@@ -0,0 +1,71 @@
+import json
+import socket
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import tracing
+
+
+def test_spans_nest_and_record_errors(tmp_path, monkeypatch):
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(tracing, "TRACE_PATH", str(path))
+    with tracing.span("assess", stage="pipeline") as outer:
+        with pytest.raises(ValueError):
+            with tracing.span("llm.invoke", stage="extract_skills"):
+                tracing.annotate(prompt_tokens=12)
+                raise ValueError("bad answer")
+    inner, root = map(json.loads, path.read_text(encoding="utf-8").splitlines())
+    assert root["span_id"] == outer.span_id and root["parent_id"] is None
+    assert inner["parent_id"] == root["span_id"] and inner["trace_id"] == root["trace_id"]
+    assert inner["error"] == "ValueError: bad answer" and inner["prompt_tokens"] == 12
+    assert tracing.current_span() is None
+
+
+def test_submitted_work_keeps_its_parent():
+    with tracing.span("batch") as parent, ThreadPoolExecutor(max_workers=2) as executor:
+        future = tracing.submit(executor, tracing.current_span)
+        assert future.result() is parent
+        assert executor.submit(tracing.current_span).result() is None
+
+
+def test_llm_calls_are_counted_across_threads_and_nested_blocks():
+    with tracing.count_llm_calls() as outer, ThreadPoolExecutor(max_workers=2) as executor:
+        def call(cache_hit):
+            with tracing.span("llm.invoke", cache_hit=cache_hit):
+                pass
+        with tracing.count_llm_calls() as inner:
+            list(map(lambda f: f.result(), [tracing.submit(executor, call, False) for _ in range(3)]))
+        call(True)
+        with tracing.span("crew.kickoff", llm_calls=4):
+            pass
+    assert inner["calls"] == 3
+    assert outer["calls"] == 7
+
+
+def test_prometheus_text_reports_durations_and_counters():
+    with tracing.span("llm.invoke", stage="test_stage", cache_hit=False, prompt_tokens=5, retries=1):
+        pass
+    tracing.count_parse("test_stage", False)
+    text = tracing.prometheus_text()
+    assert 'pipeline_span_duration_seconds_count{name="llm.invoke",stage="test_stage"}' in text
+    assert 'pipeline_cache_requests_total{name="llm.invoke",outcome="miss",stage="test_stage"}' in text
+    assert 'pipeline_llm_tokens_total{kind="prompt",stage="test_stage"}' in text
+    assert 'pipeline_parse_total{outcome="failed",stage="test_stage"}' in text
+    assert text.count("# TYPE pipeline_retries_total counter") == 1
+
+
+def test_serve_metrics(monkeypatch):
+    monkeypatch.delenv("METRICS_PORT", raising=False)
+    assert tracing.serve_metrics() is None
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = tracing.serve_metrics(port=port, host="127.0.0.1")
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "pipeline_span_duration_seconds" in response.read().decode("utf-8")
+    finally:
+        server.shutdown()
@@ -0,0 +1,209 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# === Tracing and metrics ===
+#
+# span() times a block and records it with its parent span, so one
+# assessment becomes a tree: stage -> crew.kickoff / llm.invoke. Finished
+# spans are appended to TRACE_PATH as JSON lines (when set) and folded into
+# in-memory aggregates that prometheus_text() renders in the Prometheus
+# text format, served over HTTP by serve_metrics().
+
+TRACE_PATH = os.getenv("TRACE_PATH")
+
+_current = contextvars.ContextVar("current_span", default=None)
+_call_counter = contextvars.ContextVar("call_counter", default=None)
+_sink_lock = threading.Lock()
+_metrics_lock = threading.Lock()
+
+# (metric name, sorted label items) -> value
+_counters = {}
+_durations = {}
+
+# Span attributes that become Prometheus counters
+TOKEN_ATTRS = ("prompt_tokens", "completion_tokens")
+
+# Spans that stand for one request to a model (unless served from the cache
+# or shared with an identical in-flight call)
+LLM_SPANS = ("llm.invoke", "llm.stream")
+
+
+class Span:
+    def __init__(self, name, parent=None, **attributes):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.parent = parent
+        self.attributes = attributes
+        self.start = time.time()
+        self.duration_ms = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": round(self.start, 6),
+            "duration_ms": self.duration_ms,
+            **self.attributes,
+        }
+
+
+def current_span():
+    return _current.get()
+
+
+@contextmanager
+def span(name, **attributes):
+    parent = _current.get()
+    s = Span(name, parent, **attributes)
+    token = _current.set(s)
+    started = time.perf_counter()
+    try:
+        yield s
+    except Exception as e:
+        s.set(error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        s.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        _current.reset(token)
+        _finish(s)
+
+
+def annotate(**attributes):
+    # Attach attributes to whichever span is open, if any
+    s = _current.get()
+    if s is not None:
+        s.set(**attributes)
+
+
+def submit(executor, fn, *args):
+    # ThreadPoolExecutor does not carry context variables into its workers;
+    # run each task in a copy of the caller's context so spans nest correctly.
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+@contextmanager
+def count_llm_calls():
+    # Counts model requests made inside the block, including from worker
+    # threads started with submit(); yields a dict read as counts["calls"].
+    # Blocks nest: a request counts towards every enclosing block.
+    counts = {"calls": 0}
+    token = _call_counter.set((_call_counter.get() or ()) + (counts,))
+    try:
+        yield counts
+    finally:
+        _call_counter.reset(token)
+
+
+def llm_calls(s):
+    if s.attributes.get("cache_hit") or s.attributes.get("coalesced"):
+        return 0
+    return s.attributes.get("llm_calls", 1 if s.name in LLM_SPANS else 0)
+
+
+def _finish(s):
+    counters = _call_counter.get()
+    if counters:
+        calls = llm_calls(s)
+        if calls:
+            with _metrics_lock:
+                for counts in counters:
+                    counts["calls"] += calls
+    if TRACE_PATH:
+        line = json.dumps(s.to_dict(), ensure_ascii=False, default=str)
+        with _sink_lock, open(TRACE_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    stage = s.attributes.get("stage", "")
+    labels = (("name", s.name), ("stage", stage))
+    with _metrics_lock:
+        total, count = _durations.get(labels, (0.0, 0))
+        _durations[labels] = (total + s.duration_ms / 1000, count + 1)
+        for attr in TOKEN_ATTRS:
+            if s.attributes.get(attr):
+                _inc(("pipeline_llm_tokens_total", (("kind", attr[:-len("_tokens")]), ("stage", stage))), s.attributes[attr])
+        if "cache_hit" in s.attributes:
+            outcome = "hit" if s.attributes["cache_hit"] else "miss"
+            _inc(("pipeline_cache_requests_total", (("name", s.name), ("outcome", outcome), ("stage", stage))))
+        if s.attributes.get("retries"):
+            _inc(("pipeline_retries_total", labels), s.attributes["retries"])
+        if "queue_wait_ms" in s.attributes:
+            _inc(("pipeline_queue_wait_seconds_total", labels), s.attributes["queue_wait_ms"] / 1000)
+        if "error" in s.attributes:
+            _inc(("pipeline_span_errors_total", labels))
+
+
+def _inc(key, amount=1):
+    _counters[key] = _counters.get(key, 0) + amount
+
+
+def count_parse(stage, ok):
+    annotate(parse_ok=ok)
+    with _metrics_lock:
+        _inc(("pipeline_parse_total", (("outcome", "ok" if ok else "failed"), ("stage", stage))))
+
+
+def count_reuse(stage, reused, similarity=None):
+    annotate(reused=reused, reuse_similarity=similarity)
+    with _metrics_lock:
+        _inc(("pipeline_reuse_total", (("outcome", "hit" if reused else "miss"), ("stage", stage))))
+
+
+def _format_labels(labels):
+    return ",".join(f'{k}="{v}"' for k, v in labels)
+
+
+def prometheus_text():
+    lines = [
+        "# HELP pipeline_span_duration_seconds Time spent in each span.",
+        "# TYPE pipeline_span_duration_seconds summary",
+    ]
+    with _metrics_lock:
+        for labels, (total, count) in sorted(_durations.items()):
+            lines.append(f"pipeline_span_duration_seconds_sum{{{_format_labels(labels)}}} {total:.6f}")
+            lines.append(f"pipeline_span_duration_seconds_count{{{_format_labels(labels)}}} {count}")
+        seen = set()
+        for (name, labels), value in sorted(_counters.items()):
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{{{_format_labels(labels)}}} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port=None, host="0.0.0.0"):
+    # Serves /metrics from a daemon thread; returns None when no port is set
+    port = port or os.getenv("METRICS_PORT")
+    if not port:
+        return None
+    server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server